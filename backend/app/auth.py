@@ -11,6 +11,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt, jwk
 from jose.backends import RSAKey, ECKey
 
+from .database import PreparedConnection, get_db_pool, get_request_connection, register_prepared_statements
 from .logging_config import get_logger
 
 logger = get_logger("ommiquiz.auth")
@@ -36,6 +37,11 @@ class AuthenticatedUser:
 
 _http_bearer = HTTPBearer(auto_error=False)
 
+# Admin check run on every admin request
+_ADMIN_STATUS_SQL = "SELECT is_admin FROM user_profiles WHERE id = $1"
+
+register_prepared_statements(_ADMIN_STATUS_SQL)
+
 
 def _require_supabase_settings() -> dict[str, str]:
     """Get required Supabase configuration from environment."""
@@ -241,13 +247,45 @@ async def get_current_user(
     )
 
 
+async def _require_admin(conn: PreparedConnection, user: AuthenticatedUser) -> None:
+    """Raise HTTPException(403) unless the user's profile has is_admin=true."""
+    statement = await conn.prepare_cached(_ADMIN_STATUS_SQL)
+    result = await statement.fetchrow(user.user_id)
+
+    if not result:
+        logger.warning(
+            "User profile not found for authenticated user",
+            user_id=user.user_id,
+            email=user.email
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User profile not found"
+        )
+
+    if not result['is_admin']:
+        logger.warning(
+            "Non-admin user attempted admin action",
+            user_id=user.user_id,
+            email=user.email
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+
+    logger.info("Admin authenticated", user_id=user.user_id, email=user.email)
+
+
 async def get_current_admin(
     user: AuthenticatedUser = Depends(get_current_user)
 ) -> AuthenticatedUser:
     """
     Validate that the current user has admin privileges.
 
-    Requires valid JWT token AND is_admin=true in user_profiles table.
+    Requires valid JWT token AND is_admin=true in user_profiles table. The
+    check runs on a pooled connection that is released right away, for
+    admin handlers that do not query the database themselves.
 
     Args:
         user: Authenticated user from get_current_user
@@ -258,39 +296,34 @@ async def get_current_admin(
     Raises:
         HTTPException(403): If user is not an admin
     """
-    from .database import get_db_pool
-
     pool = await get_db_pool()
-
     async with pool.acquire() as conn:
-        result = await conn.fetchrow(
-            "SELECT is_admin FROM user_profiles WHERE id = $1",
-            user.user_id
-        )
+        await _require_admin(conn, user)
+    return user
 
-        if not result:
-            logger.warning(
-                "User profile not found for authenticated user",
-                user_id=user.user_id,
-                email=user.email
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User profile not found"
-            )
 
-        if not result['is_admin']:
-            logger.warning(
-                "Non-admin user attempted admin action",
-                user_id=user.user_id,
-                email=user.email
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Admin privileges required"
-            )
+async def get_current_admin_with_connection(
+    user: AuthenticatedUser = Depends(get_current_user),
+    conn: PreparedConnection = Depends(get_request_connection)
+) -> AuthenticatedUser:
+    """
+    Validate admin privileges on the request-scoped connection.
 
-    logger.info("Admin authenticated", user_id=user.user_id, email=user.email)
+    For admin handlers that query the database: they declare
+    Depends(get_request_connection) too and reuse the same connection,
+    which stays checked out until the response has been sent.
+
+    Args:
+        user: Authenticated user from get_current_user
+        conn: Request-scoped connection, shared with the admin handler
+
+    Returns:
+        AuthenticatedUser instance with admin privileges
+
+    Raises:
+        HTTPException(403): If user is not an admin
+    """
+    await _require_admin(conn, user)
     return user
 
 
@@ -0,0 +1,252 @@
+"""
+Response caching for Ommiquiz.
+
+Provides a small in-process TTL cache used to serve repeated requests for
+expensive, per-user responses without re-running the database query, and a
+shared response cache for pre-serialized JSON bodies. The shared cache uses
+Redis when REDIS_URL is set (so all workers and instances see the same
+entries) and falls back to the in-process TTL cache otherwise. Entries are
+invalidated by Postgres triggers that NOTIFY the stats_invalidate channel,
+which every worker listens on.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, List, Optional, Set, Tuple
+
+import asyncpg
+import orjson
+from fastapi import Response
+
+from .database import DATABASE_URL
+from .logging_config import get_logger
+
+logger = get_logger("ommiquiz.cache")
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` if missing or expired."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry when full."""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, *prefix: Hashable) -> None:
+        """Drop every tuple key that starts with ``prefix``."""
+        size = len(prefix)
+        stale = [
+            key for key in self._entries
+            if isinstance(key, tuple) and key[:size] == prefix
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def keys(self) -> List[Hashable]:
+        """Return a snapshot of the stored keys (including expired ones)."""
+        return list(self._entries)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Cache of serialized response bodies shared across workers via Redis.
+
+    Without REDIS_URL (or if the redis package is unavailable) entries are
+    kept in an in-process TTLCache instead. Redis errors are logged and
+    treated as cache misses so a cache outage never fails a request.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = 1_000):
+        self._memory = TTLCache(maxsize=maxsize, ttl=60)
+        self._redis = None
+
+        if redis_url:
+            try:
+                import redis.asyncio as redis_asyncio
+
+                self._redis = redis_asyncio.from_url(redis_url)
+                logger.info("Response cache using Redis")
+            except Exception as exc:
+                logger.warning("Redis unavailable, using in-process response cache", error=str(exc))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for ``key`` or None."""
+        if self._redis is None:
+            return self._memory.get(key)
+        try:
+            return await self._redis.get(key)
+        except Exception as exc:
+            logger.warning("Response cache read failed", key=key, error=str(exc))
+            return None
+
+    async def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Store ``body`` under ``key`` for ``ttl`` seconds."""
+        if self._redis is None:
+            self._memory.set(key, body, ttl=ttl)
+            return
+        try:
+            await self._redis.set(key, body, ex=ttl)
+        except Exception as exc:
+            logger.warning("Response cache write failed", key=key, error=str(exc))
+
+    async def delete(self, *keys: str) -> None:
+        """Drop the given keys."""
+        if self._redis is None:
+            for key in keys:
+                self._memory.invalidate(key)
+            return
+        try:
+            await self._redis.delete(*keys)
+        except Exception as exc:
+            logger.warning("Response cache delete failed", keys=list(keys), error=str(exc))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop every key starting with ``prefix``."""
+        if self._redis is None:
+            for key in self._memory.keys():
+                if isinstance(key, str) and key.startswith(prefix):
+                    self._memory.invalidate(key)
+            return
+        try:
+            stale = [key async for key in self._redis.scan_iter(match=f"{prefix}*")]
+            if stale:
+                await self._redis.delete(*stale)
+        except Exception as exc:
+            logger.warning("Response cache prefix delete failed", prefix=prefix, error=str(exc))
+
+
+response_cache = ResponseCache(os.getenv("REDIS_URL"))
+
+
+def cached_response(key: str, ttl: int) -> Callable:
+    """
+    Cache a JSON endpoint's serialized response body in the response cache.
+
+    ``key`` is formatted with the handler's keyword arguments, e.g.
+    ``"admin:activity:{days}"`` or ``"favorites:{user.user_id}"``. Handlers
+    may return a dict (encoded with orjson, like the default response class)
+    or a Response with a JSON body; on a hit the stored bytes are returned as-is
+    without calling the handler or re-encoding.
+    """
+    def decorator(handler: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs) -> Response:
+            cache_key = key.format(**kwargs)
+            body = await response_cache.get(cache_key)
+            if body is not None:
+                return Response(content=body, media_type="application/json")
+
+            result = await handler(*args, **kwargs)
+            if isinstance(result, Response):
+                if result.status_code != 200:
+                    return result
+                body = result.body
+            else:
+                body = orjson.dumps(result)
+
+            await response_cache.set(cache_key, body, ttl)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
+
+
+# Channel the invalidation triggers NOTIFY on (see migration 018). The payload
+# is a cache key, or a key prefix when it ends with ":".
+INVALIDATION_CHANNEL = "stats_invalidate"
+_LISTENER_RETRY_SECONDS = 5
+
+_listener_task: Optional["asyncio.Task[None]"] = None
+# The event loop only keeps weak references to tasks, so pending
+# invalidations are held here until they finish
+_invalidation_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _on_invalidation(connection, pid, channel: str, payload: str) -> None:
+    if payload.endswith(":"):
+        task = asyncio.create_task(response_cache.delete_prefix(payload))
+    else:
+        task = asyncio.create_task(response_cache.delete(payload))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+async def _listen_for_invalidations() -> None:
+    # LISTEN needs a dedicated session-level connection, so it is opened
+    # outside the pool and re-established whenever it drops
+    while True:
+        closed = asyncio.Event()
+        try:
+            connection = await asyncpg.connect(DATABASE_URL)
+        except Exception as exc:
+            logger.warning("Cache invalidation listener could not connect", error=str(exc))
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+            continue
+
+        try:
+            connection.add_termination_listener(lambda _connection: closed.set())
+            await connection.add_listener(INVALIDATION_CHANNEL, _on_invalidation)
+            logger.info("Cache invalidation listener started", channel=INVALIDATION_CHANNEL)
+            await closed.wait()
+            logger.warning("Cache invalidation listener connection lost")
+        except Exception as exc:
+            logger.warning("Cache invalidation listener failed", error=str(exc))
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+        await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+def start_invalidation_listener() -> None:
+    """Start listening for cache invalidations; invoked during application startup."""
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop the invalidation listener and close its connection."""
+    global _listener_task
+    if _listener_task is None:
+        return
+
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
@@ -6,7 +6,14 @@ Uses asyncpg for async PostgreSQL operations with plain SQL.
 
 import os
 import asyncpg
-from typing import Optional
+import orjson
+from asyncpg.prepared_stmt import PreparedStatement
+from fastapi import Request
+from typing import AsyncIterator, Dict, List, Optional
+
+from .logging_config import get_logger
+
+logger = get_logger("ommiquiz.database")
 
 # Database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -17,6 +24,81 @@ if not DATABASE_URL:
 # Global connection pool
 _pool: Optional[asyncpg.Pool] = None
 
+# Hot queries prepared on every new pool connection
+_registered_statements: List[str] = []
+
+# to_char() patterns rendering a timestamp AT TIME ZONE 'UTC' as ISO 8601, so
+# queries return strings instead of datetimes that are formatted again.
+# ISO_UTC_FORMAT matches datetime.isoformat() of an aware UTC value; the
+# progress API has always used the "Z" suffix and keeps ISO_UTC_Z_FORMAT.
+ISO_UTC_FORMAT = "'YYYY-MM-DD\"T\"HH24:MI:SS.US\"+00:00\"'"
+ISO_UTC_Z_FORMAT = "'YYYY-MM-DD\"T\"HH24:MI:SS.US\"Z\"'"
+
+
+class PreparedConnection(asyncpg.Connection):
+    """
+    Connection that keeps explicitly prepared statements for its lifetime.
+
+    Statements returned by prepare_cached() are parsed and planned by the
+    server once per connection and reused on every subsequent call.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared_statements: Dict[str, PreparedStatement] = {}
+
+    async def prepare_cached(self, query: str) -> PreparedStatement:
+        """
+        Return the prepared statement for a query, preparing it on first use.
+
+        Args:
+            query: SQL query string
+
+        Returns:
+            PreparedStatement bound to this connection
+        """
+        statement = self._prepared_statements.get(query)
+        if statement is None:
+            statement = await self.prepare(query)
+            self._prepared_statements[query] = statement
+        return statement
+
+
+def register_prepared_statements(*queries: str) -> None:
+    """
+    Register queries to be prepared on every new pool connection.
+
+    Must be called before the pool is created (i.e. at import time).
+    """
+    for query in queries:
+        if query not in _registered_statements:
+            _registered_statements.append(query)
+
+
+def _encode_json(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(conn: PreparedConnection) -> None:
+    """Set up JSON codecs and prepare the registered statements on a freshly opened connection."""
+    # json/jsonb values are decoded with orjson instead of being returned as
+    # text; codecs must be set before preparing, which resets the statement cache
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=_encode_json, decoder=orjson.loads, schema="pg_catalog"
+        )
+    # A statement that fails to prepare (e.g. its migration has not run yet)
+    # must not take the connection down; it is prepared lazily on first use
+    for query in _registered_statements:
+        try:
+            await conn.prepare_cached(query)
+        except asyncpg.PostgresError as e:
+            logger.warning(
+                "Failed to prepare statement on new connection",
+                query=" ".join(query.split())[:200],
+                error=str(e),
+            )
+
 
 async def get_db_pool() -> asyncpg.Pool:
     """
@@ -33,6 +115,10 @@ async def get_db_pool() -> asyncpg.Pool:
             min_size=5,  # Minimum number of connections
             max_size=20,  # Maximum number of connections
             command_timeout=60,  # Command timeout in seconds
+            statement_cache_size=1024,  # Per-connection cache of ad-hoc query plans
+            max_cached_statement_lifetime=0,  # Never expire cached statements
+            connection_class=PreparedConnection,
+            init=_init_connection,
         )
 
     return _pool
@@ -54,6 +140,27 @@ async def get_db_connection():
         yield connection
 
 
+async def get_request_connection(request: Request) -> AsyncIterator[PreparedConnection]:
+    """
+    FastAPI dependency providing one pooled connection per request.
+
+    FastAPI caches dependencies per request, so every dependency and the
+    handler that declare Depends(get_request_connection) share the same
+    connection; it is also exposed as request.state.db_conn. The connection
+    is released back to the pool once the response has been sent.
+
+    Yields:
+        PreparedConnection: The request's database connection
+    """
+    pool = await get_db_pool()
+    async with pool.acquire() as connection:
+        request.state.db_conn = connection
+        try:
+            yield connection
+        finally:
+            request.state.db_conn = None
+
+
 async def close_db_pool():
     """Close the database connection pool."""
     global _pool
@@ -4,7 +4,8 @@ import structlog
 import os
 import sys
 import json
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Deque, NamedTuple, Optional, Dict, Any
 from pathlib import Path
 import httpx
 from datetime import datetime
@@ -126,6 +127,40 @@ class BetterstackHandler(logging.Handler):
         super().close()
 
 
+class RecentLogEntry(NamedTuple):
+    """A buffered log record: the fields /logs filters on and its formatted line."""
+    created: float
+    levelname: str
+    message: str
+    line: str
+
+
+class RecentLogBuffer(logging.Handler):
+    """
+    In-memory ring buffer of the most recent log records of this process.
+
+    Backs the /logs endpoint so recent entries can be queried without
+    re-reading and re-parsing the log files. Each record is formatted when
+    it is emitted and only the line and its filter fields are kept, in
+    chronological order; the LogRecord itself (with its args and any
+    exc_info traceback holding frames alive) is not retained.
+    """
+
+    def __init__(self, capacity: int, log_file: Optional[str] = None):
+        super().__init__()
+        self.records: Deque[RecentLogEntry] = deque(maxlen=capacity)
+        self.log_file = log_file
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record)
+            self.records.append(
+                RecentLogEntry(record.created, record.levelname, record.getMessage(), line)
+            )
+        except Exception:
+            self.handleError(record)
+
+
 class LoggingConfig:
     """Centralized logging configuration"""
     
@@ -142,6 +177,8 @@ class LoggingConfig:
         
         self.log_file_max_size = int(os.getenv("LOG_FILE_MAX_SIZE", "10485760"))  # 10MB
         self.log_file_backup_count = int(os.getenv("LOG_FILE_BACKUP_COUNT", "5"))
+        self.log_buffer_size = int(os.getenv("LOG_BUFFER_SIZE", "50000"))
+        self.recent_logs: Optional[RecentLogBuffer] = None
         
         # Cloud logging configuration
         self.betterstack_enabled = os.getenv("BETTERSTACK_ENABLED", "false").lower() == "true"
@@ -202,6 +239,15 @@ class LoggingConfig:
         # File handler (if enabled)
         if self.log_file_enabled:
             self._setup_file_handler(root_logger, formatter)
+
+        # Recent records kept in memory for /logs
+        self.recent_logs = RecentLogBuffer(
+            self.log_buffer_size,
+            log_file=Path(self.log_file_path).name if self.log_file_enabled else None,
+        )
+        self.recent_logs.setLevel(getattr(logging, self.log_level))
+        self.recent_logs.setFormatter(formatter)
+        root_logger.addHandler(self.recent_logs)
         
         # Cloud handlers
         if self.betterstack_enabled and self.betterstack_token:
@@ -333,6 +379,11 @@ def get_logger(name: str):
     return structlog.get_logger(name)
 
 
+def get_recent_logs() -> Optional[RecentLogBuffer]:
+    """Return the in-memory buffer of recent log records, if logging is set up"""
+    return logging_config.recent_logs
+
+
 # Logging middleware for FastAPI
 class LoggingMiddleware:
     """FastAPI middleware for request/response logging"""
@@ -0,0 +1,157 @@
+"""Batched writer for login attempts stored in the login_history table."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from .database import get_db_pool
+from .logging_config import get_logger
+
+logger = get_logger("ommiquiz.login_logger")
+
+# Flush once this many attempts are queued or FLUSH_INTERVAL seconds after
+# the first one arrived, whichever comes first
+MAX_BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.1
+
+# Attempts beyond this many waiting to be written are dropped, so a stalled
+# database cannot grow the queue without bound
+MAX_QUEUE_SIZE = 10_000
+
+LoginAttempt = Tuple[Optional[str], str, datetime, bool, Optional[str], Optional[str], Optional[str]]
+
+# Batches are written with COPY, which skips per-row statement parsing
+_LOGIN_HISTORY_COLUMNS = [
+    "user_id", "email", "login_time", "success", "ip_address", "user_agent", "error_message",
+]
+
+_INSERT_ONE_SQL = """
+    INSERT INTO public.login_history
+    (user_id, email, login_time, success, ip_address, user_agent, error_message)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+"""
+
+# Queued by stop_login_log_writer behind the pending attempts; the writer
+# flushes everything before it and exits
+_STOP = None
+
+_queue: Optional["asyncio.Queue[Optional[LoginAttempt]]"] = None
+_writer_task: Optional["asyncio.Task[None]"] = None
+
+
+def enqueue_login_attempt(
+    user_id: Optional[str],
+    email: str,
+    success: bool,
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+    error_message: Optional[str],
+) -> bool:
+    """Queue a login attempt for the writer task; returns False if it was not queued."""
+    if _queue is None or _writer_task is None or _writer_task.done():
+        return False
+
+    try:
+        _queue.put_nowait(
+            (user_id, email, datetime.now(timezone.utc), success, ip_address, user_agent, error_message)
+        )
+    except asyncio.QueueFull:
+        logger.warning("Login history queue full, dropping login attempt",
+                       email=email, max_queue_size=MAX_QUEUE_SIZE)
+        return False
+    return True
+
+
+async def _write_batch(batch: List[LoginAttempt]) -> None:
+    try:
+        pool = await get_db_pool()
+    except Exception as exc:
+        logger.error("Login history batch dropped, database unavailable",
+                     batch_size=len(batch), error=str(exc))
+        return
+
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    "login_history",
+                    schema_name="public",
+                    columns=_LOGIN_HISTORY_COLUMNS,
+                    records=batch,
+                )
+        return
+    except Exception as exc:
+        logger.warning("Batched login history insert failed, retrying rows individually",
+                       batch_size=len(batch), error=str(exc))
+
+    # One bad row must not drop the rest of the batch
+    for attempt in batch:
+        try:
+            async with pool.acquire() as conn:
+                await conn.execute(_INSERT_ONE_SQL, *attempt)
+        except Exception as exc:
+            logger.error("Error logging login attempt", email=attempt[1], error=str(exc))
+
+
+async def _writer_loop(queue: "asyncio.Queue[Optional[LoginAttempt]]") -> None:
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        attempt = await queue.get()
+        if attempt is _STOP:
+            return
+        batch = [attempt]
+        deadline = loop.time() + FLUSH_INTERVAL
+
+        while len(batch) < MAX_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                attempt = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if attempt is _STOP:
+                stopping = True
+                break
+            batch.append(attempt)
+
+        # A failed batch must not end the writer, or later attempts would be
+        # queued with nobody left to write them
+        try:
+            await _write_batch(batch)
+        except Exception as exc:
+            logger.error("Login history batch failed", batch_size=len(batch), error=str(exc))
+
+
+def start_login_log_writer() -> None:
+    """Start the background writer; invoked during application startup."""
+    global _queue, _writer_task
+    if _writer_task is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+    _writer_task = asyncio.create_task(_writer_loop(_queue))
+    logger.info("Login history writer started")
+
+
+async def stop_login_log_writer() -> None:
+    """Stop the writer once it has flushed every attempt queued so far."""
+    global _queue, _writer_task
+    if _writer_task is None:
+        return
+
+    # The writer is not cancelled: an attempt it has already taken off the
+    # queue would be lost with its batch. It writes everything queued ahead
+    # of the sentinel and then returns; new attempts are refused meanwhile.
+    queue, writer_task = _queue, _writer_task
+    _queue = None
+    _writer_task = None
+
+    pending = queue.qsize()
+    if not writer_task.done():
+        # Waits for room if the queue is full; the writer is draining it
+        await queue.put(_STOP)
+        await writer_task
+    logger.info("Login history writer stopped", queued_at_stop=pending)
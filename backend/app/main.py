@@ -1,21 +1,41 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, APIRouter, Form, Depends, Query, Request
+from fastapi import FastAPI, HTTPException, UploadFile, File, APIRouter, Form, Depends, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from pydantic import BaseModel, ValidationError, field_validator
+import httpx
+import orjson
 import yaml
 import re
-import json
 import os
-from datetime import datetime, timedelta, timezone
+import hashlib
+import heapq
+import uuid
+import asyncio
+import copy
+import functools
+import mmap
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Any, Callable, Coroutine, Dict, Iterator, Literal, Optional, List, Tuple, Union
 
 # Import logging configuration
-from .logging_config import setup_logging, get_logger, LoggingMiddleware, log_function_call
-from .auth import AuthenticatedUser, get_optional_current_user, get_current_user, get_current_admin
+from .logging_config import RecentLogBuffer, RecentLogEntry, setup_logging, get_logger, get_recent_logs, LoggingMiddleware, log_function_call
+from .auth import (
+    AuthenticatedUser, get_optional_current_user, get_current_user, get_current_admin,
+    get_current_admin_with_connection,
+)
 from .download_logger import initialize_download_log_store, log_flashcard_download
-from .storage import FlashcardDocument, get_flashcard_storage
+from .storage import FlashcardDocument, generate_user_flashcard_id, get_flashcard_storage, is_user_flashcard
 from .pdf_generator import generate_speed_quiz_pdf
+from .quiz_history_pdf_generator import collect_quiz_history, shutdown_pdf_pool, stream_quiz_history_pdf
+from .cache import (
+    TTLCache, cached_response, response_cache, start_invalidation_listener, stop_invalidation_listener
+)
+from .login_logger import enqueue_login_attempt, start_login_log_writer, stop_login_log_writer
+from .database import ISO_UTC_FORMAT, PreparedConnection, get_db_pool, get_request_connection, register_prepared_statements
 from . import progress_storage
 from .version import APP_VERSION
 
@@ -25,7 +45,8 @@ setup_logging()
 # Get application logger
 logger = get_logger("ommiquiz.main")
 
-app = FastAPI(title="Omiquiz API", version=APP_VERSION)
+# orjson serializes large admin payloads much faster than the stdlib encoder
+app = FastAPI(title="Omiquiz API", version=APP_VERSION, default_response_class=ORJSONResponse)
 
 # Add logging middleware first
 app.add_middleware(LoggingMiddleware)
@@ -45,8 +66,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class ErrorHandlingRoute(APIRoute):
+    """
+    Route that turns unexpected handler errors into logged 500 responses.
+
+    Handlers only catch the errors they map to a specific status code. This
+    runs inside the middleware stack, unlike an app-level Exception handler
+    (which Starlette calls from the outermost middleware), so the 500
+    responses still carry CORS headers.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def handle(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                logger.error("Unhandled error in API handler",
+                             method=request.method,
+                             path=request.url.path,
+                             error_type=type(e).__name__,
+                             error=str(e))
+                return ORJSONResponse(status_code=500, content={"detail": f"Internal error: {str(e)}"})
+
+        return handle
+
+
 # Create API router with /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=ErrorHandlingRoute)
 
 
 class LoginRequest(BaseModel):
@@ -89,8 +140,201 @@ storage = get_flashcard_storage(FLASHCARDS_DIR, CATALOG_FILENAME)
 
 logger.info("Application starting", flashcards_dir=str(FLASHCARDS_DIR))
 
-# Compile regex pattern once for performance
+# Parse and emit YAML with the libyaml-backed loader and dumper (much faster
+# than the pure Python ones) when PyYAML was built with libyaml
+try:
+    from yaml import CSafeDumper as YamlSafeDumper, CSafeLoader as YamlSafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper as YamlSafeDumper, SafeLoader as YamlSafeLoader
+
+# Uploaded YAML above this size is parsed in a worker thread so it doesn't
+# block the event loop
+YAML_THREAD_THRESHOLD = 64 * 1024
+
+
+def load_yaml(content: Union[str, bytes]) -> Any:
+    """Parse YAML content safely (equivalent to yaml.safe_load).
+
+    Raw bytes are decoded by the parser itself; invalid UTF-8 raises
+    yaml.reader.ReaderError.
+    """
+    return yaml.load(content, Loader=YamlSafeLoader)
+
+
+def dump_yaml(data: Any, **options: Any) -> Union[str, bytes]:
+    """Serialize data as YAML safely (equivalent to yaml.safe_dump).
+
+    With ``encoding="utf-8"`` the dumper writes UTF-8 bytes directly, which
+    the storage backends save without encoding the text again.
+    """
+    return yaml.dump(data, Dumper=YamlSafeDumper, allow_unicode=True, sort_keys=False, **options)
+
+
+async def load_yaml_off_loop(content: Union[str, bytes]) -> Any:
+    """Parse YAML, offloading large documents to a worker thread."""
+    if len(content) > YAML_THREAD_THRESHOLD:
+        return await asyncio.to_thread(load_yaml, content)
+    return load_yaml(content)
+
+
+# Compile regex patterns once for performance
 VALID_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+BITMAP_URL_PATTERN = re.compile(r'^https?://[^\s]+\.(jpg|jpeg|png|gif|webp|svg)(\?.*)?$', re.IGNORECASE)
+BITMAP_DATA_URI_PATTERN = re.compile(r'^data:image/[a-zA-Z+]+;base64,[A-Za-z0-9+/=]+$')
+BASE64_PATTERN = re.compile(r'^[A-Za-z0-9+/=]+$')
+SLUG_INVALID_CHARS_PATTERN = re.compile(r'[^a-z0-9_-]')
+SLUG_REPEATED_UNDERSCORES_PATTERN = re.compile(r'_+')
+FILENAME_UNSAFE_CHARS_PATTERN = re.compile(r'[^\w\s-]')
+LOG_FILENAME_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+\.log\Z')
+
+# Short-lived cache for learning reports, keyed by (user_id, flashcard_id, days, detail).
+# Invalidated per user whenever a new quiz session is saved.
+learning_report_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Quiz history queries shared by the learning report and the history PDF.
+# Prepared once per pool connection so the server skips parse/plan per request.
+# duration_seconds is nullable, so it is coalesced in SQL rather than per row.
+# Timestamps are rendered as ISO 8601 UTC strings by Postgres so no datetime
+# objects are built just to be formatted again; ORDER BY names the table
+# column explicitly so it sorts on (and uses the index for) the timestamp.
+# id is a SERIAL integer and user_id is only bound as a parameter, so no
+# uuid.UUID values are decoded here and every column is JSON-native.
+_LEARNING_REPORT_SQL = f"""
+    SELECT id, flashcard_id, flashcard_title,
+           to_char(started_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS started_at,
+           to_char(completed_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS completed_at,
+           cards_reviewed, box1_count, box2_count, box3_count,
+           COALESCE(duration_seconds, 0) AS duration_seconds,
+           average_time_to_flip_seconds
+    FROM quiz_sessions
+    WHERE user_id = $1 AND completed_at >= $2
+    ORDER BY quiz_sessions.completed_at DESC
+"""
+
+_LEARNING_REPORT_SQL_FILTERED = f"""
+    SELECT id, flashcard_id, flashcard_title,
+           to_char(started_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS started_at,
+           to_char(completed_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS completed_at,
+           cards_reviewed, box1_count, box2_count, box3_count,
+           COALESCE(duration_seconds, 0) AS duration_seconds,
+           average_time_to_flip_seconds
+    FROM quiz_sessions
+    WHERE user_id = $1 AND flashcard_id = $2 AND completed_at >= $3
+    ORDER BY quiz_sessions.completed_at DESC
+"""
+
+# Quiz history PDF only needs the columns printed in the session table;
+# the date cell is rendered by Postgres in the table's two-line format
+_QUIZ_HISTORY_PDF_SQL = """
+    SELECT flashcard_id, flashcard_title,
+           to_char(completed_at AT TIME ZONE 'UTC', E'MM/DD/YYYY\\nHH24:MI') AS completed_label,
+           cards_reviewed, box1_count, box2_count, box3_count,
+           COALESCE(duration_seconds, 0) AS duration_seconds,
+           average_time_to_flip_seconds
+    FROM quiz_sessions
+    WHERE user_id = $1 AND completed_at >= $2
+    ORDER BY completed_at DESC
+"""
+
+# Summary-only variants for learning reports requested with detail=false
+_LEARNING_SUMMARY_SQL = f"""
+    SELECT COUNT(*) AS total_sessions,
+           COALESCE(SUM(cards_reviewed), 0) AS total_cards_reviewed,
+           COALESCE(SUM(box1_count), 0) AS total_box1,
+           COALESCE(SUM(box2_count), 0) AS total_box2,
+           COALESCE(SUM(box3_count), 0) AS total_box3,
+           COALESCE(SUM(duration_seconds), 0) AS total_duration,
+           AVG(average_time_to_flip_seconds) AS average_time_to_flip_seconds,
+           to_char(MAX(completed_at) AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS last_completed_at
+    FROM quiz_sessions
+    WHERE user_id = $1 AND completed_at >= $2
+"""
+
+_LEARNING_SUMMARY_SQL_FILTERED = f"""
+    SELECT COUNT(*) AS total_sessions,
+           COALESCE(SUM(cards_reviewed), 0) AS total_cards_reviewed,
+           COALESCE(SUM(box1_count), 0) AS total_box1,
+           COALESCE(SUM(box2_count), 0) AS total_box2,
+           COALESCE(SUM(box3_count), 0) AS total_box3,
+           COALESCE(SUM(duration_seconds), 0) AS total_duration,
+           AVG(average_time_to_flip_seconds) AS average_time_to_flip_seconds,
+           to_char(MAX(completed_at) AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS last_completed_at
+    FROM quiz_sessions
+    WHERE user_id = $1 AND flashcard_id = $2 AND completed_at >= $3
+"""
+
+# Read-or-create of the caller's profile, run on every app load. ON CONFLICT
+# DO NOTHING leaves existing rows untouched; both branches of the UNION read
+# the same snapshot, so exactly one of them yields the profile.
+_CURRENT_USER_PROFILE_SQL = """
+    WITH created AS (
+        INSERT INTO user_profiles (id, email, display_name, is_admin, created_at, updated_at)
+        VALUES ($1, $2, $3, FALSE, NOW(), NOW())
+        ON CONFLICT (id) DO NOTHING
+        RETURNING id, email, display_name, is_admin, created_at, updated_at
+    )
+    SELECT id, email, display_name, is_admin, created_at, updated_at, TRUE AS created
+    FROM created
+    UNION ALL
+    SELECT id, email, display_name, is_admin, created_at, updated_at, FALSE AS created
+    FROM user_profiles
+    WHERE id = $1
+"""
+
+register_prepared_statements(
+    _LEARNING_REPORT_SQL,
+    _LEARNING_REPORT_SQL_FILTERED,
+    _LEARNING_SUMMARY_SQL,
+    _LEARNING_SUMMARY_SQL_FILTERED,
+    _QUIZ_HISTORY_PDF_SQL,
+    _CURRENT_USER_PROFILE_SQL,
+)
+
+# Upper bound on windows per learning-report-multi call (each uses a pool connection)
+MAX_LEARNING_REPORT_WINDOWS = 8
+
+# Browsers/proxies may reuse a learning report for as long as it is cached here
+LEARNING_REPORT_CACHE_CONTROL = "private, max-age=30"
+
+
+def learning_report_etag(total_sessions: int, last_completed_at: Optional[str]) -> str:
+    """Build a strong ETag for a learning report from its session count and newest session."""
+    marker = f"{total_sessions}:{last_completed_at or ''}"
+    return '"' + hashlib.blake2b(marker.encode(), digest_size=8).hexdigest() + '"'
+
+
+def build_learning_summary(
+    total_sessions: int,
+    total_cards_reviewed: int,
+    total_box1: int,
+    total_box2: int,
+    total_box3: int,
+    total_duration: int,
+    average_time_to_flip: Optional[float]
+) -> Dict[str, Any]:
+    """Build the summary block of a learning report from aggregated totals."""
+    return {
+        "total_sessions": total_sessions,
+        "total_cards_reviewed": total_cards_reviewed,
+        "total_learned": total_box1,
+        "total_uncertain": total_box2,
+        "total_not_learned": total_box3,
+        "total_duration_seconds": total_duration,
+        "average_session_duration": total_duration / total_sessions if total_sessions > 0 else 0,
+        "average_time_to_flip_seconds": average_time_to_flip
+    }
+
+
+def conditional_report_response(request: Request, etag: str, body: bytes) -> Response:
+    """Return 304 if the client already has this report, otherwise the encoded report with caching headers."""
+    headers = {"ETag": etag, "Cache-Control": LEARNING_REPORT_CACHE_CONTROL}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 def get_flashcard_document(flashcard_id: str) -> Optional[FlashcardDocument]:
     """Retrieve a flashcard document from the configured storage backend."""
@@ -105,12 +349,37 @@ def get_flashcard_document(flashcard_id: str) -> Optional[FlashcardDocument]:
     return document
 
 
+# Flashcard ID -> filename of the core flashcards, rebuilt by every metadata
+# collection (the catalog is regenerated at startup and after each admin
+# write) and kept current by the admin write handlers, so ID lookups only
+# fall back to scanning storage for IDs it has not seen yet
+_flashcard_filename_index: Dict[str, str] = {}
+
+# Admin writes check, save and re-index flashcards in several awaited steps;
+# serializing them keeps concurrent writes from racing on the same ID
+_flashcard_write_lock = asyncio.Lock()
+
+
+def serialize_flashcard_writes(handler: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """Run an admin flashcard write handler while holding the write lock."""
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        async with _flashcard_write_lock:
+            return await handler(*args, **kwargs)
+
+    return wrapper
+
+
 def find_flashcard_filename_by_id(flashcard_id: str) -> Optional[str]:
-    """Find the actual filename for a flashcard by scanning all documents.
+    """Find the actual filename for a flashcard, scanning all documents if needed.
 
     This is needed because filenames may not match IDs (e.g.,
     DBTE_Kapitel9_Vektordatenbanken.yml contains id: dbte_kapitel9_quiz).
     """
+    filename = _flashcard_filename_index.get(flashcard_id)
+    if filename is not None:
+        return filename
+
     logger.info("Searching for flashcard filename", flashcard_id=flashcard_id)
 
     # Get all documents from storage
@@ -126,7 +395,9 @@ def find_flashcard_filename_by_id(flashcard_id: str) -> Optional[str]:
 
         # Parse the YAML to get the ID
         try:
-            data = yaml.safe_load(document.content)
+            data = load_yaml(document.content)
+            if data and data.get("id"):
+                _flashcard_filename_index[data["id"]] = document.filename
             if data and data.get("id") == flashcard_id:
                 logger.info("Found flashcard by ID scan",
                            flashcard_id=flashcard_id,
@@ -158,8 +429,6 @@ async def api_root():
 @api_router.post("/auth/signup")
 async def auth_signup(payload: SignupRequest):
     """Sign up a new user via Supabase Auth API"""
-    import httpx
-
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_publishable_key = os.getenv("SUPABASE_PUBLISHABLE_KEY")
     site_url = os.getenv("SITE_URL", "https://ommiquiz.de")
@@ -215,8 +484,6 @@ async def auth_signup(payload: SignupRequest):
 @api_router.post("/auth/login")
 async def auth_login(payload: LoginRequest):
     """Authenticate a user via Supabase Auth API"""
-    import httpx
-
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_publishable_key = os.getenv("SUPABASE_PUBLISHABLE_KEY")
 
@@ -266,8 +533,6 @@ async def auth_login(payload: LoginRequest):
 @api_router.post("/auth/logout")
 async def auth_logout(user: AuthenticatedUser = Depends(get_current_user)):
     """Sign out the current user"""
-    import httpx
-
     supabase_url = os.getenv("SUPABASE_URL")
     access_token = user.access_token
 
@@ -325,11 +590,13 @@ def _extract_flashcard_metadata(document: FlashcardDocument) -> Dict[str, Any]:
         "topics": [],
         "module": "",
         "cardcount": 0,
+        # Kept as a string: this metadata is also written to the YAML catalog,
+        # where a datetime would become an unquoted YAML timestamp
         "modified_time": document.modified_time.isoformat() if document.modified_time else None
     }
 
     try:
-        data = yaml.safe_load(document.content) or {}
+        data = load_yaml(document.content) or {}
 
         # Use the actual ID from YAML content, not the filename stem
         actual_id = data.get("id", document.id)
@@ -399,6 +666,11 @@ def collect_flashcard_metadata() -> List[Dict[str, Any]]:
         flashcard_files.append(metadata)
     
     logger.info("✅ Flashcard metadata collection complete", total_count=len(flashcard_files))
+
+    _flashcard_filename_index.clear()
+    _flashcard_filename_index.update(
+        (metadata["id"], metadata["filename"]) for metadata in flashcard_files
+    )
     
     # Final analysis of collected metadata
     phantom_modules = [f for f in flashcard_files if not f.get("title") and not f.get("description")]
@@ -414,21 +686,49 @@ def generate_flashcard_catalog() -> Tuple[Dict[str, Any], Path]:
     """Create or refresh the YAML catalog file and return its data and local path"""
     logger.info("Generating flashcard catalog")
 
+    # Taken before reading so a file changed during collection is picked up
+    # by the next startup rather than hidden behind a matching fingerprint
+    source_fingerprint = storage.source_fingerprint(CATALOG_FILENAME)
     flashcard_files = collect_flashcard_metadata()
 
     catalog_data: Dict[str, Any] = {
         "generatedAt": datetime.utcnow().isoformat() + "Z",
+        "sourceFingerprint": source_fingerprint,
         "total": len(flashcard_files),
         "flashcard-sets": flashcard_files
     }
 
-    catalog_yaml = yaml.safe_dump(catalog_data, allow_unicode=True, sort_keys=False)
+    catalog_yaml = dump_yaml(catalog_data)
     catalog_path = storage.save_catalog(catalog_yaml, CATALOG_FILENAME)
 
     logger.info("Flashcard catalog created", path=str(catalog_path), count=len(flashcard_files))
     return catalog_data, catalog_path
 
 
+def load_current_catalog() -> Optional[Dict[str, Any]]:
+    """Return the saved catalog if no flashcard file changed since it was generated.
+
+    Also rebuilds the flashcard ID index from it, as a regeneration would.
+    """
+    source_fingerprint = storage.source_fingerprint(CATALOG_FILENAME)
+    if source_fingerprint is None:
+        return None
+
+    catalog_yaml = storage.load_catalog(CATALOG_FILENAME)
+    if catalog_yaml is None:
+        return None
+
+    catalog_data = load_yaml(catalog_yaml)
+    if not isinstance(catalog_data, dict) or catalog_data.get("sourceFingerprint") != source_fingerprint:
+        return None
+
+    _flashcard_filename_index.clear()
+    _flashcard_filename_index.update(
+        (metadata["id"], metadata["filename"]) for metadata in catalog_data.get("flashcard-sets", [])
+    )
+    return catalog_data
+
+
 @api_router.get("/flashcards")
 async def list_flashcards(
     user: Optional[AuthenticatedUser] = Depends(get_optional_current_user)
@@ -442,8 +742,6 @@ async def list_flashcards(
     # Merge user flashcards
     if user:
         try:
-            from .database import get_db_pool
-
             pool = await get_db_pool()
             async with pool.acquire() as conn:
                 # Get global user flashcards (visible to everyone)
@@ -472,8 +770,8 @@ async def list_flashcards(
                         "author": row["author"],
                         "language": row["language"],
                         "module": row["module"],
-                        "topics": row["topics"] or [],
-                        "keywords": row["keywords"] or [],
+                        "topics": row["topics"],
+                        "keywords": row["keywords"],
                         "cardCount": row["card_count"],
                         "source": "user",  # Marker for user-generated
                         "visibility": "global" if row in global_user_flashcards else "private"
@@ -485,8 +783,6 @@ async def list_flashcards(
     else:
         # For unauthenticated users, include global user flashcards
         try:
-            from .database import get_db_pool
-
             pool = await get_db_pool()
             async with pool.acquire() as conn:
                 global_user_flashcards = await conn.fetch(
@@ -504,8 +800,8 @@ async def list_flashcards(
                         "author": row["author"],
                         "language": row["language"],
                         "module": row["module"],
-                        "topics": row["topics"] or [],
-                        "keywords": row["keywords"] or [],
+                        "topics": row["topics"],
+                        "keywords": row["keywords"],
                         "cardCount": row["card_count"],
                         "source": "user",
                         "visibility": "global"
@@ -551,12 +847,9 @@ async def get_flashcard(
     document = None
 
     # Check if this is a user flashcard first
-    from .storage import is_user_flashcard
     if is_user_flashcard(flashcard_id):
         logger.info("Detected user flashcard", flashcard_id=flashcard_id)
         try:
-            from .database import get_db_pool
-
             pool = await get_db_pool()
             async with pool.acquire() as conn:
                 flashcard_row = await conn.fetchrow(
@@ -619,7 +912,7 @@ async def get_flashcard(
 
     # Parse and return the flashcard data
     try:
-        data = yaml.safe_load(document.content)
+        data = load_yaml(document.content)
 
         logger.info("Flashcard retrieved successfully",
                    flashcard_id=flashcard_id,
@@ -676,7 +969,7 @@ async def get_speed_quiz_pdf(
 
     try:
         # Parse YAML content
-        data = yaml.safe_load(document.content)
+        data = load_yaml(document.content)
 
         # Generate PDF
         pdf_buffer = generate_speed_quiz_pdf(data)
@@ -687,12 +980,14 @@ async def get_speed_quiz_pdf(
 
         # Create safe filename
         title = data.get('title', 'speed-quiz')
-        safe_title = re.sub(r'[^\w\s-]', '', title).strip().replace(' ', '-')
+        safe_title = FILENAME_UNSAFE_CHARS_PATTERN.sub('', title).strip().replace(' ', '-')
         filename = f"{safe_title}-speed-quiz.pdf"
 
-        # Return PDF as streaming response
-        return StreamingResponse(
-            pdf_buffer,
+        # ReportLab writes the whole document when the build finishes, so the
+        # finished bytes are sent in one body (with a Content-Length) rather
+        # than iterated out of the buffer line by line
+        return Response(
+            content=pdf_buffer.getvalue(),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -781,6 +1076,8 @@ async def save_user_progress(
     success = await progress_storage.save_user_progress(user.user_id, flashcard_id, progress_data)
 
     if success:
+        if "session_summary" in progress_data:
+            learning_report_cache.invalidate_prefix(user.user_id)
         return {
             "success": True,
             "message": "Progress saved successfully"
@@ -820,9 +1117,11 @@ async def delete_user_progress(
 
 @api_router.get("/users/me/learning-report")
 async def get_learning_report(
+    request: Request,
     user: AuthenticatedUser = Depends(get_current_user),
     flashcard_id: Optional[str] = Query(None, description="Optional filter for specific flashcard set"),
-    days: int = Query(30, description="Number of days to include in report (default 30)")
+    days: int = Query(30, description="Number of days to include in report (default 30)"),
+    detail: bool = Query(True, description="Include the per-session list (default true)")
 ):
     """
     Generate learning report for the authenticated user.
@@ -832,16 +1131,27 @@ async def get_learning_report(
     Query parameters:
     - flashcard_id: Optional - filter for a specific flashcard set
     - days: Number of days to include (default 30)
+    - detail: If false, only the summary block is returned (no sessions list)
+
+    Responses carry an ETag and a short Cache-Control max-age; requests with a
+    matching If-None-Match header get 304 Not Modified.
 
     Requires authentication.
     """
-    from datetime import timedelta
-    from .database import get_db_pool
 
     logger.info("Generating learning report",
                 user_id=user.user_id,
                 flashcard_id=flashcard_id,
-                days=days)
+                days=days,
+                detail=detail)
+
+    cache_key = (user.user_id, flashcard_id, days, detail)
+    cached = learning_report_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Learning report served from cache",
+                   user_id=user.user_id)
+        etag, body = cached
+        return conditional_report_response(request, etag, body)
 
     pool = await get_db_pool()
 
@@ -850,79 +1160,90 @@ async def get_learning_report(
             # Calculate date range
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            # Build query with optional flashcard filter
-            if flashcard_id:
-                query = """
-                    SELECT id, flashcard_id, flashcard_title, started_at, completed_at,
-                           cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
-                           average_time_to_flip_seconds
-                    FROM quiz_sessions
-                    WHERE user_id = $1 AND flashcard_id = $2 AND completed_at >= $3
-                    ORDER BY completed_at DESC
-                """
-                sessions = await conn.fetch(query, user.user_id, flashcard_id, cutoff_date)
+            if not detail:
+                # Summary only: aggregate in Postgres and skip the session rows
+                if flashcard_id:
+                    statement = await conn.prepare_cached(_LEARNING_SUMMARY_SQL_FILTERED)
+                    totals = await statement.fetchrow(user.user_id, flashcard_id, cutoff_date)
+                else:
+                    statement = await conn.prepare_cached(_LEARNING_SUMMARY_SQL)
+                    totals = await statement.fetchrow(user.user_id, cutoff_date)
+
+                total_sessions = totals['total_sessions']
+                total_cards_reviewed = totals['total_cards_reviewed']
+                total_box1 = totals['total_box1']
+                total_box2 = totals['total_box2']
+                total_box3 = totals['total_box3']
+                total_duration = totals['total_duration']
+                average_time_to_flip = totals['average_time_to_flip_seconds']
+                last_completed_at = totals['last_completed_at']
+                session_details = None
             else:
-                query = """
-                    SELECT id, flashcard_id, flashcard_title, started_at, completed_at,
-                           cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
-                           average_time_to_flip_seconds
-                    FROM quiz_sessions
-                    WHERE user_id = $1 AND completed_at >= $2
-                    ORDER BY completed_at DESC
-                """
-                sessions = await conn.fetch(query, user.user_id, cutoff_date)
-
-            # Calculate aggregate statistics
-            total_sessions = len(sessions)
-            total_cards_reviewed = sum(row['cards_reviewed'] for row in sessions)
-            total_box1 = sum(row['box1_count'] for row in sessions)
-            total_box2 = sum(row['box2_count'] for row in sessions)
-            total_box3 = sum(row['box3_count'] for row in sessions)
-            total_duration = sum(row['duration_seconds'] or 0 for row in sessions)
-
-            # Calculate average time-to-flip across all sessions
-            flip_times = [row['average_time_to_flip_seconds'] for row in sessions if row['average_time_to_flip_seconds'] is not None]
-            average_time_to_flip = sum(flip_times) / len(flip_times) if flip_times else None
-
-            # Format session details
-            session_details = [
-                {
-                    "id": row['id'],
-                    "flashcard_id": row['flashcard_id'],
-                    "flashcard_title": row['flashcard_title'],
-                    "started_at": row['started_at'].isoformat(),
-                    "completed_at": row['completed_at'].isoformat(),
-                    "cards_reviewed": row['cards_reviewed'],
-                    "box1_count": row['box1_count'],
-                    "box2_count": row['box2_count'],
-                    "box3_count": row['box3_count'],
-                    "duration_seconds": row['duration_seconds'],
-                    "average_time_to_flip_seconds": row['average_time_to_flip_seconds']
-                }
-                for row in sessions
-            ]
+                # Use the prepared query with optional flashcard filter
+                if flashcard_id:
+                    statement = await conn.prepare_cached(_LEARNING_REPORT_SQL_FILTERED)
+                    sessions = await statement.fetch(user.user_id, flashcard_id, cutoff_date)
+                else:
+                    statement = await conn.prepare_cached(_LEARNING_REPORT_SQL)
+                    sessions = await statement.fetch(user.user_id, cutoff_date)
+
+                # Aggregate statistics and format session details in a single
+                # pass; the selected columns (including the ISO timestamps)
+                # already match the response keys, so convert each Record in C
+                total_cards_reviewed = 0
+                total_box1 = 0
+                total_box2 = 0
+                total_box3 = 0
+                total_duration = 0
+                flip_sum = 0.0
+                flip_count = 0
+                session_details = []
+                for row in sessions:
+                    session = dict(row)
+                    total_cards_reviewed += session["cards_reviewed"]
+                    total_box1 += session["box1_count"]
+                    total_box2 += session["box2_count"]
+                    total_box3 += session["box3_count"]
+                    total_duration += session["duration_seconds"]
+                    flip_time = session["average_time_to_flip_seconds"]
+                    if flip_time is not None:
+                        flip_sum += flip_time
+                        flip_count += 1
+                    session_details.append(session)
+
+                total_sessions = len(session_details)
+                average_time_to_flip = flip_sum / flip_count if flip_count else None
+                # Rows are ordered by completed_at DESC, so the first is the newest
+                last_completed_at = sessions[0]['completed_at'] if sessions else None
 
             logger.info("Learning report generated successfully",
                        user_id=user.user_id,
                        total_sessions=total_sessions,
                        total_cards_reviewed=total_cards_reviewed)
 
-            return {
+            report = {
                 "user_id": user.user_id,
                 "report_period_days": days,
                 "flashcard_filter": flashcard_id,
-                "summary": {
-                    "total_sessions": total_sessions,
-                    "total_cards_reviewed": total_cards_reviewed,
-                    "total_learned": total_box1,
-                    "total_uncertain": total_box2,
-                    "total_not_learned": total_box3,
-                    "total_duration_seconds": total_duration,
-                    "average_session_duration": total_duration / total_sessions if total_sessions > 0 else 0,
-                    "average_time_to_flip_seconds": average_time_to_flip
-                },
-                "sessions": session_details
+                "summary": build_learning_summary(
+                    total_sessions,
+                    total_cards_reviewed,
+                    total_box1,
+                    total_box2,
+                    total_box3,
+                    total_duration,
+                    average_time_to_flip
+                )
             }
+            if session_details is not None:
+                report["sessions"] = session_details
+
+            etag = learning_report_etag(total_sessions, last_completed_at)
+            # Report rows hold only JSON-native values, so the body is
+            # serialized with orjson and FastAPI's jsonable_encoder is skipped
+            body = orjson.dumps(report)
+            learning_report_cache.set(cache_key, (etag, body))
+            return conditional_report_response(request, etag, body)
 
     except Exception as e:
         logger.error("Error generating learning report",
@@ -934,6 +1255,82 @@ async def get_learning_report(
         )
 
 
+@api_router.get("/users/me/learning-report-multi")
+async def get_learning_report_multi(
+    user: AuthenticatedUser = Depends(get_current_user),
+    days: List[int] = Query([7, 30, 90], description="Report windows in days (repeat the parameter for several)"),
+    flashcard_id: Optional[str] = Query(None, description="Optional filter for specific flashcard set")
+):
+    """
+    Generate learning report summaries for several time windows in one call.
+
+    Each window runs the summary aggregate on its own pooled connection, and
+    all windows are queried concurrently, so a dashboard showing e.g. 7/30/90
+    day totals needs a single request.
+
+    Query parameters:
+    - days: Window sizes in days, e.g. ?days=7&days=30 (default 7, 30 and 90)
+    - flashcard_id: Optional - filter for a specific flashcard set
+
+    Requires authentication.
+    """
+
+    windows = list(dict.fromkeys(days))
+    if not windows or len(windows) > MAX_LEARNING_REPORT_WINDOWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Between 1 and {MAX_LEARNING_REPORT_WINDOWS} report windows can be requested"
+        )
+
+    logger.info("Generating multi-window learning report",
+                user_id=user.user_id,
+                flashcard_id=flashcard_id,
+                days=windows)
+
+    pool = await get_db_pool()
+    now = datetime.now()
+
+    async def summarize(window_days: int) -> Dict[str, Any]:
+        cutoff_date = now - timedelta(days=window_days)
+        async with pool.acquire() as conn:
+            if flashcard_id:
+                statement = await conn.prepare_cached(_LEARNING_SUMMARY_SQL_FILTERED)
+                totals = await statement.fetchrow(user.user_id, flashcard_id, cutoff_date)
+            else:
+                statement = await conn.prepare_cached(_LEARNING_SUMMARY_SQL)
+                totals = await statement.fetchrow(user.user_id, cutoff_date)
+
+        return build_learning_summary(
+            totals['total_sessions'],
+            totals['total_cards_reviewed'],
+            totals['total_box1'],
+            totals['total_box2'],
+            totals['total_box3'],
+            totals['total_duration'],
+            totals['average_time_to_flip_seconds']
+        )
+
+    try:
+        summaries = await asyncio.gather(*(summarize(window) for window in windows))
+    except Exception as e:
+        logger.error("Error generating multi-window learning report",
+                    user_id=user.user_id,
+                    error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate learning report: {str(e)}"
+        )
+
+    return {
+        "user_id": user.user_id,
+        "flashcard_filter": flashcard_id,
+        "reports": [
+            {"report_period_days": window, "summary": summary}
+            for window, summary in zip(windows, summaries)
+        ]
+    }
+
+
 @api_router.get("/users/me/quiz-history-pdf")
 async def get_quiz_history_pdf(
     user: AuthenticatedUser = Depends(get_current_user),
@@ -952,9 +1349,6 @@ async def get_quiz_history_pdf(
 
     Requires authentication.
     """
-    from datetime import timedelta
-    from .database import get_db_pool
-    from .quiz_history_pdf_generator import generate_quiz_history_pdf
 
     logger.info("Generating quiz history PDF",
                 user_id=user.user_id,
@@ -974,88 +1368,52 @@ async def get_quiz_history_pdf(
             # Calculate date range
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            # Get all sessions for user
-            query = """
-                SELECT id, flashcard_id, flashcard_title, started_at, completed_at,
-                       cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
-                       average_time_to_flip_seconds
-                FROM quiz_sessions
-                WHERE user_id = $1 AND completed_at >= $2
-                ORDER BY completed_at DESC
-            """
-            sessions = await conn.fetch(query, user.user_id, cutoff_date)
-
-            # Calculate aggregate statistics
-            total_sessions = len(sessions)
-            total_cards_reviewed = sum(row['cards_reviewed'] for row in sessions)
-            total_box1 = sum(row['box1_count'] for row in sessions)
-            total_box2 = sum(row['box2_count'] for row in sessions)
-            total_box3 = sum(row['box3_count'] for row in sessions)
-            total_duration = sum(row['duration_seconds'] or 0 for row in sessions)
-
-            # Calculate average time-to-flip across all sessions
-            flip_times = [row['average_time_to_flip_seconds'] for row in sessions if row['average_time_to_flip_seconds'] is not None]
-            average_time_to_flip = sum(flip_times) / len(flip_times) if flip_times else None
-
-            # Format session details
-            session_details = [
-                {
-                    "id": row['id'],
-                    "flashcard_id": row['flashcard_id'],
-                    "flashcard_title": row['flashcard_title'],
-                    "started_at": row['started_at'].isoformat() if row['started_at'] else None,
-                    "completed_at": row['completed_at'].isoformat() if row['completed_at'] else None,
-                    "cards_reviewed": row['cards_reviewed'],
-                    "box1_count": row['box1_count'],
-                    "box2_count": row['box2_count'],
-                    "box3_count": row['box3_count'],
-                    "duration_seconds": row['duration_seconds'],
-                    "average_time_to_flip_seconds": row['average_time_to_flip_seconds']
-                }
-                for row in sessions
-            ]
-
-            # Build report data structure
-            report_data = {
-                "user_id": user.user_id,
-                "user_email": user_email,
-                "user_name": user_name,
-                "days": days,
-                "summary": {
-                    "total_sessions": total_sessions,
-                    "total_cards_reviewed": total_cards_reviewed,
-                    "total_box1": total_box1,
-                    "total_box2": total_box2,
-                    "total_box3": total_box3,
-                    "total_duration": total_duration,
-                    "average_session_duration": total_duration / total_sessions if total_sessions > 0 else 0,
-                    "average_time_to_flip_seconds": average_time_to_flip
-                },
-                "sessions": session_details
-            }
+            # Stream sessions through a server-side cursor so the raw result
+            # set is never materialized; rows are aggregated and formatted as
+            # they arrive.
+            statement = await conn.prepare_cached(_QUIZ_HISTORY_PDF_SQL)
+            async with conn.transaction():
+                summary, session_rows = await collect_quiz_history(
+                    statement.cursor(user.user_id, cutoff_date, prefetch=1000)
+                )
+            total_sessions = summary["total_sessions"]
+
+        # Build report data structure
+        report_data = {
+            "user_id": user.user_id,
+            "user_email": user_email,
+            "user_name": user_name,
+            "days": days,
+            "summary": summary,
+            "session_rows": session_rows
+        }
 
-            # Generate PDF
-            pdf_buffer = generate_quiz_history_pdf(report_data, user_email)
+        # Generate PDF in a worker process; wait for the first chunk so build
+        # errors still surface as a 500 before the response starts
+        pdf_stream = stream_quiz_history_pdf(report_data, user_email)
+        first_chunk = await pdf_stream.__anext__()
 
-            logger.info("Quiz history PDF generated successfully",
-                       user_id=user.user_id,
-                       total_sessions=total_sessions)
+        async def pdf_body():
+            yield first_chunk
+            async for chunk in pdf_stream:
+                yield chunk
 
-            # Create filename
-            from datetime import date
-            today = date.today().isoformat()
-            filename = f"quiz-history-{today}.pdf"
+        logger.info("Quiz history PDF generated successfully",
+                   user_id=user.user_id,
+                   total_sessions=total_sessions)
 
-            # Return PDF as downloadable file
-            from fastapi.responses import StreamingResponse
+        # Create filename
+        today = date.today().isoformat()
+        filename = f"quiz-history-{today}.pdf"
 
-            return StreamingResponse(
-                pdf_buffer,
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
-            )
+        # Return PDF as downloadable file
+        return StreamingResponse(
+            pdf_body(),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
 
     except Exception as e:
         logger.error("Error generating quiz history PDF",
@@ -1073,66 +1431,112 @@ async def get_quiz_history_pdf(
 
 @api_router.get("/admin/users")
 async def list_users(
-    admin: AuthenticatedUser = Depends(get_current_admin),
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
     limit: int = Query(100, description="Maximum number of users to return"),
-    offset: int = Query(0, description="Number of users to skip")
+    cursor_created_at: Optional[datetime] = Query(None, description="created_at of the last user on the previous page"),
+    cursor_id: Optional[str] = Query(None, description="id of the last user on the previous page"),
+    exact_count: bool = Query(False, description="Count users exactly instead of using the planner estimate"),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
-    """List all users with their admin status (Admin only)."""
-    logger.info("Admin listing users", admin_user=admin.email, limit=limit, offset=offset)
+    """
+    List all users with their admin status (Admin only).
 
-    from .database import get_db_pool
-    pool = await get_db_pool()
+    Users are ordered by creation date (newest first, unknown dates last) and
+    paginated with a keyset cursor: pass the next_cursor values from the
+    previous response as cursor_created_at/cursor_id to fetch the next page.
+    The total is only returned for the first page; it is the planner's row
+    estimate (total_is_estimate=true) unless exact_count=true is passed.
+    """
+    logger.info("Admin listing users", admin_user=admin.email, limit=limit,
+                cursor_created_at=cursor_created_at.isoformat() if cursor_created_at else None,
+                cursor_id=cursor_id)
+
+    # Keyset condition for ORDER BY au.created_at DESC NULLS LAST, au.id DESC
+    if cursor_created_at is not None and cursor_id is not None:
+        keyset_clause = """
+                      AND (au.created_at < $2
+                           OR (au.created_at = $2 AND au.id < $3)
+                           OR au.created_at IS NULL)"""
+        keyset_args = [cursor_created_at, cursor_id]
+    elif cursor_id is not None:
+        # Previous page ended inside the trailing block of users without a created_at
+        keyset_clause = """
+                      AND au.created_at IS NULL AND au.id < $2"""
+        keyset_args = [cursor_id]
+    else:
+        keyset_clause = ""
+        keyset_args = []
 
     try:
-        async with pool.acquire() as conn:
-            # Get total count
-            total = await conn.fetchval("SELECT COUNT(*) FROM user_profiles")
+        # Total count is only needed (and only paid for) on the first page.
+        # The planner estimate is constant time; an exact COUNT(*) scans the
+        # table and is only run on request or before the table was analyzed.
+        total = None
+        total_is_estimate = False
+        if not keyset_args:
+            if not exact_count:
+                total = await conn.fetchval(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = 'public.user_profiles'::regclass"
+                )
+                total_is_estimate = total is not None and total >= 0
+            if not total_is_estimate:
+                total = await conn.fetchval("SELECT COUNT(*) FROM user_profiles")
+
+        # Get one page of users. Deferred join: the page of ids is picked
+        # from the auth.users (created_at, id) index first, and only those
+        # rows are joined to fetch profile and auth columns.
+        # user_profiles.id references auth.users(id), so every profile has
+        # a matching auth user.
+        users = await conn.fetch(
+            f"""
+            SELECT
+                up.id::text AS id,
+                up.email,
+                up.display_name,
+                up.is_admin,
+                to_char(au.created_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS created_at,
+                to_char(au.last_sign_in_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS last_sign_in_at,
+                to_char(au.updated_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS updated_at
+            FROM (
+                SELECT au.id
+                FROM auth.users au
+                WHERE EXISTS (SELECT 1 FROM user_profiles p WHERE p.id = au.id){keyset_clause}
+                ORDER BY au.created_at DESC NULLS LAST, au.id DESC
+                LIMIT $1
+            ) page
+            JOIN user_profiles up ON up.id = page.id
+            JOIN auth.users au ON au.id = page.id
+            ORDER BY au.created_at DESC NULLS LAST, au.id DESC
+            """,
+            limit, *keyset_args
+        )
 
-            # Get paginated users - JOIN with auth.users to get actual creation dates
-            users = await conn.fetch(
-                """
-                SELECT
-                    up.id,
-                    up.email,
-                    up.display_name,
-                    up.is_admin,
-                    au.created_at,
-                    au.last_sign_in_at,
-                    au.updated_at
-                FROM user_profiles up
-                LEFT JOIN auth.users au ON up.id = au.id
-                ORDER BY au.created_at DESC NULLS LAST
-                LIMIT $1 OFFSET $2
-                """,
-                limit, offset
-            )
+        # Ids and timestamps are already rendered as strings by Postgres
+        user_list = [dict(row) for row in users]
 
-            user_list = [
-                {
-                    "id": str(row['id']),
-                    "email": row['email'],
-                    "display_name": row['display_name'],
-                    "is_admin": row['is_admin'],
-                    "created_at": row['created_at'].isoformat() if row['created_at'] else None,
-                    "last_sign_in_at": row['last_sign_in_at'].isoformat() if row['last_sign_in_at'] else None,
-                    "updated_at": row['updated_at'].isoformat() if row['updated_at'] else None
-                }
-                for row in users
-            ]
+        # A full page means there may be more users after the last row
+        next_cursor = None
+        if len(user_list) == limit and user_list:
+            last_user = user_list[-1]
+            next_cursor = {
+                "created_at": last_user["created_at"],
+                "id": last_user["id"]
+            }
 
-            logger.info(
-                "Users listed successfully",
-                admin_user=admin.email,
-                total=total,
-                returned=len(user_list)
-            )
+        logger.info(
+            "Users listed successfully",
+            admin_user=admin.email,
+            total=total,
+            returned=len(user_list)
+        )
 
-            return {
-                "users": user_list,
-                "total": total,
-                "limit": limit,
-                "offset": offset
-            }
+        return {
+            "users": user_list,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
 
     except Exception as e:
         logger.error("Error listing users", admin_user=admin.email, error=str(e))
@@ -1146,7 +1550,8 @@ async def list_users(
 async def update_admin_status(
     user_id: str,
     is_admin: bool = Query(..., description="Set admin status"),
-    admin: AuthenticatedUser = Depends(get_current_admin)
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Grant or revoke admin privileges for a user (Admin only)."""
     logger.info(
@@ -1164,47 +1569,38 @@ async def update_admin_status(
             detail="Cannot revoke your own admin privileges"
         )
 
-    from .database import get_db_pool
-    pool = await get_db_pool()
-
     try:
-        async with pool.acquire() as conn:
-            # Verify user exists
-            user = await conn.fetchrow(
-                "SELECT email FROM user_profiles WHERE id = $1",
-                user_id
-            )
-
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"User {user_id} not found"
-                )
+        # Update admin status; no row means the user doesn't exist
+        user = await conn.fetchrow(
+            """
+            UPDATE user_profiles
+            SET is_admin = $1, updated_at = NOW()
+            WHERE id = $2
+            RETURNING email
+            """,
+            is_admin, user_id
+        )
 
-            # Update admin status
-            await conn.execute(
-                """
-                UPDATE user_profiles
-                SET is_admin = $1, updated_at = NOW()
-                WHERE id = $2
-                """,
-                is_admin, user_id
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail=f"User {user_id} not found"
             )
 
-            action = "granted" if is_admin else "revoked"
-            logger.info(
-                f"Admin privileges {action}",
-                admin_user=admin.email,
-                target_user_email=user['email'],
-                target_user_id=user_id
-            )
+        action = "granted" if is_admin else "revoked"
+        logger.info(
+            f"Admin privileges {action}",
+            admin_user=admin.email,
+            target_user_email=user['email'],
+            target_user_id=user_id
+        )
 
-            return {
-                "success": True,
-                "message": f"Admin privileges {action} for {user['email']}",
-                "user_id": user_id,
-                "is_admin": is_admin
-            }
+        return {
+            "success": True,
+            "message": f"Admin privileges {action} for {user['email']}",
+            "user_id": user_id,
+            "is_admin": is_admin
+        }
 
     except HTTPException:
         raise
@@ -1225,7 +1621,8 @@ async def update_admin_status(
 async def update_user_display_name(
     user_id: str,
     display_name: str = Query(..., description="New display name", min_length=1, max_length=100),
-    admin: AuthenticatedUser = Depends(get_current_admin)
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Update a user's display name (Admin only)."""
     logger.info(
@@ -1235,43 +1632,37 @@ async def update_user_display_name(
     )
 
     try:
-        async with get_db_connection() as conn:
-            # Check if user exists
-            user = await conn.fetchrow(
-                "SELECT id, email, display_name FROM user_profiles WHERE id = $1",
-                user_id
-            )
-
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found"
-                )
+        # Update display name; no row means the user doesn't exist
+        user = await conn.fetchrow(
+            """
+            UPDATE user_profiles
+            SET display_name = $1, updated_at = NOW()
+            WHERE id = $2
+            RETURNING email
+            """,
+            display_name, user_id
+        )
 
-            # Update display name
-            await conn.execute(
-                """
-                UPDATE user_profiles
-                SET display_name = $1, updated_at = NOW()
-                WHERE id = $2
-                """,
-                display_name, user_id
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found"
             )
 
-            logger.info(
-                f"Display name updated",
-                admin_user=admin.email,
-                target_user_email=user['email'],
-                target_user_id=user_id,
-                new_display_name=display_name
-            )
+        logger.info(
+            f"Display name updated",
+            admin_user=admin.email,
+            target_user_email=user['email'],
+            target_user_id=user_id,
+            new_display_name=display_name
+        )
 
-            return {
-                "success": True,
-                "message": f"Display name updated for {user['email']}",
-                "user_id": user_id,
-                "display_name": display_name
-            }
+        return {
+            "success": True,
+            "message": f"Display name updated for {user['email']}",
+            "user_id": user_id,
+            "display_name": display_name
+        }
 
     except HTTPException:
         raise
@@ -1288,10 +1679,15 @@ async def update_user_display_name(
         )
 
 
+# Built-in admin accounts that can never be deleted
+BUILTIN_ADMIN_EMAILS = ['ommiadmin@example.com', 'ommiadmin@ommiquiz.de']
+
+
 @api_router.delete("/admin/users/{user_id}")
 async def delete_user(
     user_id: str,
-    admin: AuthenticatedUser = Depends(get_current_admin)
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Delete a user and all associated data (Admin only)."""
     logger.info(
@@ -1308,70 +1704,67 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
 
-    from .database import get_db_pool
-    pool = await get_db_pool()
-
     try:
-        async with pool.acquire() as conn:
-            # Verify user exists and get email
-            user = await conn.fetchrow(
-                "SELECT email, is_admin FROM user_profiles WHERE id = $1",
-                user_id
+        # Delete the profile and all associated data in one statement;
+        # the built-in admin users are never matched
+        user = await conn.fetchrow(
+            """
+            WITH target AS (
+                SELECT id FROM user_profiles
+                WHERE id = $1 AND email <> ALL($2::text[])
+            ),
+            deleted_sessions AS (
+                DELETE FROM quiz_sessions
+                WHERE user_id IN (SELECT id FROM target)
+            ),
+            deleted_progress AS (
+                DELETE FROM flashcard_progress
+                WHERE user_id IN (SELECT id FROM target)
             )
+            DELETE FROM user_profiles
+            WHERE id IN (SELECT id FROM target)
+            RETURNING email
+            """,
+            user_id, BUILTIN_ADMIN_EMAILS
+        )
 
-            if not user:
+        if not user:
+            # Nothing deleted: tell a missing user apart from a protected one
+            existing = await conn.fetchval(
+                "SELECT email FROM user_profiles WHERE id = $1",
+                user_id
+            )
+            if existing is None:
                 raise HTTPException(
                     status_code=404,
                     detail=f"User {user_id} not found"
                 )
 
-            # Prevent deletion of built-in admin user
-            if user['email'] in ['ommiadmin@example.com', 'ommiadmin@ommiquiz.de']:
-                logger.warning(
-                    "Attempted to delete built-in admin",
-                    admin_user=admin.email,
-                    target_user=user['email']
-                )
-                raise HTTPException(
-                    status_code=403,
-                    detail="Cannot delete the built-in admin user"
-                )
-
-            # Delete user and all associated data in a transaction
-            async with conn.transaction():
-                # Delete quiz sessions
-                await conn.execute(
-                    "DELETE FROM quiz_sessions WHERE user_id = $1",
-                    user_id
-                )
-
-                # Delete learning progress
-                await conn.execute(
-                    "DELETE FROM flashcard_progress WHERE user_id = $1",
-                    user_id
-                )
-
-                # Delete user profile
-                await conn.execute(
-                    "DELETE FROM user_profiles WHERE id = $1",
-                    user_id
-                )
-
-            logger.info(
-                "User deleted successfully",
+            logger.warning(
+                "Attempted to delete built-in admin",
                 admin_user=admin.email,
-                deleted_user_email=user['email'],
-                deleted_user_id=user_id
+                target_user=existing
+            )
+            raise HTTPException(
+                status_code=403,
+                detail="Cannot delete the built-in admin user"
             )
 
-            return {
-                "success": True,
-                "message": f"User {user['email']} deleted successfully",
-                "user_id": user_id
-            }
+        logger.info(
+            "User deleted successfully",
+            admin_user=admin.email,
+            deleted_user_email=user['email'],
+            deleted_user_id=user_id
+        )
 
-    except HTTPException:
-        raise
+        return {
+            "success": True,
+            "message": f"User {user['email']} deleted successfully",
+            "user_id": user_id
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Error deleting user",
@@ -1387,78 +1780,83 @@ async def delete_user(
 
 @api_router.get("/admin/login-history")
 async def get_login_history(
-    admin: AuthenticatedUser = Depends(get_current_admin),
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
     days: int = Query(30, description="Number of days to include in report (default 30)"),
-    limit: int = Query(100, description="Maximum number of entries to return (default 100)")
+    limit: int = Query(100, description="Maximum number of entries to return (default 100)"),
+    before_time: Optional[datetime] = Query(None, description="login_time of the last entry on the previous page"),
+    before_id: Optional[str] = Query(None, description="log_id of the last entry on the previous page"),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
-    """Get user login history from custom login_history table (Admin only)."""
-    from datetime import timedelta
-    from .database import get_db_pool
-
-    logger.info("Admin fetching login history", admin_user=admin.email, days=days, limit=limit)
+    """
+    Get user login history from custom login_history table (Admin only).
 
-    pool = await get_db_pool()
+    Entries are ordered newest first and paginated with a keyset cursor: pass
+    the next_cursor values from the previous response as before_time/before_id
+    to fetch the next page.
+    """
+    logger.info("Admin fetching login history", admin_user=admin.email, days=days, limit=limit,
+                before_time=before_time.isoformat() if before_time else None,
+                before_id=before_id)
+
+    # Keyset condition for ORDER BY lh.login_time DESC, lh.id DESC
+    if before_time is not None and before_id is not None:
+        keyset_clause = """
+                  AND (lh.login_time, lh.id) < ($3, $4)"""
+        keyset_args = [before_time, before_id]
+    else:
+        keyset_clause = ""
+        keyset_args = []
 
     try:
-        async with pool.acquire() as conn:
-            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-            # Query custom login_history table
-            query = """
-                SELECT
-                    lh.id as log_id,
-                    lh.user_id,
-                    lh.email,
-                    lh.login_time,
-                    lh.success,
-                    lh.ip_address,
-                    lh.user_agent,
-                    lh.error_message,
-                    up.display_name,
-                    up.is_admin
-                FROM public.login_history lh
-                LEFT JOIN public.user_profiles up ON lh.user_id = up.id
-                WHERE lh.login_time >= $1
-                ORDER BY lh.login_time DESC
-                LIMIT $2
-            """
-
-            rows = await conn.fetch(query, cutoff_date, limit)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+
+        # Query custom login_history table
+        query = f"""
+            SELECT
+                lh.id::text AS log_id,
+                to_char(lh.login_time AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}) AS timestamp,
+                lh.user_id::text AS user_id,
+                lh.email,
+                up.display_name,
+                COALESCE(up.is_admin, FALSE) AS is_admin,
+                lh.ip_address,
+                'login' AS action,
+                lh.success,
+                CASE WHEN lh.success THEN 'success' ELSE 'failed' END AS login_type,
+                lh.error_message
+            FROM public.login_history lh
+            LEFT JOIN public.user_profiles up ON lh.user_id = up.id
+            WHERE lh.login_time >= $1{keyset_clause}
+            ORDER BY lh.login_time DESC, lh.id DESC
+            LIMIT $2
+        """
+
+        rows = await conn.fetch(query, cutoff_date, limit, *keyset_args)
+
+        # Response fields (ISO timestamps, login type) are projected by Postgres
+        history = [dict(row) for row in rows]
+
+        # A full page means there may be older entries after the last row
+        next_cursor = None
+        if len(history) == limit and history:
+            next_cursor = {
+                "login_time": history[-1]["timestamp"],
+                "id": history[-1]["log_id"]
+            }
 
-            history = []
-            for row in rows:
-                # Determine login type based on success status
-                if row['success']:
-                    login_type = "success"
-                else:
-                    login_type = "failed"
-
-                history.append({
-                    "log_id": str(row['log_id']),
-                    "timestamp": row['login_time'].isoformat() if row['login_time'] else None,
-                    "user_id": str(row['user_id']) if row['user_id'] else None,
-                    "email": row['email'],
-                    "display_name": row['display_name'],
-                    "is_admin": row['is_admin'] if row['is_admin'] is not None else False,
-                    "ip_address": row['ip_address'],
-                    "action": "login",
-                    "success": row['success'],
-                    "login_type": login_type,
-                    "error_message": row['error_message']
-                })
-
-            logger.info(
-                "Login history retrieved",
-                admin_user=admin.email,
-                total_attempts=len(history),
-                days=days
-            )
+        logger.info(
+            "Login history retrieved",
+            admin_user=admin.email,
+            total_attempts=len(history),
+            days=days
+        )
 
-            return {
-                "period_days": days,
-                "total_attempts": len(history),
-                "history": history
-            }
+        return {
+            "period_days": days,
+            "total_attempts": len(history),
+            "history": history,
+            "next_cursor": next_cursor
+        }
 
     except Exception as e:
         logger.error("Error fetching login history", error=str(e), admin_user=admin.email)
@@ -1469,75 +1867,68 @@ async def get_login_history(
 
 
 @api_router.get("/admin/user-activity-stats")
+@cached_response("admin:activity:{days}", ttl=60)
 async def get_user_activity_stats(
-    admin: AuthenticatedUser = Depends(get_current_admin),
-    days: int = Query(30, description="Number of days to include in report (default 30)")
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    days: int = Query(30, description="Number of days to include in report (default 30)"),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Get daily active user statistics for charting (Admin only)."""
-    from datetime import timedelta, date
-    from .database import get_db_pool
-
     logger.info("Admin fetching user activity stats", admin_user=admin.email, days=days)
 
-    pool = await get_db_pool()
-
     try:
-        async with pool.acquire() as conn:
-            start_date = datetime.now() - timedelta(days=days - 1)
-
-            # Get daily active users (users with at least one quiz session on that day)
-            query = """
-                WITH date_series AS (
-                    SELECT generate_series(
-                        DATE($1),
-                        DATE($2),
-                        interval '1 day'
-                    )::date as day
-                ),
-                daily_users AS (
-                    SELECT
-                        DATE(qs.completed_at) as activity_date,
-                        COUNT(DISTINCT qs.user_id) as active_users
-                    FROM quiz_sessions qs
-                    WHERE qs.completed_at >= $1
-                        AND qs.completed_at <= $2
-                    GROUP BY DATE(qs.completed_at)
-                )
+        start_date = datetime.now() - timedelta(days=days - 1)
+
+        # Get daily active users (users with at least one quiz session on that day)
+        query = """
+            WITH date_series AS (
+                SELECT generate_series(
+                    DATE($1),
+                    DATE($2),
+                    interval '1 day'
+                )::date as day
+            ),
+            daily_users AS (
+                SELECT
+                    DATE(qs.completed_at) as activity_date,
+                    COUNT(DISTINCT qs.user_id) as active_users
+                FROM quiz_sessions qs
+                WHERE qs.completed_at >= $1
+                    AND qs.completed_at <= $2
+                GROUP BY DATE(qs.completed_at)
+            ),
+            final AS (
                 SELECT
                     ds.day,
                     COALESCE(du.active_users, 0) as active_users
                 FROM date_series ds
                 LEFT JOIN daily_users du ON ds.day = du.activity_date
-                ORDER BY ds.day ASC
-            """
-
-            end_date = datetime.now()
-            rows = await conn.fetch(query, start_date, end_date)
-
-            daily_stats = [
-                {
-                    "date": row["day"].isoformat(),
-                    "active_users": row["active_users"]
-                }
-                for row in rows
-            ]
+            )
+            SELECT json_build_object(
+                'period_days', $3::int,
+                'daily_stats', COALESCE(
+                    (SELECT json_agg(json_build_object('date', day, 'active_users', active_users)
+                                     ORDER BY day ASC)
+                     FROM final),
+                    '[]'::json
+                ),
+                'summary', (
+                    SELECT json_build_object(
+                        'total_active_users', COALESCE(SUM(active_users), 0),
+                        'avg_active_users', COALESCE(ROUND(AVG(active_users), 2), 0),
+                        'max_active_users', COALESCE(MAX(active_users), 0),
+                        'days_with_activity', COUNT(*) FILTER (WHERE active_users > 0)
+                    )
+                    FROM final
+                )
+            )::text
+        """
 
-            # Calculate summary statistics
-            total_active_users = sum(day["active_users"] for day in daily_stats)
-            avg_active_users = total_active_users / len(daily_stats) if daily_stats else 0
-            max_active_users = max((day["active_users"] for day in daily_stats), default=0)
-            days_with_activity = sum(1 for day in daily_stats if day["active_users"] > 0)
+        # The daily series and its summary are built as JSON by Postgres
+        end_date = datetime.now()
+        body = await conn.fetchval(query, start_date, end_date, days)
 
-            return {
-                "period_days": days,
-                "daily_stats": daily_stats,
-                "summary": {
-                    "total_active_users": total_active_users,
-                    "avg_active_users": round(avg_active_users, 2),
-                    "max_active_users": max_active_users,
-                    "days_with_activity": days_with_activity
-                }
-            }
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error("Error fetching user activity stats", error=str(e), admin_user=admin.email)
@@ -1555,8 +1946,6 @@ async def submit_card_rating(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Submit or update a rating for a specific card."""
-    from .database import get_db_pool
-
     logger.info(
         "User submitting card rating",
         user_id=user.user_id,
@@ -1569,13 +1958,15 @@ async def submit_card_rating(
 
     try:
         async with pool.acquire() as conn:
-            # Insert or update rating using ON CONFLICT
+            # Insert or update rating using ON CONFLICT; re-submitting the
+            # same rating leaves the row (and updated_at) untouched
             result = await conn.fetchrow(
                 """
                 INSERT INTO card_ratings (user_id, flashcard_id, card_id, rating)
                 VALUES ($1, $2, $3, $4)
                 ON CONFLICT (user_id, flashcard_id, card_id)
-                DO UPDATE SET rating = $4, updated_at = NOW()
+                DO UPDATE SET rating = EXCLUDED.rating, updated_at = NOW()
+                WHERE card_ratings.rating IS DISTINCT FROM EXCLUDED.rating
                 RETURNING id, rating, created_at, updated_at
                 """,
                 user.user_id,
@@ -1584,6 +1975,19 @@ async def submit_card_rating(
                 rating
             )
 
+            if result is None:
+                # Unchanged rating: return the stored row
+                result = await conn.fetchrow(
+                    """
+                    SELECT id, rating, created_at, updated_at
+                    FROM card_ratings
+                    WHERE user_id = $1 AND flashcard_id = $2 AND card_id = $3
+                    """,
+                    user.user_id,
+                    flashcard_id,
+                    card_id
+                )
+
             return {
                 "success": True,
                 "rating": {
@@ -1591,8 +1995,8 @@ async def submit_card_rating(
                     "flashcard_id": flashcard_id,
                     "card_id": card_id,
                     "rating": result["rating"],
-                    "created_at": result["created_at"].isoformat(),
-                    "updated_at": result["updated_at"].isoformat()
+                    "created_at": result["created_at"],
+                    "updated_at": result["updated_at"]
                 }
             }
 
@@ -1616,8 +2020,6 @@ async def get_flashcard_ratings(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get user's ratings for a specific flashcard set."""
-    from .database import get_db_pool
-
     logger.info(
         "User fetching flashcard ratings",
         user_id=user.user_id,
@@ -1628,31 +2030,33 @@ async def get_flashcard_ratings(
 
     try:
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT card_id, rating, created_at, updated_at
+            # Postgres builds the whole response, ratings keyed by card_id
+            body = await conn.fetchval(
+                f"""
+                SELECT json_build_object(
+                    'flashcard_id', $2::text,
+                    'ratings', COALESCE(
+                        json_object_agg(
+                            card_id,
+                            json_build_object(
+                                'rating', rating,
+                                'created_at', to_char(created_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}),
+                                'updated_at', to_char(updated_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT})
+                            )
+                            ORDER BY updated_at DESC
+                        ),
+                        '{{}}'::json
+                    ),
+                    'total_rated', COUNT(*)
+                )::text
                 FROM card_ratings
                 WHERE user_id = $1 AND flashcard_id = $2
-                ORDER BY updated_at DESC
                 """,
                 user.user_id,
                 flashcard_id
             )
 
-            ratings = {
-                row["card_id"]: {
-                    "rating": row["rating"],
-                    "created_at": row["created_at"].isoformat(),
-                    "updated_at": row["updated_at"].isoformat()
-                }
-                for row in rows
-            }
-
-            return {
-                "flashcard_id": flashcard_id,
-                "ratings": ratings,
-                "total_rated": len(ratings)
-            }
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error(
@@ -1668,49 +2072,42 @@ async def get_flashcard_ratings(
 
 
 @api_router.get("/admin/flashcard-ratings-stats")
+@cached_response("admin:flashcard_ratings_stats", ttl=120)
 async def get_flashcard_ratings_stats(
-    admin: AuthenticatedUser = Depends(get_current_admin)
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Get rating statistics for all flashcards (Admin only)."""
-    from .database import get_db_pool
 
     logger.info("Admin fetching flashcard rating statistics", admin_user=admin.email)
 
-    pool = await get_db_pool()
-
     try:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
+        # Postgres aggregates and renders the whole response body as JSON,
+        # so no per-row dicts or Decimal -> float conversions happen here
+        body = await conn.fetchval(
+            """
+            SELECT json_build_object(
+                'total_flashcards_rated', COUNT(*),
+                'statistics', COALESCE(
+                    json_agg(t ORDER BY t.average_rating DESC, t.total_ratings DESC),
+                    '[]'::json
+                )
+            )::text
+            FROM (
                 SELECT
                     flashcard_id,
-                    COUNT(*) as total_ratings,
-                    ROUND(AVG(rating)::numeric, 2) as average_rating,
-                    MIN(rating) as min_rating,
-                    MAX(rating) as max_rating,
-                    COUNT(DISTINCT user_id) as unique_users
+                    COUNT(*)::int AS total_ratings,
+                    COALESCE(ROUND(AVG(rating)::numeric, 2), 0)::float AS average_rating,
+                    MIN(rating) AS min_rating,
+                    MAX(rating) AS max_rating,
+                    COUNT(DISTINCT user_id)::int AS unique_users
                 FROM card_ratings
                 GROUP BY flashcard_id
-                ORDER BY average_rating DESC, total_ratings DESC
-                """
-            )
+            ) t
+            """
+        )
 
-            stats = [
-                {
-                    "flashcard_id": row["flashcard_id"],
-                    "total_ratings": row["total_ratings"],
-                    "average_rating": float(row["average_rating"]) if row["average_rating"] else 0,
-                    "min_rating": row["min_rating"],
-                    "max_rating": row["max_rating"],
-                    "unique_users": row["unique_users"]
-                }
-                for row in rows
-            ]
-
-            return {
-                "total_flashcards_rated": len(stats),
-                "statistics": stats
-            }
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
         logger.error("Error fetching flashcard rating stats", error=str(e), admin_user=admin.email)
@@ -1722,60 +2119,57 @@ async def get_flashcard_ratings_stats(
 
 @api_router.get("/admin/flashcard-usage-stats")
 async def get_flashcard_usage_stats(
-    admin: AuthenticatedUser = Depends(get_current_admin)
+    admin: AuthenticatedUser = Depends(get_current_admin_with_connection),
+    conn: PreparedConnection = Depends(get_request_connection)
 ):
     """Get usage statistics for all flashcards based on quiz sessions (Admin only)."""
-    from .database import get_db_pool
 
     logger.info("Admin fetching flashcard usage statistics", admin_user=admin.email)
 
-    pool = await get_db_pool()
-
     try:
-        async with pool.acquire() as conn:
-            # Get aggregated usage stats per flashcard
-            rows = await conn.fetch(
-                """
-                SELECT
-                    flashcard_id,
-                    COUNT(DISTINCT id) as total_sessions,
-                    COUNT(DISTINCT user_id) as unique_users,
-                    SUM(cards_reviewed) as total_cards_reviewed,
-                    ROUND(AVG(duration_seconds)::numeric, 1) as avg_session_duration,
-                    MAX(completed_at) as last_used
-                FROM quiz_sessions
-                WHERE completed_at IS NOT NULL
-                GROUP BY flashcard_id
-                ORDER BY total_sessions DESC
-                """
-            )
+        # Get aggregated usage stats per flashcard
+        rows = await conn.fetch(
+            """
+            SELECT
+                flashcard_id,
+                COUNT(DISTINCT id) as total_sessions,
+                COUNT(DISTINCT user_id) as unique_users,
+                SUM(cards_reviewed) as total_cards_reviewed,
+                ROUND(AVG(duration_seconds)::numeric, 1) as avg_session_duration,
+                MAX(completed_at) as last_used
+            FROM quiz_sessions
+            WHERE completed_at IS NOT NULL
+            GROUP BY flashcard_id
+            ORDER BY total_sessions DESC
+            """
+        )
 
-            # Also get total flashcard titles from storage
-            flashcard_titles = {}
-            try:
-                flashcards_list = storage.list_flashcards()
-                for fc in flashcards_list:
-                    flashcard_titles[fc['id']] = fc.get('title', fc['id'])
-            except Exception as e:
-                logger.warning("Could not load flashcard titles", error=str(e))
-
-            stats = [
-                {
-                    "flashcard_id": row["flashcard_id"],
-                    "flashcard_title": flashcard_titles.get(row["flashcard_id"], row["flashcard_id"]),
-                    "total_sessions": row["total_sessions"],
-                    "unique_users": row["unique_users"],
-                    "total_cards_reviewed": row["total_cards_reviewed"] or 0,
-                    "avg_session_duration": float(row["avg_session_duration"]) if row["avg_session_duration"] else 0,
-                    "last_used": row["last_used"].isoformat() if row["last_used"] else None
-                }
-                for row in rows
-            ]
+        # Also get total flashcard titles from storage
+        flashcard_titles = {}
+        try:
+            flashcards_list = storage.list_flashcards()
+            for fc in flashcards_list:
+                flashcard_titles[fc['id']] = fc.get('title', fc['id'])
+        except Exception as e:
+            logger.warning("Could not load flashcard titles", error=str(e))
 
-            return {
-                "total_flashcards_with_usage": len(stats),
-                "statistics": stats
+        stats = [
+            {
+                "flashcard_id": row["flashcard_id"],
+                "flashcard_title": flashcard_titles.get(row["flashcard_id"], row["flashcard_id"]),
+                "total_sessions": row["total_sessions"],
+                "unique_users": row["unique_users"],
+                "total_cards_reviewed": row["total_cards_reviewed"] or 0,
+                "avg_session_duration": float(row["avg_session_duration"]) if row["avg_session_duration"] else 0,
+                "last_used": row["last_used"]
             }
+            for row in rows
+        ]
+
+        return {
+            "total_flashcards_with_usage": len(stats),
+            "statistics": stats
+        }
 
     except Exception as e:
         logger.error("Error fetching flashcard usage stats", error=str(e), admin_user=admin.email)
@@ -1792,58 +2186,46 @@ async def get_current_user_profile(
     """Get current user's profile including admin status."""
     logger.info("User fetching own profile", user_id=user.user_id, email=user.email)
 
-    from .database import get_db_pool
     pool = await get_db_pool()
 
     try:
         async with pool.acquire() as conn:
-            profile = await conn.fetchrow(
-                """
-                SELECT id, email, display_name, is_admin, created_at, updated_at
-                FROM user_profiles
-                WHERE id = $1
-                """,
-                user.user_id
-            )
-
-            if not profile:
-                # Create profile if it doesn't exist (for legacy users)
-                # Extract display_name from user metadata if available
-                user_metadata = user.metadata.get('user_metadata', {}) if user.metadata else {}
-                display_name = user_metadata.get('display_name') or user_metadata.get('username')
-
-                logger.info(
-                    "Creating profile for legacy user",
-                    user_id=user.user_id,
-                    email=user.email,
-                    display_name=display_name
-                )
-                await conn.execute(
-                    """
-                    INSERT INTO user_profiles (id, email, display_name, is_admin, created_at, updated_at)
-                    VALUES ($1, $2, $3, FALSE, NOW(), NOW())
-                    ON CONFLICT (id) DO NOTHING
-                    """,
-                    user.user_id, user.email, display_name
-                )
-
-                # Fetch again
+            # Create the profile if it doesn't exist (for legacy users) and
+            # return it in the same round trip
+            # Extract display_name from user metadata if available
+            user_metadata = user.metadata.get('user_metadata', {}) if user.metadata else {}
+            display_name = user_metadata.get('display_name') or user_metadata.get('username')
+
+            statement = await conn.prepare_cached(_CURRENT_USER_PROFILE_SQL)
+            profile = await statement.fetchrow(user.user_id, user.email, display_name)
+
+            if profile is None:
+                # Lost a race with a concurrent insert committed after our
+                # snapshot was taken; the row is visible now
                 profile = await conn.fetchrow(
                     """
-                    SELECT id, email, display_name, is_admin, created_at, updated_at
+                    SELECT id, email, display_name, is_admin, created_at, updated_at, FALSE AS created
                     FROM user_profiles
                     WHERE id = $1
                     """,
                     user.user_id
                 )
+            elif profile['created']:
+                logger.info(
+                    "Created profile for legacy user",
+                    user_id=user.user_id,
+                    email=user.email,
+                    display_name=display_name
+                )
 
+            # UUID and datetime values are serialized by the response class
             return {
-                "id": str(profile['id']),
+                "id": profile['id'],
                 "email": profile['email'],
                 "display_name": profile['display_name'],
                 "is_admin": profile['is_admin'],
-                "created_at": profile['created_at'].isoformat() if profile['created_at'] else None,
-                "updated_at": profile['updated_at'].isoformat() if profile['updated_at'] else None
+                "created_at": profile['created_at'],
+                "updated_at": profile['updated_at']
             }
 
     except Exception as e:
@@ -1874,8 +2256,6 @@ async def log_login_attempt(
     Log a login attempt to the login_history table.
     Called by frontend after authentication attempt (success or failure).
     """
-    from .database import get_db_pool
-
     # Get client IP address
     ip_address = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
@@ -1891,93 +2271,208 @@ async def log_login_attempt(
         ip_address=ip_address
     )
 
-    pool = await get_db_pool()
-
-    try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO public.login_history
-                (user_id, email, login_time, success, ip_address, user_agent, error_message)
-                VALUES ($1, $2, NOW(), $3, $4, $5, $6)
-                """,
-                user_id, payload.email, payload.success, ip_address, user_agent, payload.error_message
-            )
-
-        return {
-            "success": True,
-            "message": "Login attempt logged successfully"
-        }
-
-    except Exception as e:
-        logger.error(
-            "Error logging login attempt",
-            email=payload.email,
-            error=str(e)
-        )
-        # Don't fail the login if logging fails
+    # Written in batches by the login history writer task
+    if not enqueue_login_attempt(
+        user_id, payload.email, payload.success, ip_address, user_agent, payload.error_message
+    ):
+        # Don't fail the login if logging is unavailable
         return {
             "success": False,
-            "message": f"Failed to log login attempt: {str(e)}"
+            "message": "Failed to log login attempt: login history writer is not running or its queue is full"
         }
 
+    return {
+        "success": True,
+        "message": "Login attempt logged successfully"
+    }
+
 
 # ============================================================================
 # Favorites Endpoints
 # ============================================================================
 
+# Per-user favorites and flashcard lists are cached (keyed by user id) and
+# dropped by the endpoints that change them
+USER_LIST_CACHE_TTL = 60
+
+
+def user_flashcards_cache_keys(owner_id: Any) -> Tuple[str, str]:
+    """Cache keys of an owner's flashcard list, without and with favorite flags."""
+    return f"user_flashcards:{owner_id}:0", f"user_flashcards:{owner_id}:1"
+
+
+# The list bodies are built by Postgres with json_agg, so no row records or
+# per-row dicts are materialized before the (cached) body is returned
+_LIST_FAVORITES_SQL = f"""
+    SELECT json_build_object(
+               'favorites', COALESCE(
+                   json_agg(
+                       json_build_object(
+                           'flashcard_id', flashcard_id,
+                           'created_at', to_char(created_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT})
+                       )
+                       ORDER BY created_at DESC
+                   ),
+                   '[]'::json
+               ),
+               'count', COUNT(*)
+           )::text AS body,
+           COUNT(*) AS total
+    FROM flashcard_favorites
+    WHERE user_id = $1
+"""
+
+_USER_FLASHCARD_JSON_FIELDS = f"""
+    'flashcard_id', uf.flashcard_id,
+    'title', uf.title,
+    'description', uf.description,
+    'visibility', uf.visibility,
+    'card_count', uf.card_count,
+    'language', uf.language,
+    'module', uf.module,
+    'topics', uf.topics,
+    'keywords', uf.keywords,
+    'created_at', to_char(uf.created_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}),
+    'updated_at', to_char(uf.updated_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT})
+"""
+
+_LIST_USER_FLASHCARDS_SQL = """
+    SELECT json_build_object(
+               'success', true,
+               'flashcards', COALESCE(
+                   json_agg(json_build_object({fields}) ORDER BY uf.created_at DESC),
+                   '[]'::json
+               ),
+               'total', COUNT(*)
+           )::text AS body,
+           COUNT(*) AS total
+    FROM user_flashcards uf
+    {join}
+    WHERE uf.owner_id = $1
+"""
+
+_LIST_OWN_FLASHCARDS_SQL = _LIST_USER_FLASHCARDS_SQL.format(
+    fields=_USER_FLASHCARD_JSON_FIELDS, join=""
+)
+
+# Same fields plus the favorite flag, so clients need not merge the
+# favorites list themselves
+_LIST_OWN_FLASHCARDS_WITH_FAVORITES_SQL = _LIST_USER_FLASHCARDS_SQL.format(
+    fields=_USER_FLASHCARD_JSON_FIELDS + ", 'is_favorite', ff.flashcard_id IS NOT NULL",
+    join="LEFT JOIN flashcard_favorites ff ON ff.flashcard_id = uf.flashcard_id AND ff.user_id = $1",
+)
+
+register_prepared_statements(
+    _LIST_FAVORITES_SQL,
+    _LIST_OWN_FLASHCARDS_SQL,
+    _LIST_OWN_FLASHCARDS_WITH_FAVORITES_SQL,
+)
+
+
 @api_router.get("/users/me/favorites")
+@cached_response("favorites:{user.user_id}", ttl=USER_LIST_CACHE_TTL)
 async def get_user_favorites(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get list of user's favorite flashcard sets."""
-    from .database import get_db_pool
-
     logger.info("Fetching user favorites", user_id=user.user_id)
 
-    try:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT flashcard_id, created_at FROM flashcard_favorites WHERE user_id = $1 ORDER BY created_at DESC",
-                user.user_id
-            )
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        statement = await conn.prepare_cached(_LIST_FAVORITES_SQL)
+        result = await statement.fetchrow(user.user_id)
 
-        favorites = [{"flashcard_id": r["flashcard_id"], "created_at": r["created_at"].isoformat()} for r in rows]
+    logger.info("Fetched user favorites", user_id=user.user_id, count=result["total"])
 
-        logger.info("Fetched user favorites", user_id=user.user_id, count=len(favorites))
-
-        return {
-            "favorites": favorites,
-            "count": len(favorites)
-        }
-    except Exception as e:
-        logger.error("Error fetching favorites", user_id=user.user_id, error=str(e))
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to fetch favorites: {str(e)}"
-        )
+    return Response(content=result["body"], media_type="application/json")
 
 
 class AddFavoriteRequest(BaseModel):
     flashcard_id: str
 
 
+FlashcardVisibility = Literal["global", "private"]
+
+
 class CreateUserFlashcardRequest(BaseModel):
     """Request model for creating a user flashcard."""
     yaml_content: str
-    visibility: str = "private"  # 'global' or 'private'
+    visibility: FlashcardVisibility = "private"
 
 
 class UpdateUserFlashcardRequest(BaseModel):
     """Request model for updating a user flashcard."""
     yaml_content: str
-    visibility: Optional[str] = None
+    visibility: Optional[FlashcardVisibility] = None
 
 
 class UpdateVisibilityRequest(BaseModel):
     """Request model for updating flashcard visibility."""
-    visibility: str  # 'global' or 'private'
+    visibility: FlashcardVisibility
+
+
+def _yaml_number_to_str(value: Any) -> Any:
+    """Return YAML numbers (not booleans) as strings, anything else unchanged."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+class ParsedFlashcard(BaseModel):
+    """Metadata of a user flashcard YAML document stored alongside the file."""
+    id: Optional[str] = None
+    title: str = "Untitled"
+    description: Optional[str] = None
+    author: Optional[str] = None
+    language: str = "de"
+    module: Optional[str] = None
+    topics: List[str] = []
+    keywords: List[str] = []
+    flashcards: Optional[List[Any]] = None
+
+    @field_validator("id", "title", "description", "author", "language", "module", mode="before")
+    @classmethod
+    def _number_to_str(cls, value: Any) -> Any:
+        # YAML reads unquoted values such as "id: 101" or "module: 3" as
+        # numbers; they have always been accepted as text
+        return _yaml_number_to_str(value)
+
+    @field_validator("topics", "keywords", mode="before")
+    @classmethod
+    def _empty_list_for_null(cls, value: Any) -> Any:
+        # The columns are NOT NULL; an empty "topics:" entry means no topics
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return [_yaml_number_to_str(item) for item in value]
+        return value
+
+    @property
+    def card_count(self) -> int:
+        return len(self.flashcards) if self.flashcards else 0
+
+
+async def parse_user_flashcard(yaml_content: str) -> ParsedFlashcard:
+    """
+    Parse and validate the YAML of a user flashcard before any database work.
+
+    Raises:
+        HTTPException: 400 if the YAML is malformed or its metadata has the wrong shape
+    """
+    try:
+        flashcard_data = await load_yaml_off_loop(yaml_content)
+    except yaml.YAMLError as e:
+        logger.error("Invalid YAML content", error=str(e))
+        raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
+
+    if not flashcard_data or not isinstance(flashcard_data, dict):
+        raise HTTPException(status_code=400, detail="Invalid YAML content")
+
+    try:
+        return ParsedFlashcard.model_validate(flashcard_data)
+    except ValidationError as e:
+        logger.error("Invalid flashcard metadata", error=str(e))
+        raise HTTPException(status_code=400, detail=f"Invalid flashcard metadata: {str(e)}")
 
 
 @api_router.post("/users/me/favorites")
@@ -1986,8 +2481,6 @@ async def add_favorite(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Add flashcard set to favorites."""
-    from .database import get_db_pool
-
     logger.info("=== ADD FAVORITE DEBUG START ===")
     logger.info("Request received", 
                 user_id=user.user_id, 
@@ -1996,75 +2489,44 @@ async def add_favorite(
                 request_data=request.dict(),
                 timestamp=datetime.utcnow().isoformat())
 
-    try:
-        logger.info("Attempting to get database connection pool")
-        pool = await get_db_pool()
-        logger.info("Database pool acquired successfully")
-        
-        async with pool.acquire() as conn:
-            logger.info("Database connection acquired from pool")
-            
-            # Check if favorite already exists
-            existing = await conn.fetchrow(
-                "SELECT id FROM flashcard_favorites WHERE user_id = $1 AND flashcard_id = $2",
-                user.user_id, request.flashcard_id
-            )
-            logger.info("Checked for existing favorite", 
-                       exists=bool(existing),
-                       existing_id=existing['id'] if existing else None)
-            
-            if existing:
-                logger.info("Favorite already exists, returning success anyway")
-                return {
-                    "success": True,
-                    "message": "Already favorited",
-                    "flashcard_id": request.flashcard_id
-                }
-            
-            # Insert new favorite
-            logger.info("Inserting new favorite record")
-            result = await conn.fetchrow(
-                """INSERT INTO flashcard_favorites (user_id, flashcard_id)
-                   VALUES ($1, $2)
-                   RETURNING id, flashcard_id, created_at""",
-                user.user_id, request.flashcard_id
-            )
-            
-            logger.info("Favorite inserted successfully", 
-                       favorite_id=result['id'],
-                       flashcard_id=result['flashcard_id'],
-                       created_at=result['created_at'].isoformat())
+    logger.info("Attempting to get database connection pool")
+    pool = await get_db_pool()
+    logger.info("Database pool acquired successfully")
+
+    async with pool.acquire() as conn:
+        logger.info("Database connection acquired from pool")
+
+        # Insert new favorite; an existing one is left as is
+        logger.info("Inserting new favorite record")
+        favorite_id = await conn.fetchval(
+            """INSERT INTO flashcard_favorites (user_id, flashcard_id)
+               VALUES ($1, $2)
+               ON CONFLICT (user_id, flashcard_id) DO NOTHING
+               RETURNING id""",
+            user.user_id, request.flashcard_id
+        )
 
-            logger.info("=== ADD FAVORITE DEBUG END (SUCCESS) ===")
+        if favorite_id is None:
+            logger.info("Favorite already exists, returning success anyway")
             return {
                 "success": True,
-                "message": "Favorite added",
-                "flashcard_id": request.flashcard_id,
-                "favorite_id": result['id']
+                "message": "Already favorited",
+                "flashcard_id": request.flashcard_id
             }
-            
-    except Exception as e:
-        logger.error("=== ADD FAVORITE DEBUG END (ERROR) ===")
-        logger.error("Error adding favorite", 
-                    user_id=user.user_id, 
-                    flashcard_id=request.flashcard_id, 
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                    error_details=repr(e))
-        
-        # Log additional database connection info if available
-        try:
-            pool = await get_db_pool()
-            logger.error("Database pool status", 
-                        pool_size=pool.get_size() if hasattr(pool, 'get_size') else 'unknown',
-                        pool_available=pool.get_available() if hasattr(pool, 'get_available') else 'unknown')
-        except Exception as pool_error:
-            logger.error("Could not get database pool status", error=str(pool_error))
-        
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to add favorite: {str(e)}"
-        )
+
+        logger.info("Favorite inserted successfully",
+                   favorite_id=favorite_id,
+                   flashcard_id=request.flashcard_id)
+
+        await response_cache.delete(f"favorites:{user.user_id}", user_flashcards_cache_keys(user.user_id)[1])
+
+        logger.info("=== ADD FAVORITE DEBUG END (SUCCESS) ===")
+        return {
+            "success": True,
+            "message": "Favorite added",
+            "flashcard_id": request.flashcard_id,
+            "favorite_id": favorite_id
+        }
 
 
 @api_router.delete("/users/me/favorites/{flashcard_id}")
@@ -2073,102 +2535,106 @@ async def remove_favorite(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Remove flashcard set from favorites."""
-    from .database import get_db_pool
-
     logger.info("Removing favorite", user_id=user.user_id, flashcard_id=flashcard_id)
 
-    try:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "DELETE FROM flashcard_favorites WHERE user_id = $1 AND flashcard_id = $2",
-                user.user_id, flashcard_id
-            )
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "DELETE FROM flashcard_favorites WHERE user_id = $1 AND flashcard_id = $2",
+            user.user_id, flashcard_id
+        )
 
-        logger.info("Favorite removed", user_id=user.user_id, flashcard_id=flashcard_id)
+    await response_cache.delete(f"favorites:{user.user_id}", user_flashcards_cache_keys(user.user_id)[1])
 
-        return {
-            "success": True,
-            "message": "Favorite removed"
-        }
-    except Exception as e:
-        logger.error("Error removing favorite", user_id=user.user_id, flashcard_id=flashcard_id, error=str(e))
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to remove favorite: {str(e)}"
-        )
+    logger.info("Favorite removed", user_id=user.user_id, flashcard_id=flashcard_id)
+
+    return {
+        "success": True,
+        "message": "Favorite removed"
+    }
 
 
 # ===== User Flashcards Endpoints =====
 
+# Write access condition for user_flashcards statements taking the
+# flashcard ID as $1 and the current user's ID as $2: owner or admin
+_FLASHCARD_WRITE_ACCESS_SQL = (
+    "(owner_id = $2 OR EXISTS (SELECT 1 FROM user_profiles WHERE id = $2 AND is_admin))"
+)
+
+
+# Fixed statement text so it is prepared once per connection; a NULL
+# visibility ($11) keeps the current value
+_UPDATE_USER_FLASHCARD_SQL = f"""
+    UPDATE user_flashcards
+    SET title = $3, description = $4, author = $5, language = $6, module = $7,
+        topics = $8, keywords = $9, card_count = $10,
+        visibility = COALESCE($11, visibility)
+    WHERE flashcard_id = $1 AND {_FLASHCARD_WRITE_ACCESS_SQL}
+    RETURNING owner_id, filename
+"""
+
+register_prepared_statements(_UPDATE_USER_FLASHCARD_SQL)
+
+
+async def raise_flashcard_access_error(conn, flashcard_id: str, action: str) -> None:
+    """Raise 404 or 403 after a guarded write on a user flashcard matched no row."""
+    exists = await conn.fetchval(
+        "SELECT 1 FROM user_flashcards WHERE flashcard_id = $1",
+        flashcard_id
+    )
+    if not exists:
+        raise HTTPException(status_code=404, detail="Flashcard not found")
+    raise HTTPException(status_code=403, detail=f"Not authorized to {action} this flashcard")
+
+
 @api_router.post("/users/me/flashcards")
 async def create_user_flashcard(
     request: CreateUserFlashcardRequest,
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a new user flashcard."""
-    from .database import get_db_pool
-    from .storage import generate_user_flashcard_id
 
     logger.info("Creating user flashcard", user_id=user.user_id, visibility=request.visibility)
 
-    # Validate visibility
-    if request.visibility not in ("global", "private"):
-        raise HTTPException(status_code=400, detail="Visibility must be 'global' or 'private'")
+    flashcard = await parse_user_flashcard(request.yaml_content)
+    author = flashcard.author or user.email or "Unknown"
 
-    try:
-        # Parse YAML to extract metadata
-        flashcard_data = yaml.safe_load(request.yaml_content)
-        if not flashcard_data or not isinstance(flashcard_data, dict):
-            raise HTTPException(status_code=400, detail="Invalid YAML content")
-
-        # Extract metadata
-        title = flashcard_data.get("title", "Untitled")
-        description = flashcard_data.get("description")
-        author = flashcard_data.get("author", user.email or "Unknown")
-        language = flashcard_data.get("language", "de")
-        module = flashcard_data.get("module")
-        topics = flashcard_data.get("topics", [])
-        keywords = flashcard_data.get("keywords", [])
-        cards = flashcard_data.get("flashcards", [])
-        card_count = len(cards) if isinstance(cards, list) else 0
-
-        # Generate flashcard ID from title or use provided ID
-        if "id" in flashcard_data:
-            slug = flashcard_data["id"]
-        else:
-            # Create slug from title
-            slug = re.sub(r'[^a-z0-9_-]', '_', title.lower().replace(' ', '_'))
-            slug = re.sub(r'_+', '_', slug).strip('_')
+    # Generate flashcard ID from title or use provided ID
+    if flashcard.id is not None:
+        slug = flashcard.id
+    else:
+        # Create slug from title
+        slug = SLUG_INVALID_CHARS_PATTERN.sub('_', flashcard.title.lower().replace(' ', '_'))
+        slug = SLUG_REPEATED_UNDERSCORES_PATTERN.sub('_', slug).strip('_')
 
-        flashcard_id = generate_user_flashcard_id(user.user_id, slug)
-        filename = f"{flashcard_id}.yaml"
+    flashcard_id = generate_user_flashcard_id(user.user_id, slug)
+    filename = f"{flashcard_id}.yaml"
 
-        # Check if flashcard already exists
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            existing = await conn.fetchrow(
-                "SELECT flashcard_id FROM user_flashcards WHERE flashcard_id = $1",
-                flashcard_id
-            )
-            if existing:
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"Flashcard with ID '{flashcard_id}' already exists"
-                )
-
-        # Save to storage
-        storage_type = os.getenv("FLASHCARDS_STORAGE", "local").lower()
-        try:
-            document = storage.save_user_flashcard(user.user_id, filename, request.yaml_content)
-            storage_path = storage.get_user_flashcard_path(user.user_id, flashcard_id)
-        except FileExistsError:
-            raise HTTPException(status_code=409, detail="Flashcard file already exists")
-        except Exception as e:
-            logger.error("Failed to save user flashcard to storage", error=str(e))
-            raise HTTPException(status_code=500, detail=f"Storage error: {str(e)}")
+    storage_type = os.getenv("FLASHCARDS_STORAGE", "local").lower()
 
-        # Save metadata to database
+    # Save to storage; an existing file means the flashcard exists
+    try:
+        document = await asyncio.to_thread(
+            storage.save_user_flashcard, user.user_id, filename, request.yaml_content
+        )
+        storage_path = storage.get_user_flashcard_path(user.user_id, flashcard_id)
+    except FileExistsError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Flashcard with ID '{flashcard_id}' already exists"
+        )
+    except Exception as e:
+        logger.error("Failed to save user flashcard to storage", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Storage error: {str(e)}")
+
+    # Save metadata to database; remove the stored file again if that
+    # fails or conflicts. The save above did not raise FileExistsError, so
+    # the file was created by this request. A conflicting row can belong to
+    # another user, since IDs only carry an 8-character user prefix while
+    # storage paths use the full user_id.
+    pool = await get_db_pool()
+    try:
         async with pool.acquire() as conn:
             result = await conn.fetchrow(
                 """INSERT INTO user_flashcards (
@@ -2176,80 +2642,54 @@ async def create_user_flashcard(
                     language, module, topics, keywords, card_count,
                     storage_type, storage_path, filename
                 ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-                RETURNING id, flashcard_id, created_at""",
-                flashcard_id, user.user_id, request.visibility, title, description, author,
-                language, module, topics, keywords, card_count,
-                storage_type, storage_path, filename
+                ON CONFLICT (flashcard_id) DO NOTHING
+                RETURNING created_at""",
+                flashcard_id, user.user_id, request.visibility, flashcard.title, flashcard.description,
+                author, flashcard.language, flashcard.module, flashcard.topics, flashcard.keywords,
+                flashcard.card_count, storage_type, storage_path, filename
             )
+    except Exception:
+        await asyncio.to_thread(storage.delete_user_flashcard, user.user_id, flashcard_id)
+        raise
 
-        logger.info("User flashcard created", flashcard_id=flashcard_id, user_id=user.user_id)
+    if result is None:
+        await asyncio.to_thread(storage.delete_user_flashcard, user.user_id, flashcard_id)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Flashcard with ID '{flashcard_id}' already exists"
+        )
 
-        return {
-            "success": True,
-            "flashcard_id": flashcard_id,
-            "message": "Flashcard created successfully",
-            "created_at": result["created_at"].isoformat() if result["created_at"] else None
-        }
+    await response_cache.delete(*user_flashcards_cache_keys(user.user_id))
 
-    except HTTPException:
-        raise
-    except yaml.YAMLError as e:
-        logger.error("Invalid YAML content", error=str(e))
-        raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
-    except Exception as e:
-        logger.error("Failed to create user flashcard", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to create flashcard: {str(e)}")
+    logger.info("User flashcard created", flashcard_id=flashcard_id, user_id=user.user_id)
+
+    return {
+        "success": True,
+        "flashcard_id": flashcard_id,
+        "message": "Flashcard created successfully",
+        "created_at": result["created_at"]
+    }
 
 
 @api_router.get("/users/me/flashcards")
+@cached_response("user_flashcards:{user.user_id}:{include_favorite:d}", ttl=USER_LIST_CACHE_TTL)
 async def list_user_flashcards(
+    include_favorite: bool = Query(False, description="Add an is_favorite flag to each flashcard"),
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """List all flashcards owned by the current user."""
-    from .database import get_db_pool
-
-    logger.info("Listing user flashcards", user_id=user.user_id)
+    logger.info("Listing user flashcards", user_id=user.user_id, include_favorite=include_favorite)
 
-    try:
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """SELECT flashcard_id, title, description, visibility, card_count,
-                          language, module, topics, keywords, created_at, updated_at
-                   FROM user_flashcards
-                   WHERE owner_id = $1
-                   ORDER BY created_at DESC""",
-                user.user_id
-            )
-
-        flashcards = [
-            {
-                "flashcard_id": row["flashcard_id"],
-                "title": row["title"],
-                "description": row["description"],
-                "visibility": row["visibility"],
-                "card_count": row["card_count"],
-                "language": row["language"],
-                "module": row["module"],
-                "topics": row["topics"] or [],
-                "keywords": row["keywords"] or [],
-                "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
-            }
-            for row in rows
-        ]
-
-        logger.info("User flashcards listed", user_id=user.user_id, count=len(flashcards))
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        statement = await conn.prepare_cached(
+            _LIST_OWN_FLASHCARDS_WITH_FAVORITES_SQL if include_favorite else _LIST_OWN_FLASHCARDS_SQL
+        )
+        result = await statement.fetchrow(user.user_id)
 
-        return {
-            "success": True,
-            "flashcards": flashcards,
-            "total": len(flashcards)
-        }
+    logger.info("User flashcards listed", user_id=user.user_id, count=result["total"])
 
-    except Exception as e:
-        logger.error("Failed to list user flashcards", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to list flashcards: {str(e)}")
+    return Response(content=result["body"], media_type="application/json")
 
 
 @api_router.put("/users/me/flashcards/{flashcard_id}")
@@ -2259,8 +2699,6 @@ async def update_user_flashcard(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Update a user flashcard."""
-    from .database import get_db_pool
-    from .storage import is_user_flashcard
 
     logger.info("Updating user flashcard", flashcard_id=flashcard_id, user_id=user.user_id)
 
@@ -2268,81 +2706,36 @@ async def update_user_flashcard(
     if not is_user_flashcard(flashcard_id):
         raise HTTPException(status_code=400, detail="Not a user-generated flashcard")
 
-    try:
-        # Check ownership
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            flashcard_row = await conn.fetchrow(
-                "SELECT owner_id, filename FROM user_flashcards WHERE flashcard_id = $1",
-                flashcard_id
-            )
+    flashcard = await parse_user_flashcard(request.yaml_content)
 
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        # The updated row stays locked until the file is written, and a
+        # failed write rolls the metadata back
+        async with conn.transaction():
+            statement = await conn.prepare_cached(_UPDATE_USER_FLASHCARD_SQL)
+            flashcard_row = await statement.fetchrow(
+                flashcard_id, user.user_id, flashcard.title, flashcard.description, flashcard.author,
+                flashcard.language, flashcard.module, flashcard.topics, flashcard.keywords,
+                flashcard.card_count, request.visibility
+            )
             if not flashcard_row:
-                raise HTTPException(status_code=404, detail="Flashcard not found")
-
-            if flashcard_row["owner_id"] != user.user_id and not user.is_admin:
-                raise HTTPException(status_code=403, detail="Not authorized to update this flashcard")
-
-        # Parse YAML to extract updated metadata
-        flashcard_data = yaml.safe_load(request.yaml_content)
-        if not flashcard_data or not isinstance(flashcard_data, dict):
-            raise HTTPException(status_code=400, detail="Invalid YAML content")
-
-        # Extract metadata
-        title = flashcard_data.get("title", "Untitled")
-        description = flashcard_data.get("description")
-        author = flashcard_data.get("author")
-        language = flashcard_data.get("language", "de")
-        module = flashcard_data.get("module")
-        topics = flashcard_data.get("topics", [])
-        keywords = flashcard_data.get("keywords", [])
-        cards = flashcard_data.get("flashcards", [])
-        card_count = len(cards) if isinstance(cards, list) else 0
-
-        # Update storage
-        filename = flashcard_row["filename"]
-        storage.save_user_flashcard(flashcard_row["owner_id"], filename, request.yaml_content, overwrite=True)
-
-        # Update database metadata
-        update_fields = {
-            "title": title,
-            "description": description,
-            "author": author,
-            "language": language,
-            "module": module,
-            "topics": topics,
-            "keywords": keywords,
-            "card_count": card_count,
-        }
-
-        if request.visibility:
-            if request.visibility not in ("global", "private"):
-                raise HTTPException(status_code=400, detail="Visibility must be 'global' or 'private'")
-            update_fields["visibility"] = request.visibility
-
-        # Build UPDATE query
-        set_clause = ", ".join([f"{k} = ${i+2}" for i, k in enumerate(update_fields.keys())])
-        query = f"UPDATE user_flashcards SET {set_clause} WHERE flashcard_id = $1"
-        params = [flashcard_id] + list(update_fields.values())
+                await raise_flashcard_access_error(conn, flashcard_id, "update")
 
-        async with pool.acquire() as conn:
-            await conn.execute(query, *params)
+            # Update storage
+            await asyncio.to_thread(
+                storage.save_user_flashcard,
+                flashcard_row["owner_id"], flashcard_row["filename"], request.yaml_content, overwrite=True
+            )
 
-        logger.info("User flashcard updated", flashcard_id=flashcard_id, user_id=user.user_id)
+    await response_cache.delete(*user_flashcards_cache_keys(flashcard_row['owner_id']))
 
-        return {
-            "success": True,
-            "message": "Flashcard updated successfully"
-        }
+    logger.info("User flashcard updated", flashcard_id=flashcard_id, user_id=user.user_id)
 
-    except HTTPException:
-        raise
-    except yaml.YAMLError as e:
-        logger.error("Invalid YAML content", error=str(e))
-        raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
-    except Exception as e:
-        logger.error("Failed to update user flashcard", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to update flashcard: {str(e)}")
+    return {
+        "success": True,
+        "message": "Flashcard updated successfully"
+    }
 
 
 @api_router.delete("/users/me/flashcards/{flashcard_id}")
@@ -2351,53 +2744,42 @@ async def delete_user_flashcard(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a user flashcard."""
-    from .database import get_db_pool
-    from .storage import is_user_flashcard
-
-    logger.info("Deleting user flashcard", flashcard_id=flashcard_id, user_id=user.user_id)
-
-    # Verify it's a user flashcard
-    if not is_user_flashcard(flashcard_id):
-        raise HTTPException(status_code=400, detail="Not a user-generated flashcard")
-
-    try:
-        # Check ownership
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            flashcard_row = await conn.fetchrow(
-                "SELECT owner_id FROM user_flashcards WHERE flashcard_id = $1",
-                flashcard_id
-            )
-
-            if not flashcard_row:
-                raise HTTPException(status_code=404, detail="Flashcard not found")
 
-            if flashcard_row["owner_id"] != user.user_id and not user.is_admin:
-                raise HTTPException(status_code=403, detail="Not authorized to delete this flashcard")
+    logger.info("Deleting user flashcard", flashcard_id=flashcard_id, user_id=user.user_id)
 
-        # Delete from storage
-        deleted_files = storage.delete_user_flashcard(flashcard_row["owner_id"], flashcard_id)
+    # Verify it's a user flashcard
+    if not is_user_flashcard(flashcard_id):
+        raise HTTPException(status_code=400, detail="Not a user-generated flashcard")
 
-        # Delete from database
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "DELETE FROM user_flashcards WHERE flashcard_id = $1",
-                flashcard_id
-            )
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        # Delete from database; only the owner or an admin matches a row
+        flashcard_row = await conn.fetchrow(
+            f"""
+            DELETE FROM user_flashcards
+            WHERE flashcard_id = $1 AND {_FLASHCARD_WRITE_ACCESS_SQL}
+            RETURNING owner_id
+            """,
+            flashcard_id, user.user_id
+        )
+        if not flashcard_row:
+            await raise_flashcard_access_error(conn, flashcard_id, "delete")
 
-        logger.info("User flashcard deleted", flashcard_id=flashcard_id, user_id=user.user_id, deleted_files=deleted_files)
+    await response_cache.delete(*user_flashcards_cache_keys(flashcard_row['owner_id']))
 
-        return {
-            "success": True,
-            "message": "Flashcard deleted successfully",
-            "deleted_files": deleted_files
-        }
+    # Delete from storage once the row is gone, so a failed delete never
+    # leaves metadata pointing at a missing file
+    deleted_files = await asyncio.to_thread(
+        storage.delete_user_flashcard, flashcard_row["owner_id"], flashcard_id
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to delete user flashcard", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to delete flashcard: {str(e)}")
+    logger.info("User flashcard deleted", flashcard_id=flashcard_id, user_id=user.user_id, deleted_files=deleted_files)
+
+    return {
+        "success": True,
+        "message": "Flashcard deleted successfully",
+        "deleted_files": deleted_files
+    }
 
 
 @api_router.patch("/users/me/flashcards/{flashcard_id}/visibility")
@@ -2407,8 +2789,6 @@ async def update_flashcard_visibility(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Toggle flashcard visibility between global and private."""
-    from .database import get_db_pool
-    from .storage import is_user_flashcard
 
     logger.info("Updating flashcard visibility", flashcard_id=flashcard_id, visibility=request.visibility, user_id=user.user_id)
 
@@ -2416,45 +2796,29 @@ async def update_flashcard_visibility(
     if not is_user_flashcard(flashcard_id):
         raise HTTPException(status_code=400, detail="Not a user-generated flashcard")
 
-    # Validate visibility
-    if request.visibility not in ("global", "private"):
-        raise HTTPException(status_code=400, detail="Visibility must be 'global' or 'private'")
-
-    try:
-        # Check ownership
-        pool = await get_db_pool()
-        async with pool.acquire() as conn:
-            flashcard_row = await conn.fetchrow(
-                "SELECT owner_id FROM user_flashcards WHERE flashcard_id = $1",
-                flashcard_id
-            )
-
-            if not flashcard_row:
-                raise HTTPException(status_code=404, detail="Flashcard not found")
-
-            if flashcard_row["owner_id"] != user.user_id and not user.is_admin:
-                raise HTTPException(status_code=403, detail="Not authorized to update this flashcard")
-
-        # Update visibility
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE user_flashcards SET visibility = $1 WHERE flashcard_id = $2",
-                request.visibility, flashcard_id
-            )
+    pool = await get_db_pool()
+    async with pool.acquire() as conn:
+        # Update visibility; only the owner or an admin matches a row
+        flashcard_row = await conn.fetchrow(
+            f"""
+            UPDATE user_flashcards SET visibility = $3
+            WHERE flashcard_id = $1 AND {_FLASHCARD_WRITE_ACCESS_SQL}
+            RETURNING owner_id
+            """,
+            flashcard_id, user.user_id, request.visibility
+        )
+        if not flashcard_row:
+            await raise_flashcard_access_error(conn, flashcard_id, "update")
 
-        logger.info("Flashcard visibility updated", flashcard_id=flashcard_id, visibility=request.visibility)
+    await response_cache.delete(*user_flashcards_cache_keys(flashcard_row['owner_id']))
 
-        return {
-            "success": True,
-            "message": f"Flashcard visibility updated to {request.visibility}",
-            "visibility": request.visibility
-        }
+    logger.info("Flashcard visibility updated", flashcard_id=flashcard_id, visibility=request.visibility)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to update flashcard visibility", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to update visibility: {str(e)}")
+    return {
+        "success": True,
+        "message": f"Flashcard visibility updated to {request.visibility}",
+        "visibility": request.visibility
+    }
 
 
 @api_router.get("/health")
@@ -2478,6 +2842,13 @@ async def get_version():
     }
 
 
+def card_id_prefix(cardset_id: str) -> str:
+    """Return the 3-character card ID prefix for a cardset (see generate_card_id)."""
+    # Extract first 3 letters from cardset_id (skip non-alphanumeric),
+    # padded with 'x' if less than 3 characters
+    return ''.join(c for c in cardset_id if c.isalnum())[:3].lower().ljust(3, 'x')
+
+
 def generate_card_id(cardset_id: str, card_index: int) -> str:
     """
     Generate a unique card ID from cardset ID and index.
@@ -2492,16 +2863,8 @@ def generate_card_id(cardset_id: str, card_index: int) -> str:
     Returns:
         Card ID in format: prefix + number (e.g., "thr001")
     """
-    # Extract first 3 letters from cardset_id (skip non-alphanumeric)
-    prefix = ''.join(c for c in cardset_id if c.isalnum())[:3].lower()
-
-    # Pad with 'x' if less than 3 characters
-    prefix = prefix.ljust(3, 'x')
-
-    # Create number part (1-indexed for display, e.g., 001, 002, 003)
-    number = str(card_index + 1).zfill(3)
-
-    return f"{prefix}{number}"
+    # Number part is 1-indexed for display, e.g., 001, 002, 003
+    return f"{card_id_prefix(cardset_id)}{card_index + 1:03d}"
 
 
 def ensure_card_ids(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -2515,35 +2878,29 @@ def ensure_card_ids(data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Modified data with card IDs
     """
-    logger.info("ensure_card_ids called",
-               has_flashcards="flashcards" in data,
-               flashcards_type=type(data.get("flashcards")).__name__ if "flashcards" in data else "N/A")
-
     if "flashcards" not in data or not isinstance(data["flashcards"], list):
-        logger.info("Skipping ensure_card_ids - no flashcards list")
+        logger.debug("Skipping ensure_card_ids - no flashcards list")
         return data
 
     cardset_id = data.get("id", "unknown")
-    logger.info("Processing flashcards for card IDs",
-               cardset_id=cardset_id,
-               card_count=len(data["flashcards"]))
 
+    # Logged once per set rather than per card; large sets have hundreds of cards
+    # The prefix is the same for every card in the set
+    prefix = card_id_prefix(cardset_id)
+    generated_count = 0
     for i, card in enumerate(data["flashcards"]):
-        logger.info("Checking card",
-                   card_index=i,
-                   is_dict=isinstance(card, dict),
-                   has_id="id" in card if isinstance(card, dict) else False)
-
         if not isinstance(card, dict):
             continue
 
         # Generate ID if not present
         if "id" not in card or not card["id"]:
-            card["id"] = generate_card_id(cardset_id, i)
-            logger.info("Generated card ID",
-                       card_index=i,
-                       card_id=card["id"],
-                       cardset_id=cardset_id)
+            card["id"] = f"{prefix}{i + 1:03d}"
+            generated_count += 1
+
+    logger.info("Generated card IDs",
+               cardset_id=cardset_id,
+               generated=generated_count,
+               total=len(data["flashcards"]))
 
     return data
 
@@ -2619,7 +2976,7 @@ def validate_flashcard_yaml(data: Dict[str, Any]) -> Dict[str, Any]:
                             # Check if it's a URL
                             if bitmap_value.startswith(('http://', 'https://')):
                                 # Validate URL format
-                                if not re.match(r'^https?://[^\s]+\.(jpg|jpeg|png|gif|webp|svg)(\?.*)?$', bitmap_value, re.IGNORECASE):
+                                if not BITMAP_URL_PATTERN.match(bitmap_value):
                                     errors.append(
                                         f"Flashcard {i+1} field 'bitmap' contains an invalid image URL. "
                                         f"Must be a valid HTTP(S) URL ending with .jpg, .png, .gif, .webp, or .svg"
@@ -2629,11 +2986,11 @@ def validate_flashcard_yaml(data: Dict[str, Any]) -> Dict[str, Any]:
                                     logger.warning(f"Flashcard {i+1} uses HTTP URL for bitmap. HTTPS recommended.")
                             # Validate data URI
                             elif bitmap_value.startswith('data:'):
-                                if not re.match(r'^data:image/[a-zA-Z+]+;base64,[A-Za-z0-9+/=]+$', bitmap_value):
+                                if not BITMAP_DATA_URI_PATTERN.match(bitmap_value):
                                     errors.append(f"Flashcard {i+1} field 'bitmap' contains malformed data URI")
                             # Validate raw base64
                             else:
-                                if not re.match(r'^[A-Za-z0-9+/=]+$', bitmap_value):
+                                if not BASE64_PATTERN.match(bitmap_value):
                                     errors.append(
                                         f"Flashcard {i+1} field 'bitmap' must be a URL (http://...), "
                                         f"data URI (data:image/...), or valid base64 data"
@@ -2652,12 +3009,23 @@ def validate_flashcard_yaml(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def flashcard_stats(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Summary of a validated flashcard set returned by the admin endpoints."""
+    return {
+        "total_cards": len(data.get("flashcards") or []),
+        "language": data.get("language"),
+        "level": data.get("level"),
+        "topics": data.get("topics", [])
+    }
+
+
 class FlashcardUpdateRequest(BaseModel):
     content: str
     filename: str
     old_id: str | None = None  # For rename operations
 
 @api_router.put("/flashcards/{flashcard_id}")
+@serialize_flashcard_writes
 async def update_flashcard(
     flashcard_id: str,
     request: FlashcardUpdateRequest,
@@ -2681,7 +3049,7 @@ async def update_flashcard(
 
     # Parse YAML content
     try:
-        data = yaml.safe_load(request.content)
+        data = load_yaml(request.content)
     except yaml.YAMLError as e:
         logger.error("Invalid YAML in update request", flashcard_id=flashcard_id, error=str(e))
         raise HTTPException(
@@ -2723,12 +3091,13 @@ async def update_flashcard(
         logger.info("Processing flashcard rename",
                    old_id=request.old_id,
                    new_id=flashcard_id)
-        # Find and delete the old file by scanning all documents
+        # Find and delete the old file by its actual filename
         old_filename = find_flashcard_filename_by_id(request.old_id)
         if old_filename:
             # Delete the old file using its actual filename
             try:
-                storage.delete_flashcard_by_filename(old_filename)
+                await asyncio.to_thread(storage.delete_flashcard_by_filename, old_filename)
+                _flashcard_filename_index.pop(request.old_id, None)
                 logger.info("Deleted old flashcard during rename",
                            old_id=request.old_id,
                            old_filename=old_filename)
@@ -2741,7 +3110,7 @@ async def update_flashcard(
         filename = None
         is_new_document = True
     else:
-        # Normal update or create - find the actual filename by scanning all documents
+        # Normal update or create - find the actual filename
         filename = find_flashcard_filename_by_id(flashcard_id)
         is_new_document = filename is None
 
@@ -2762,29 +3131,22 @@ async def update_flashcard(
 
     # Update or create the file
     try:
-        updated_content = yaml.dump(
-            data, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
-        logger.info("Calling storage.save_flashcard",
-                   flashcard_id=flashcard_id,
-                   filename=filename,
-                   overwrite=overwrite,
-                   content_length=len(updated_content),
-                   storage_type=type(storage).__name__)
-        saved_document = storage.save_flashcard(
-            filename, updated_content, overwrite=overwrite
+        updated_content = dump_yaml(data, default_flow_style=False, encoding="utf-8")
+        saved_document = await asyncio.to_thread(
+            storage.save_flashcard, filename, updated_content, overwrite=overwrite
         )
+        _flashcard_filename_index[flashcard_id] = saved_document.filename
 
         action = "created" if is_new_document else "updated"
+        stats = flashcard_stats(data)
         logger.info(f"Flashcard {action} successfully",
                    flashcard_id=flashcard_id,
                    filename=filename,
-                   cards_count=len(data.get("flashcards", [])))
+                   cards_count=stats["total_cards"])
 
         # Regenerate the catalog to keep it in sync with the storage backend
         try:
             generate_flashcard_catalog()
-            logger.info("Catalog regenerated after flashcard update")
         except Exception as e:
             logger.warning("Failed to regenerate catalog after update", error=str(e))
 
@@ -2794,12 +3156,7 @@ async def update_flashcard(
             "filename": saved_document.filename,
             "flashcard_id": flashcard_id,
             "warnings": validation["warnings"],
-            "stats": {
-                "total_cards": len(data.get("flashcards", [])),
-                "language": data.get("language"),
-                "level": data.get("level"),
-                "topics": data.get("topics", [])
-            }
+            "stats": stats
         }
 
     except FileExistsError as e:
@@ -2820,7 +3177,65 @@ async def update_flashcard(
             detail=f"Failed to update file: {str(e)}"
         )
 
+
+# Uploaded flashcard files are read in chunks and rejected as soon as they
+# exceed the size limit, so an oversized upload is never held in memory
+MAX_FLASHCARD_FILE_SIZE = 1024 * 1024  # 1MB
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def read_flashcard_upload(file: UploadFile) -> bytes:
+    """
+    Read an uploaded flashcard file, enforcing MAX_FLASHCARD_FILE_SIZE.
+
+    Raises:
+        HTTPException: 413 if the file is larger than the limit
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail="File size too large. Maximum size is 1MB"
+    )
+    if file.size is not None and file.size > MAX_FLASHCARD_FILE_SIZE:
+        logger.warning("File too large in upload", filename=file.filename, size=file.size)
+        raise too_large
+
+    chunks: List[bytes] = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > MAX_FLASHCARD_FILE_SIZE:
+            logger.warning("File too large in upload", filename=file.filename, size=total)
+            raise too_large
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+# Parsed uploads keyed by a digest of the file bytes, so validating a file and
+# then uploading it (or re-uploading it while debugging) parses it only once
+parsed_upload_cache = TTLCache(maxsize=64, ttl=600)
+
+
+def load_flashcard_upload(content: bytes) -> Any:
+    """
+    Parse uploaded flashcard YAML, reusing the result for identical uploads.
+
+    Callers get their own copy, since upload adds card IDs to it in place.
+    Parse errors are raised as by load_yaml and not cached.
+    """
+    key = hashlib.blake2b(content, digest_size=16).digest()
+    data = parsed_upload_cache.get(key)
+    if data is None:
+        data = load_yaml(content)
+        parsed_upload_cache.set(key, data)
+    return copy.deepcopy(data)
+
+
 @api_router.post("/flashcards/upload")
+@serialize_flashcard_writes
 async def upload_flashcard(
     file: UploadFile = File(...),
     overwrite: str = Form(default="false"),
@@ -2844,38 +3259,26 @@ async def upload_flashcard(
         )
     
     # Validate file size (max 1MB)
-    content = await file.read()
-    if len(content) > 1024 * 1024:  # 1MB limit
-        logger.warning("File too large in upload", filename=file.filename, size=len(content))
-        raise HTTPException(
-            status_code=413,
-            detail="File size too large. Maximum size is 1MB"
-        )
+    content = await read_flashcard_upload(file)
     
     # Parse YAML content
     try:
-        data = yaml.safe_load(content.decode('utf-8'))
-    except yaml.YAMLError as e:
-        logger.error("YAML parsing error in upload", filename=file.filename, error=str(e))
+        data = load_flashcard_upload(content)
+    except yaml.reader.ReaderError as e:
+        logger.error("Encoding error in upload", filename=file.filename, error=str(e))
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid YAML format: {str(e)}"
+            detail=f"File encoding error: {str(e)}. Please use UTF-8 encoding"
         )
-    except UnicodeDecodeError as e:
-        logger.error("Encoding error in upload", filename=file.filename, error=str(e))
+    except yaml.YAMLError as e:
+        logger.error("YAML parsing error in upload", filename=file.filename, error=str(e))
         raise HTTPException(
             status_code=400,
-            detail=f"File encoding error: {str(e)}. Please use UTF-8 encoding"
+            detail=f"Invalid YAML format: {str(e)}"
         )
 
     # Ensure all cards have IDs
-    logger.info("About to call ensure_card_ids",
-               flashcard_id=data.get("id"),
-               card_count=len(data.get("flashcards", [])))
     data = ensure_card_ids(data)
-    logger.info("After calling ensure_card_ids",
-               flashcard_id=data.get("id"),
-               card_count=len(data.get("flashcards", [])))
 
     # Validate flashcard structure
     validation = validate_flashcard_yaml(data)
@@ -2899,7 +3302,9 @@ async def upload_flashcard(
     filename = f"{flashcard_id}{original_extension}"
     allow_overwrite = overwrite.lower() == "true"
 
-    existing_flashcard = storage.flashcard_exists(flashcard_id)
+    existing_flashcard = (
+        flashcard_id in _flashcard_filename_index or storage.flashcard_exists(flashcard_id)
+    )
 
     if existing_flashcard and not allow_overwrite:
         logger.warning("Flashcard already exists",
@@ -2916,37 +3321,33 @@ async def upload_flashcard(
 
     # Save file
     try:
-        serialized = yaml.dump(
-            data, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
+        serialized = dump_yaml(data, default_flow_style=False, encoding="utf-8")
         action = "overwritten" if existing_flashcard else "created"
-        storage.save_flashcard(filename, serialized, overwrite=allow_overwrite)
+        saved_document = await asyncio.to_thread(
+            storage.save_flashcard, filename, serialized, overwrite=allow_overwrite
+        )
+        _flashcard_filename_index[flashcard_id] = saved_document.filename
 
+        stats = flashcard_stats(data)
         logger.info("Flashcard upload completed",
-                   flashcard_id=data.get("id"),
+                   flashcard_id=flashcard_id,
                    filename=filename,
                    action=action,
-                   cards_count=len(data.get("flashcards", [])))
+                   cards_count=stats["total_cards"])
 
         # Regenerate the catalog to keep it in sync with the storage backend
         try:
             generate_flashcard_catalog()
-            logger.info("Catalog regenerated after flashcard upload")
         except Exception as e:
             logger.warning("Failed to regenerate catalog after upload", error=str(e))
 
         return {
             "success": True,
-            "message": f"Flashcard '{data.get('id', filename)}' {action} successfully",
+            "message": f"Flashcard '{flashcard_id or filename}' {action} successfully",
             "filename": filename,
-            "flashcard_id": data.get("id"),
+            "flashcard_id": flashcard_id,
             "warnings": validation["warnings"],
-            "stats": {
-                "total_cards": len(data.get("flashcards", [])),
-                "language": data.get("language"),
-                "level": data.get("level"),
-                "topics": data.get("topics", [])
-            }
+            "stats": stats
         }
     
     except Exception as e:
@@ -2960,6 +3361,7 @@ async def upload_flashcard(
 
 
 @api_router.delete("/flashcards/{flashcard_id}")
+@serialize_flashcard_writes
 async def delete_flashcard(
     flashcard_id: str,
     admin: AuthenticatedUser = Depends(get_current_admin)
@@ -2972,33 +3374,28 @@ async def delete_flashcard(
         admin_user=admin.email
     )
 
-    # First try to find by ID-based filename
-    document = get_flashcard_document(flashcard_id)
-    filename = None
-
-    # If not found, scan all documents to find actual filename
-    if document is None:
-        logger.info("Flashcard not found by ID-based filename, scanning all documents for deletion",
-                   flashcard_id=flashcard_id)
-        filename = find_flashcard_filename_by_id(flashcard_id)
-        if not filename:
+    # Resolve the actual filename from the ID index, falling back to the
+    # ID-based filename for files whose content ID does not match
+    filename = find_flashcard_filename_by_id(flashcard_id)
+    if filename is None:
+        document = get_flashcard_document(flashcard_id)
+        if document is None:
             logger.error("Flashcard not found for deletion", flashcard_id=flashcard_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"Flashcard '{flashcard_id}' not found"
             )
-    else:
         filename = document.filename
 
     try:
         # Delete by actual filename if found by scanning, otherwise use ID-based deletion
         if filename and filename != f"{flashcard_id}.yaml" and filename != f"{flashcard_id}.yml":
             # Delete by actual filename
-            success = storage.delete_flashcard_by_filename(filename)
+            success = await asyncio.to_thread(storage.delete_flashcard_by_filename, filename)
             deleted_files = [filename] if success else []
         else:
             # Use ID-based deletion (tries both .yaml and .yml)
-            deleted_files = storage.delete_flashcard(flashcard_id)
+            deleted_files = await asyncio.to_thread(storage.delete_flashcard, flashcard_id)
 
         if not deleted_files:
             logger.error("Failed to delete flashcard from storage", flashcard_id=flashcard_id)
@@ -3006,6 +3403,7 @@ async def delete_flashcard(
                 status_code=500,
                 detail=f"Failed to delete flashcard '{flashcard_id}'"
             )
+        _flashcard_filename_index.pop(flashcard_id, None)
 
         # Regenerate the catalog to keep it in sync with the storage backend
         generate_flashcard_catalog()
@@ -3044,22 +3442,24 @@ async def validate_flashcard_file(file: UploadFile = File(...)):
             detail="File must have .yaml or .yml extension"
         )
     
+    # Validate file size (max 1MB)
+    content = await read_flashcard_upload(file)
+
     # Parse YAML content
     try:
-        content = await file.read()
-        data = yaml.safe_load(content.decode('utf-8'))
-    except yaml.YAMLError as e:
-        logger.warning("YAML parsing error in validation", filename=file.filename, error=str(e))
+        data = load_flashcard_upload(content)
+    except yaml.reader.ReaderError as e:
+        logger.warning("Encoding error in validation", filename=file.filename, error=str(e))
         return {
             "valid": False,
-            "errors": [f"Invalid YAML format: {str(e)}"],
+            "errors": [f"File encoding error: {str(e)}. Please use UTF-8 encoding"],
             "warnings": []
         }
-    except UnicodeDecodeError as e:
-        logger.warning("Encoding error in validation", filename=file.filename, error=str(e))
+    except yaml.YAMLError as e:
+        logger.warning("YAML parsing error in validation", filename=file.filename, error=str(e))
         return {
             "valid": False,
-            "errors": [f"File encoding error: {str(e)}. Please use UTF-8 encoding"],
+            "errors": [f"Invalid YAML format: {str(e)}"],
             "warnings": []
         }
     
@@ -3075,14 +3475,249 @@ async def validate_flashcard_file(file: UploadFile = File(...)):
         "valid": validation["valid"],
         "errors": validation["errors"],
         "warnings": validation["warnings"],
-        "stats": {
-            "total_cards": len(data.get("flashcards", [])),
-            "language": data.get("language"),
-            "level": data.get("level"),
-            "topics": data.get("topics", [])
-        } if validation["valid"] else None
+        "stats": flashcard_stats(data) if validation["valid"] else None
+    }
+
+
+def _parse_log_line(line: Union[str, bytes], file_name: Optional[str], line_number: Optional[int]) -> Dict[str, Any]:
+    """Turn one formatted log line (JSON or plain text) into a /logs entry."""
+    try:
+        # Try to parse as JSON (structured log); orjson takes the raw bytes
+        # read from the file, so JSON lines are never decoded separately
+        log_data = orjson.loads(line)
+
+        # Normalize timestamp field
+        timestamp_str = log_data.get("timestamp") or log_data.get("asctime") or log_data.get("dt")
+        if timestamp_str:
+            # Parse ISO format timestamp
+            try:
+                if timestamp_str.endswith('Z'):
+                    timestamp_str = timestamp_str[:-1] + '+00:00'
+                log_timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+            except:
+                # Fallback parsing
+                log_timestamp = datetime.now()
+        else:
+            log_timestamp = datetime.now()
+
+        entry = {
+            "timestamp": log_timestamp.isoformat(),
+            "level": log_data.get("level") or log_data.get("levelname", "INFO"),
+            "message": log_data.get("message", ""),
+            "logger": log_data.get("logger") or log_data.get("name", ""),
+            "file": file_name,
+            "line_number": line_number,
+            "extra": {k: v for k, v in log_data.items() 
+                    if k not in ["timestamp", "level", "message", "logger", "name", "asctime", "dt"]},
+            "_ts_epoch": log_timestamp.timestamp()
+        }
+
+    except orjson.JSONDecodeError:
+        # Handle plain text logs (fallback)
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        # Try to extract basic info from text format
+        # maxsplit=3 leaves the rest of the message, dashes included, in the
+        # last part, so it needs no re-join
+        parts = line.split(" - ", 3)
+        if len(parts) == 4:
+            timestamp_part, _, level_part, message_part = parts
+        else:
+            timestamp_part = datetime.now().isoformat()
+            level_part = "INFO"
+            message_part = line
+
+        try:
+            ts_epoch = datetime.fromisoformat(timestamp_part).timestamp()
+        except ValueError:
+            ts_epoch = None
+
+        entry = {
+            "timestamp": timestamp_part,
+            "level": level_part,
+            "message": message_part,
+            "logger": "unknown",
+            "file": file_name,
+            "line_number": line_number,
+            "extra": {},
+            "_ts_epoch": ts_epoch
+        }
+
+    return entry
+
+
+def _without_epoch(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop the internal ``_ts_epoch`` filter key from entries being returned."""
+    for entry in entries:
+        entry.pop("_ts_epoch", None)
+    return entries
+
+
+def _log_record_time(record: RecentLogEntry, reference: datetime) -> datetime:
+    """Return the record's creation time, comparable with ``reference``."""
+    if reference.tzinfo is not None:
+        return datetime.fromtimestamp(record.created, tz=timezone.utc)
+    # Naive filters are compared with the local asctime written to the files
+    return datetime.fromtimestamp(record.created)
+
+
+def _query_recent_logs(
+    recent_logs: RecentLogBuffer,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    level: Optional[str],
+    message_contains: Optional[str],
+    limit: int,
+    offset: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Answer a /logs query from the in-memory buffer of recent records.
+
+    Returns None when the buffer may not hold every matching entry: the
+    requested range starts before its oldest record, or (without a start
+    time) it has fewer matches than the requested page. The caller then
+    falls back to scanning the log files.
+
+    As on the file scan, "total" counts the entries read to answer the
+    query (those from start_time on) and "filtered" the ones that matched.
+    """
+    # Snapshot; list() copies the deque in one step while handlers append
+    records = list(recent_logs.records)
+    if not records:
+        return None
+    if start_time and start_time < _log_record_time(records[0], start_time):
+        return None
+
+    level_filter = level.upper() if level else None
+    message_filter = message_contains.lower() if message_contains else None
+
+    page: List[Dict[str, Any]] = []
+    total = 0
+    filtered = 0
+    # Records are appended in order, so newest-first is a reverse walk and
+    # only the returned page is parsed
+    for record in reversed(records):
+        if start_time and _log_record_time(record, start_time) < start_time:
+            break
+        total += 1
+        if end_time and _log_record_time(record, end_time) > end_time:
+            continue
+        if level_filter and record.levelname.upper() != level_filter:
+            continue
+        if message_filter and message_filter not in record.message.lower():
+            continue
+
+        if offset <= filtered < offset + limit:
+            page.append(_parse_log_line(record.line, recent_logs.log_file, None))
+        filtered += 1
+
+    if not start_time and filtered < offset + limit:
+        return None
+
+    return {
+        "logs": _without_epoch(page),
+        "total": total,
+        "filtered": filtered,
+        "returned": len(page),
+        "offset": offset,
+        "limit": limit
     }
 
+
+def _find_logs_dir() -> Path:
+    """Return the logs directory (Docker or local development path)."""
+    if Path("/app/logs").exists():
+        return Path("/app/logs")
+    return Path(__file__).parent.parent / "logs"
+
+
+def _newest_log_files(logs_dir: Path) -> List[Tuple[Path, os.stat_result]]:
+    """Return the *.log files in ``logs_dir`` with their stat results, newest first.
+
+    Each file is stat'ed once; callers reuse the result instead of stat'ing again.
+    """
+    log_files = [(log_file, log_file.stat()) for log_file in logs_dir.glob("*.log")]
+    log_files.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    return log_files
+
+
+def _iter_log_entries(log_files: List[Path]) -> Iterator[Dict[str, Any]]:
+    """Yield a parsed entry for every non-empty line of ``log_files``."""
+    for log_file in log_files:
+        try:
+            with open(log_file, 'rb') as f:
+                # mmap cannot map an empty file
+                if os.fstat(f.fileno()).st_size == 0:
+                    continue
+                # Lines are sliced straight out of the (shared) page cache
+                # instead of going through the file object's read buffer
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for line_num, line in enumerate(iter(mapped.readline, b""), 1):
+                        line = line.strip()
+                        if not line:
+                            continue
+
+                        yield _parse_log_line(line, log_file.name, line_num)
+
+        except Exception as e:
+            logger.warning("Failed to read log file", file=log_file.name, error=str(e))
+            continue
+
+
+def _select_log_entries(
+    log_files: List[Path],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    level: Optional[str],
+    message_contains: Optional[str],
+    limit: int,
+    offset: int,
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Return the requested page of matching entries (newest first), the number
+    of entries read and the number that matched; runs in a worker thread.
+
+    Entries are filtered as they are read and only the newest offset + limit
+    matches are kept, so memory stays bounded by the page rather than by the
+    size of the log files.
+    """
+    # Times are compared as epoch seconds computed once per entry while
+    # parsing (entries without a parseable time are excluded from time-range
+    # queries)
+    start_epoch = start_time.timestamp() if start_time else None
+    end_epoch = end_time.timestamp() if end_time else None
+    level_filter = level.upper() if level else None
+    message_filter = message_contains.lower() if message_contains else None
+    counts = {"total": 0, "filtered": 0}
+
+    def matching_entries() -> Iterator[Dict[str, Any]]:
+        for entry in _iter_log_entries(log_files):
+            counts["total"] += 1
+
+            # Time range filter
+            entry_epoch = entry["_ts_epoch"]
+            if start_epoch is not None and (entry_epoch is None or entry_epoch < start_epoch):
+                continue
+            if end_epoch is not None and (entry_epoch is None or entry_epoch > end_epoch):
+                continue
+
+            # Level filter
+            if level_filter and entry["level"].upper() != level_filter:
+                continue
+
+            # Message content filter
+            if message_filter and message_filter not in entry["message"].lower():
+                continue
+
+            counts["filtered"] += 1
+            yield entry
+
+    # Newest first; nlargest keeps file order for equal timestamps, like a
+    # stable reverse sort
+    newest = heapq.nlargest(offset + limit, matching_entries(), key=lambda x: x["timestamp"])
+    return newest[offset:offset + limit], counts["total"], counts["filtered"]
+
+
 @api_router.get("/logs")
 async def query_logs(
     start_time: Optional[datetime] = Query(None, description="Start time for log filtering (ISO format)"),
@@ -3101,135 +3736,45 @@ async def query_logs(
                limit=limit,
                offset=offset)
 
+    # Recent entries are served from memory; older ranges scan the files
+    recent_logs = get_recent_logs()
+    if recent_logs is not None:
+        result = _query_recent_logs(recent_logs, start_time, end_time, level, message_contains, limit, offset)
+        if result is not None:
+            return result
+
     try:
-        # Support both Docker and local development paths for logs
-        if Path("/app/logs").exists():
-            logs_dir = Path("/app/logs")
-        else:
-            logs_dir = Path(__file__).parent.parent / "logs"
-            
-        if not logs_dir.exists():
+        # Directory listing and file reads block, so they run in a worker
+        # thread instead of stalling the event loop
+        logs_dir = await asyncio.to_thread(_find_logs_dir)
+
+        if not await asyncio.to_thread(logs_dir.exists):
             logger.warning("Logs directory not found", logs_dir=str(logs_dir))
             raise HTTPException(status_code=404, detail="Logs directory not found")
 
-        log_entries = []
-        
         # Get all log files sorted by modification time (newest first)
-        log_files = sorted(logs_dir.glob("*.log"), key=lambda x: x.stat().st_mtime, reverse=True)
+        log_files = await asyncio.to_thread(_newest_log_files, logs_dir)
         
         if not log_files:
             logger.warning("No log files found", logs_dir=str(logs_dir))
             return {"logs": [], "total": 0, "filtered": 0}
 
         # Process log files (limit to last 7 days to avoid performance issues)
-        recent_files = log_files[:7]  # Last 7 log files
-        
-        for log_file in recent_files:
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        try:
-                            # Try to parse as JSON (structured log)
-                            log_data = json.loads(line)
-                            
-                            # Normalize timestamp field
-                            timestamp_str = log_data.get("timestamp") or log_data.get("asctime") or log_data.get("dt")
-                            if timestamp_str:
-                                # Parse ISO format timestamp
-                                try:
-                                    if timestamp_str.endswith('Z'):
-                                        timestamp_str = timestamp_str[:-1] + '+00:00'
-                                    log_timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                                except:
-                                    # Fallback parsing
-                                    log_timestamp = datetime.now()
-                            else:
-                                log_timestamp = datetime.now()
-                            
-                            entry = {
-                                "timestamp": log_timestamp.isoformat(),
-                                "level": log_data.get("level") or log_data.get("levelname", "INFO"),
-                                "message": log_data.get("message", ""),
-                                "logger": log_data.get("logger") or log_data.get("name", ""),
-                                "file": log_file.name,
-                                "line_number": line_num,
-                                "extra": {k: v for k, v in log_data.items() 
-                                        if k not in ["timestamp", "level", "message", "logger", "name", "asctime", "dt"]}
-                            }
-                            
-                        except json.JSONDecodeError:
-                            # Handle plain text logs (fallback)
-                            # Try to extract basic info from text format
-                            parts = line.split(" - ", 3)
-                            if len(parts) >= 4:
-                                timestamp_part = parts[0]
-                                level_part = parts[2] 
-                                message_part = " - ".join(parts[3:])
-                            else:
-                                timestamp_part = datetime.now().isoformat()
-                                level_part = "INFO"
-                                message_part = line
-                                
-                            entry = {
-                                "timestamp": timestamp_part,
-                                "level": level_part,
-                                "message": message_part,
-                                "logger": "unknown",
-                                "file": log_file.name,
-                                "line_number": line_num,
-                                "extra": {}
-                            }
-                        
-                        log_entries.append(entry)
-                        
-            except Exception as e:
-                logger.warning("Failed to read log file", file=log_file.name, error=str(e))
-                continue
-        
-        # Sort by timestamp (newest first)
-        log_entries.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        total_entries = len(log_entries)
-        
-        # Apply filters
-        filtered_logs = []
-        for entry in log_entries:
-            # Time range filter
-            if start_time:
-                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                if entry_time < start_time:
-                    continue
-            if end_time:
-                entry_time = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
-                if entry_time > end_time:
-                    continue
-                    
-            # Level filter
-            if level and entry["level"].upper() != level.upper():
-                continue
-                
-            # Message content filter
-            if message_contains and message_contains.lower() not in entry["message"].lower():
-                continue
-                
-            filtered_logs.append(entry)
-        
-        # Apply pagination
-        paginated_logs = filtered_logs[offset:offset + limit]
+        recent_files = [log_file for log_file, _ in log_files[:7]]  # Last 7 log files
+        page, total_entries, filtered_count = await asyncio.to_thread(
+            _select_log_entries, recent_files, start_time, end_time, level, message_contains, limit, offset
+        )
+        paginated_logs = _without_epoch(page)
         
         logger.info("Logs queried successfully", 
                    total=total_entries,
-                   filtered=len(filtered_logs), 
+                   filtered=filtered_count, 
                    returned=len(paginated_logs))
         
         return {
             "logs": paginated_logs,
             "total": total_entries,
-            "filtered": len(filtered_logs),
+            "filtered": filtered_count,
             "returned": len(paginated_logs),
             "offset": offset,
             "limit": limit
@@ -3240,30 +3785,37 @@ async def query_logs(
         raise HTTPException(status_code=500, detail=f"Failed to query logs: {str(e)}")
 
 
+def _describe_log_files(logs_dir: Path) -> List[Dict[str, Any]]:
+    """Return name, size and modification time of each log file, newest first."""
+    log_files = []
+    for log_file, stat in _newest_log_files(logs_dir):
+        log_files.append({
+            "filename": log_file.name,
+            "size": stat.st_size,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "size_mb": round(stat.st_size / 1024 / 1024, 2)
+        })
+    return log_files
+
+
+def _read_log_snapshot(log_file_path: Path) -> bytes:
+    """Read a log file up to the size it has when opened."""
+    with open(log_file_path, 'rb') as f:
+        return f.read(os.fstat(f.fileno()).st_size)
+
+
 @api_router.get("/logs/files")
 async def list_log_files():
     """List available log files"""
     logger.info("Listing log files")
     
     try:
-        # Support both Docker and local development paths for logs
-        if Path("/app/logs").exists():
-            logs_dir = Path("/app/logs")
-        else:
-            logs_dir = Path(__file__).parent.parent / "logs"
-            
-        if not logs_dir.exists():
+        logs_dir = await asyncio.to_thread(_find_logs_dir)
+
+        if not await asyncio.to_thread(logs_dir.exists):
             raise HTTPException(status_code=404, detail="Logs directory not found")
 
-        log_files = []
-        for log_file in sorted(logs_dir.glob("*.log"), key=lambda x: x.stat().st_mtime, reverse=True):
-            stat = log_file.stat()
-            log_files.append({
-                "filename": log_file.name,
-                "size": stat.st_size,
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                "size_mb": round(stat.st_size / 1024 / 1024, 2)
-            })
+        log_files = await asyncio.to_thread(_describe_log_files, logs_dir)
         
         logger.info("Log files listed successfully", count=len(log_files))
         return {"log_files": log_files}
@@ -3279,30 +3831,47 @@ async def download_log_file(filename: str):
     logger.info("Downloading log file", filename=filename)
     
     # Validate filename to prevent path traversal
-    if not re.match(r'^[a-zA-Z0-9_-]+\.log$', filename):
+    if not LOG_FILENAME_PATTERN.match(filename):
         raise HTTPException(status_code=400, detail="Invalid log filename")
     
     try:
-        # Support both Docker and local development paths for logs
-        if Path("/app/logs").exists():
-            logs_dir = Path("/app/logs")
-        else:
-            logs_dir = Path(__file__).parent.parent / "logs"
-            
+        logs_dir = await asyncio.to_thread(_find_logs_dir)
         log_file_path = logs_dir / filename
-        
-        if not log_file_path.exists():
+
+        # The file this process is writing grows with every log line,
+        # including the ones below, so it is sent as a snapshot read up to its
+        # current size; a streamed response could outgrow its Content-Length.
+        # Rotated files no longer change and are streamed from disk.
+        recent_logs = get_recent_logs()
+        is_active = recent_logs is not None and recent_logs.log_file == filename
+
+        try:
+            if is_active:
+                content = await asyncio.to_thread(_read_log_snapshot, log_file_path)
+                file_size = len(content)
+            else:
+                # Handed to FileResponse so the file is not stat'ed twice
+                stat_result = await asyncio.to_thread(log_file_path.stat)
+                file_size = stat_result.st_size
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Log file not found")
-        
-        logger.info("Log file download initiated", filename=filename, size=log_file_path.stat().st_size)
-        
+
+        logger.info("Log file download initiated", filename=filename, size=file_size)
+
+        headers = {"Content-Disposition": f"attachment; filename={filename}"}
+        if is_active:
+            return Response(content=content, media_type="text/plain", headers=headers)
+
         return FileResponse(
             path=log_file_path,
+            stat_result=stat_result,
             media_type="text/plain",
             filename=filename,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            headers=headers
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to download log file", filename=filename, error=str(e))
         raise HTTPException(status_code=500, detail=f"Failed to download log file: {str(e)}")
@@ -3331,50 +3900,55 @@ class UpdateFolderRequest(BaseModel):
     sort_order: Optional[int] = None
 
 
+# Built by Postgres like the favorites and user flashcard lists; the total
+# comes from the same aggregate rather than from counting rows in Python
+_LIST_USER_FOLDERS_SQL = f"""
+    SELECT json_build_object(
+               'success', true,
+               'folders', COALESCE(
+                   json_agg(
+                       json_build_object(
+                           'folder_id', folder_id,
+                           'name', name,
+                           'description', description,
+                           'color', color,
+                           'icon', icon,
+                           'parent_folder_id', parent_folder_id,
+                           'sort_order', sort_order,
+                           'created_at', to_char(created_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT}),
+                           'updated_at', to_char(updated_at AT TIME ZONE 'UTC', {ISO_UTC_FORMAT})
+                       )
+                       ORDER BY sort_order ASC, created_at ASC
+                   ),
+                   '[]'::json
+               ),
+               'total', COUNT(*)
+           )::text AS body,
+           COUNT(*) AS total
+    FROM folders
+    WHERE owner_id = $1
+"""
+
+register_prepared_statements(_LIST_USER_FOLDERS_SQL)
+
+
 @api_router.get("/users/me/folders")
 async def list_user_folders(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """List all folders owned by the current user."""
-    from .database import get_db_pool
-    import uuid
 
     logger.info("Listing user folders", user_id=user.user_id)
 
     try:
         pool = await get_db_pool()
         async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """SELECT folder_id, name, description, color, icon, parent_folder_id, sort_order,
-                          created_at, updated_at
-                   FROM folders
-                   WHERE owner_id = $1
-                   ORDER BY sort_order ASC, created_at ASC""",
-                user.user_id
-            )
-
-        folders = [
-            {
-                "folder_id": row["folder_id"],
-                "name": row["name"],
-                "description": row["description"],
-                "color": row["color"],
-                "icon": row["icon"],
-                "parent_folder_id": row["parent_folder_id"],
-                "sort_order": row["sort_order"],
-                "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-                "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
-            }
-            for row in rows
-        ]
+            statement = await conn.prepare_cached(_LIST_USER_FOLDERS_SQL)
+            result = await statement.fetchrow(user.user_id)
 
-        logger.info("User folders listed", user_id=user.user_id, count=len(folders))
+        logger.info("User folders listed", user_id=user.user_id, count=result["total"])
 
-        return {
-            "success": True,
-            "folders": folders,
-            "total": len(folders)
-        }
+        return Response(content=result["body"], media_type="application/json")
 
     except Exception as e:
         logger.error("Failed to list user folders", error=str(e))
@@ -3387,8 +3961,6 @@ async def create_user_folder(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a new folder for the current user."""
-    from .database import get_db_pool
-    import uuid
 
     logger.info("Creating user folder", user_id=user.user_id, name=request.name)
 
@@ -3433,7 +4005,7 @@ async def create_user_folder(
             "folder_id": folder_id,
             "name": result["name"],
             "message": "Folder created successfully",
-            "created_at": result["created_at"].isoformat() if result["created_at"] else None
+            "created_at": result["created_at"]
         }
 
     except HTTPException:
@@ -3450,8 +4022,6 @@ async def update_user_folder(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Update a folder owned by the current user."""
-    from .database import get_db_pool
-
     logger.info("Updating user folder", folder_id=folder_id, user_id=user.user_id)
 
     try:
@@ -3534,8 +4104,6 @@ async def delete_user_folder(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a folder owned by the current user."""
-    from .database import get_db_pool
-
     logger.info("Deleting user folder", folder_id=folder_id, user_id=user.user_id)
 
     try:
@@ -3592,8 +4160,6 @@ async def assign_flashcard_to_folder(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Assign or remove a user flashcard to/from a folder."""
-    from .database import get_db_pool
-    from .storage import is_user_flashcard
 
     logger.info("Assigning flashcard to folder", flashcard_id=flashcard_id, folder_id=folder_id, user_id=user.user_id)
 
@@ -3662,13 +4228,20 @@ async def root():
 async def startup_event():
     """Application startup event"""
     initialize_download_log_store()
+    start_login_log_writer()
+    start_invalidation_listener()
 
-    # Generate flashcard catalog on startup
+    # Generate flashcard catalog on startup, unless the saved one is current
     try:
-        catalog_data, catalog_path = generate_flashcard_catalog()
-        logger.info("Flashcard catalog generated on startup",
-                   total_flashcards=catalog_data.get("total", 0),
-                   catalog_path=str(catalog_path))
+        catalog_data = load_current_catalog()
+        if catalog_data is not None:
+            logger.info("Flashcard catalog unchanged since last start, skipping generation",
+                       total_flashcards=catalog_data.get("total", 0))
+        else:
+            catalog_data, catalog_path = generate_flashcard_catalog()
+            logger.info("Flashcard catalog generated on startup",
+                       total_flashcards=catalog_data.get("total", 0),
+                       catalog_path=str(catalog_path))
     except Exception as e:
         logger.error("Failed to generate flashcard catalog on startup",
                     error=str(e),
@@ -3680,3 +4253,6 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event"""
     logger.info("Application shutdown initiated")
+    await stop_login_log_writer()
+    await stop_invalidation_listener()
+    shutdown_pdf_pool()
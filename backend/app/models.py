@@ -17,6 +17,10 @@ No ORM models - we use plain SQL queries with asyncpg.
 #   - created_at (TIMESTAMPTZ): Record creation timestamp
 #   - updated_at (TIMESTAMPTZ): Record update timestamp
 #
+# Indexes:
+#   - idx_user_profiles_id_covering ON (id)
+#     INCLUDE (email, display_name, is_admin, updated_at) - profile lookups by id
+#
 # Row Level Security: Enabled
 # Policies:
 #   - Users can view their own profile
@@ -29,7 +33,6 @@ No ORM models - we use plain SQL queries with asyncpg.
 # Tracks user progress for individual flashcards
 #
 # Columns:
-#   - id (SERIAL, PRIMARY KEY): Auto-incrementing ID
 #   - user_id (UUID, NOT NULL): References auth.users(id)
 #   - flashcard_id (TEXT, NOT NULL): Flashcard set identifier
 #   - card_id (TEXT, NOT NULL): Individual card identifier
@@ -40,12 +43,12 @@ No ORM models - we use plain SQL queries with asyncpg.
 #   - updated_at (TIMESTAMPTZ): Record update timestamp
 #
 # Constraints:
+#   - PRIMARY KEY: (user_id, flashcard_id, card_id) (migration 022)
 #   - CHECK: box IN (1, 2, 3)
-#   - UNIQUE: (user_id, flashcard_id, card_id)
 #
 # Indexes:
-#   - idx_flashcard_progress_user_flashcard ON (user_id, flashcard_id)
-#   - UNIQUE index on (user_id, flashcard_id, card_id)
+#   - flashcard_progress_pkey ON (user_id, flashcard_id, card_id)
+#     - also serves (user_id) and (user_id, flashcard_id) lookups
 #
 # Row Level Security: Enabled
 # Policies:
@@ -58,9 +61,11 @@ No ORM models - we use plain SQL queries with asyncpg.
 # TABLE: quiz_sessions
 # =============================================================================
 # Records completed quiz sessions for history tracking
+# Range-partitioned by month on completed_at (quiz_sessions_YYYY_MM plus a
+# default partition); see ensure_quiz_sessions_partitions() in migration 014.
 #
 # Columns:
-#   - id (SERIAL, PRIMARY KEY): Auto-incrementing ID
+#   - id (SERIAL, PRIMARY KEY (id, completed_at)): Auto-incrementing ID
 #   - user_id (UUID, NOT NULL): References auth.users(id)
 #   - flashcard_id (TEXT, NOT NULL): Flashcard set identifier
 #   - flashcard_title (TEXT): Optional flashcard set title
@@ -71,12 +76,20 @@ No ORM models - we use plain SQL queries with asyncpg.
 #   - box2_count (INTEGER, DEFAULT 0): Number of cards in box 2 (uncertain)
 #   - box3_count (INTEGER, DEFAULT 0): Number of cards in box 3 (not learned)
 #   - duration_seconds (INTEGER): Session duration in seconds
+#   - average_time_to_flip_seconds (FLOAT): Average time to reveal an answer
 #   - created_at (TIMESTAMPTZ): Record creation timestamp
 #
 # Indexes:
-#   - idx_quiz_sessions_user ON (user_id)
-#   - idx_quiz_sessions_user_flashcard ON (user_id, flashcard_id)
-#   - idx_quiz_sessions_completed_at ON (completed_at DESC)
+#   - idx_quiz_sessions_part_user_completed ON (user_id, completed_at DESC)
+#     INCLUDE (report columns) - covers the learning report queries
+#   - idx_quiz_sessions_part_user_flashcard_completed ON
+#     (user_id, flashcard_id, completed_at DESC) INCLUDE (report columns)
+#   - idx_quiz_sessions_completed_at_brin USING brin (completed_at)
+#     WITH (pages_per_range = 32, autosummarize = on) - range scans for the
+#     admin user activity stats (migration 023)
+#
+# Triggers:
+#   - quiz_sessions_stats_invalidate: NOTIFY stats_invalidate 'admin:activity:'
 #
 # Row Level Security: Enabled
 # Policies:
@@ -104,9 +117,13 @@ No ORM models - we use plain SQL queries with asyncpg.
 #
 # Indexes:
 #   - idx_card_ratings_user ON (user_id)
-#   - idx_card_ratings_flashcard ON (flashcard_id)
+#   - idx_card_ratings_flashcard_covering ON (flashcard_id)
+#     INCLUDE (user_id, rating) - covers the admin rating statistics
 #   - idx_card_ratings_user_flashcard ON (user_id, flashcard_id)
 #
+# Triggers:
+#   - card_ratings_stats_invalidate: NOTIFY stats_invalidate 'admin:flashcard_ratings_stats'
+#
 # Row Level Security: Enabled
 # Policies:
 #   - Users can view their own ratings
@@ -6,20 +6,91 @@ Single choice questions include a dotted line for writing answers.
 Multiple choice questions include checkboxes for each option.
 """
 
+import functools
 import random
 from io import BytesIO
-from typing import List, Dict, Any
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
+from types import SimpleNamespace
+from typing import BinaryIO, List, Dict, Any, Optional
+
+
+@functools.lru_cache(maxsize=None)
+def _reportlab() -> SimpleNamespace:
+    """
+    Import ReportLab and build the worksheet styles on first use.
+
+    ReportLab is only needed when a worksheet is actually generated, so
+    importing this module does not pay for it. Styles are immutable once
+    built and are shared by every worksheet rather than rebuilt per request.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    styles = getSampleStyleSheet()
+
+    answer_style = ParagraphStyle(
+        'AnswerStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#34495e'),
+        leftIndent=20,
+        spaceAfter=4
+    )
+
+    return SimpleNamespace(
+        A4=A4,
+        cm=cm,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Paragraph=Paragraph,
+        Spacer=Spacer,
+        title_style=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=12,
+            alignment=TA_CENTER
+        ),
+        subtitle_style=ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor('#7f8c8d'),
+            spaceAfter=20,
+            alignment=TA_CENTER
+        ),
+        question_style=ParagraphStyle(
+            'QuestionStyle',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=8,
+            leading=14
+        ),
+        answer_style=answer_style,
+        # Multiple choice options are set as one paragraph, one option per
+        # line; the extra leading keeps the spacing of the former table rows
+        choices_style=ParagraphStyle(
+            'ChoicesStyle',
+            parent=answer_style,
+            leading=16
+        ),
+        footer_style=ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor('#95a5a6'),
+            alignment=TA_CENTER
+        ),
+    )
 
 
 def select_random_cards(cards: List[Dict[str, Any]], count: int = 12) -> List[Dict[str, Any]]:
     """
-    Randomly select cards using Fisher-Yates shuffle.
+    Randomly select cards without shuffling the whole set.
 
     Args:
         cards: List of flashcard dictionaries
@@ -31,9 +102,8 @@ def select_random_cards(cards: List[Dict[str, Any]], count: int = 12) -> List[Di
     if len(cards) <= count:
         return cards.copy()
 
-    shuffled = cards.copy()
-    random.shuffle(shuffled)
-    return shuffled[:count]
+    # random.sample only draws the picked cards instead of permuting them all
+    return random.sample(cards, count)
 
 
 def create_dotted_line(width: float = 15) -> str:
@@ -49,22 +119,34 @@ def create_dotted_line(width: float = 15) -> str:
     return "." * int(width * 10)
 
 
+# Every single choice question gets the same answer line
+_ANSWER_LINE_TEXT = f"Answer: {create_dotted_line(15)}"
+
+
+@functools.lru_cache(maxsize=64)
+def _empty_worksheet_pdf(title: str) -> bytes:
+    """Return the worksheet for a set without cards; it only depends on the title."""
+    buffer = BytesIO()
+    _build_worksheet(buffer, title, [])
+    return buffer.getvalue()
+
+
 def generate_speed_quiz_pdf(
     flashcard_set: Dict[str, Any],
-    output_buffer: BytesIO = None
-) -> BytesIO:
+    output_buffer: Optional[BinaryIO] = None
+) -> BinaryIO:
     """
     Generate a PDF worksheet for speed quiz (12 random cards).
 
     Args:
         flashcard_set: Dictionary containing flashcard set data with 'cards' list
-        output_buffer: Optional BytesIO buffer to write to
+        output_buffer: Optional writable file-like object (a file, a socket
+            wrapper, ...) to write the PDF to; it need not be seekable
 
     Returns:
-        BytesIO buffer containing the generated PDF
+        BytesIO buffer containing the generated PDF (or output_buffer if given)
     """
-    if output_buffer is None:
-        output_buffer = BytesIO()
+    buffer = output_buffer if output_buffer is not None else BytesIO()
 
     # Get cards and select 12 random ones
     cards = flashcard_set.get('flashcards', [])
@@ -72,138 +154,83 @@ def generate_speed_quiz_pdf(
         cards = flashcard_set.get('cards', [])
 
     selected_cards = select_random_cards(cards, 12)
+    title = flashcard_set.get('title', 'Speed Quiz')
+
+    if selected_cards:
+        _build_worksheet(buffer, title, selected_cards)
+    else:
+        # Nothing random to lay out, reuse the built empty worksheet
+        buffer.write(_empty_worksheet_pdf(str(title)))
+
+    # Rewind our own buffer so it can be read from the start
+    if output_buffer is None:
+        buffer.seek(0)
+    return buffer
+
+
+def _build_worksheet(buffer: BinaryIO, title: str, selected_cards: List[Dict[str, Any]]) -> None:
+    """Lay out the worksheet for the selected cards and write the PDF to buffer."""
+    rl = _reportlab()
+    Paragraph, Spacer, cm = rl.Paragraph, rl.Spacer, rl.cm
 
     # Create PDF document
-    doc = SimpleDocTemplate(
-        output_buffer,
-        pagesize=A4,
+    doc = rl.SimpleDocTemplate(
+        buffer,
+        pagesize=rl.A4,
         topMargin=2*cm,
         bottomMargin=2*cm,
         leftMargin=2*cm,
         rightMargin=2*cm
     )
 
-    # Get styles
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#7f8c8d'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-
-    question_style = ParagraphStyle(
-        'QuestionStyle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=8,
-        leading=14
-    )
-
-    answer_style = ParagraphStyle(
-        'AnswerStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#34495e'),
-        leftIndent=20,
-        spaceAfter=4
-    )
-
     # Build PDF content
     story = []
 
     # Title
-    title = flashcard_set.get('title', 'Speed Quiz')
-    story.append(Paragraph(f"<b>{title}</b>", title_style))
+    story.append(Paragraph(f"<b>{title}</b>", rl.title_style))
 
     # Subtitle
     subtitle_text = "Speed Quiz Worksheet - 12 Random Questions"
-    story.append(Paragraph(subtitle_text, subtitle_style))
+    story.append(Paragraph(subtitle_text, rl.subtitle_style))
     story.append(Spacer(1, 0.5*cm))
 
     # Add questions
+    append = story.append
     for idx, card in enumerate(selected_cards, 1):
         question = card.get('question', 'No question available')
-        card_type = card.get('type', 'single')
-
-        # Determine card type
-        if card_type == 'multiple' or 'answers' in card or 'correctAnswers' in card:
-            card_type = 'multiple'
-        else:
-            card_type = 'single'
+        # Looked up once; its presence also marks a multiple choice card
+        answers = card.get('answers')
+        is_multiple = (
+            answers is not None
+            or card.get('type') == 'multiple'
+            or 'correctAnswers' in card
+        )
 
         # Question number and text
         question_text = f"<b>Question {idx}:</b> {question}"
-        story.append(Paragraph(question_text, question_style))
+        append(Paragraph(question_text, rl.question_style))
 
-        if card_type == 'single':
+        if not is_multiple:
             # Single choice: add dotted line for answer
-            dotted_line = create_dotted_line(15)
-            story.append(Paragraph(f"Answer: {dotted_line}", answer_style))
-            story.append(Spacer(1, 0.3*cm))
+            append(Paragraph(_ANSWER_LINE_TEXT, rl.answer_style))
+            append(Spacer(1, 0.3*cm))
 
         else:
             # Multiple choice: add checkboxes
-            answers = card.get('answers', [])
             if answers:
-                # Create table for checkboxes
-                table_data = []
-                for answer_idx, answer in enumerate(answers):
-                    checkbox = "☐"  # Empty checkbox
-                    table_data.append([
-                        Paragraph(checkbox, answer_style),
-                        Paragraph(answer, answer_style)
-                    ])
-
-                # Create table
-                table = Table(
-                    table_data,
-                    colWidths=[1*cm, 14*cm],
-                    style=TableStyle([
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                        ('TOPPADDING', (0, 0), (-1, -1), 2),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                    ])
-                )
-                story.append(table)
-                story.append(Spacer(1, 0.3*cm))
+                # One line per option, each with an empty checkbox
+                choices = "<br/>".join(f"☐&nbsp;&nbsp;{answer}" for answer in answers)
+                append(Paragraph(choices, rl.choices_style))
+                append(Spacer(1, 0.3*cm))
 
         # Add spacing between questions
         if idx < len(selected_cards):
-            story.append(Spacer(1, 0.5*cm))
+            append(Spacer(1, 0.5*cm))
 
     # Add footer
     story.append(Spacer(1, 1*cm))
     footer_text = f"Generated by Ommiquiz | {len(selected_cards)} questions"
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#95a5a6'),
-        alignment=TA_CENTER
-    )
-    story.append(Paragraph(footer_text, footer_style))
+    story.append(Paragraph(footer_text, rl.footer_style))
 
     # Build PDF
     doc.build(story)
-
-    # Reset buffer position
-    output_buffer.seek(0)
-
-    return output_buffer
@@ -6,13 +6,162 @@ with plain SQL queries via asyncpg.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, List, Optional
 
-from .database import get_db_pool
+from .database import ISO_UTC_Z_FORMAT, get_db_pool, register_prepared_statements
 from .logging_config import get_logger
 
 logger = get_logger("ommiquiz.progress")
 
+# Progress queries are prepared on every pool connection when it opens, so
+# the progress endpoints never pay for parsing and planning them.
+# Postgres builds the cards mapping and the session history as JSON, with
+# timestamps already rendered as ISO 8601 UTC strings, and the pool decodes
+# json columns with orjson; no dict is assembled per row in Python.
+
+# Cards of one set keyed by card_id, and the set's latest update time
+_CARDS_JSON = f"""
+    json_object_agg(
+        card_id,
+        json_build_object(
+            'box', box,
+            'last_reviewed', to_char(last_reviewed AT TIME ZONE 'UTC', {ISO_UTC_Z_FORMAT}),
+            'review_count', review_count
+        )
+    ) AS cards,
+    to_char(MAX(COALESCE(updated_at, created_at)) AT TIME ZONE 'UTC',
+            {ISO_UTC_Z_FORMAT}) AS last_updated
+"""
+
+# One session history entry
+_SESSION_JSON = f"""
+    json_build_object(
+        'session_id', 'sess_' || id,
+        'started_at', to_char(started_at AT TIME ZONE 'UTC', {ISO_UTC_Z_FORMAT}),
+        'completed_at', to_char(completed_at AT TIME ZONE 'UTC', {ISO_UTC_Z_FORMAT}),
+        'cards_reviewed', cards_reviewed,
+        'box_distribution', json_build_object(
+            'box1', box1_count,
+            'box2', box2_count,
+            'box3', box3_count
+        ),
+        'duration_seconds', duration_seconds,
+        'average_time_to_flip_seconds', average_time_to_flip_seconds
+    )
+"""
+
+_SESSION_COLUMNS = """
+    id, started_at, completed_at, cards_reviewed,
+    box1_count, box2_count, box3_count, duration_seconds,
+    average_time_to_flip_seconds
+"""
+
+_CARDS_SQL = f"""
+    SELECT {_CARDS_JSON}
+    FROM flashcard_progress
+    WHERE user_id = $1 AND flashcard_id = $2
+"""
+
+# Last 20 sessions of one flashcard set, newest first
+_SESSIONS_SQL = f"""
+    SELECT COALESCE(json_agg({_SESSION_JSON} ORDER BY completed_at DESC), '[]'::json)
+    FROM (
+        SELECT {_SESSION_COLUMNS}
+        FROM quiz_sessions
+        WHERE user_id = $1 AND flashcard_id = $2
+        ORDER BY completed_at DESC
+        LIMIT 20
+    ) recent
+"""
+
+_INSERT_SESSION_SQL = """
+    INSERT INTO quiz_sessions
+        (user_id, flashcard_id, flashcard_title, started_at, completed_at,
+         cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
+         average_time_to_flip_seconds)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+"""
+
+_DELETE_CARDS_SQL = """
+    DELETE FROM flashcard_progress
+    WHERE user_id = $1 AND flashcard_id = $2
+"""
+
+# All card rows of a progress save are upserted in one statement from
+# parallel arrays, rather than one round-trip per card
+_UPSERT_CARDS_SQL = """
+    INSERT INTO flashcard_progress
+        (user_id, flashcard_id, card_id, box, last_reviewed, review_count, updated_at)
+    SELECT $1::uuid, $2::text, card.card_id, card.box, card.last_reviewed, card.review_count, NOW()
+    FROM unnest($3::text[], $4::int[], $5::timestamptz[], $6::int[])
+        AS card(card_id, box, last_reviewed, review_count)
+    ON CONFLICT (user_id, flashcard_id, card_id)
+    DO UPDATE SET
+        box = EXCLUDED.box,
+        last_reviewed = EXCLUDED.last_reviewed,
+        review_count = flashcard_progress.review_count + 1,
+        updated_at = NOW()
+"""
+
+# Progress of every flashcard set of a user in two queries, one row per set;
+# the window keeps the 20 most recent sessions per set, as
+# load_user_progress does for one
+_ALL_CARDS_SQL = f"""
+    SELECT flashcard_id, {_CARDS_JSON}
+    FROM flashcard_progress
+    WHERE user_id = $1
+    GROUP BY flashcard_id
+"""
+
+_ALL_SESSIONS_SQL = f"""
+    SELECT flashcard_id, json_agg({_SESSION_JSON} ORDER BY completed_at DESC) AS sessions
+    FROM (
+        SELECT flashcard_id, {_SESSION_COLUMNS},
+               ROW_NUMBER() OVER (PARTITION BY flashcard_id ORDER BY completed_at DESC) AS rn
+        FROM quiz_sessions
+        WHERE user_id = $1
+          AND flashcard_id IN (SELECT flashcard_id FROM flashcard_progress WHERE user_id = $1)
+    ) recent
+    WHERE rn <= 20
+    GROUP BY flashcard_id
+"""
+
+register_prepared_statements(
+    _CARDS_SQL,
+    _SESSIONS_SQL,
+    _UPSERT_CARDS_SQL,
+    _INSERT_SESSION_SQL,
+    _DELETE_CARDS_SQL,
+    _ALL_CARDS_SQL,
+    _ALL_SESSIONS_SQL,
+)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a client ISO 8601 timestamp, or return None if it is empty."""
+    if not value:
+        return None
+    # Earlier versions of this API returned timestamps such as
+    # "...+00:00Z", which clients may send back; the Z after an explicit
+    # offset is dropped. A lone trailing Z (UTC) is accepted by
+    # fromisoformat since Python 3.11.
+    if value.endswith("Z") and ("+" in value[10:] or "-" in value[10:]):
+        value = value[:-1]
+    return datetime.fromisoformat(value)
+
+
+def _build_progress(
+    user_id: str, flashcard_id: str, cards: Dict, last_updated: Optional[str], session_history: List[Dict]
+) -> Dict:
+    """Assemble the progress document returned for one flashcard set."""
+    return {
+        "user_id": user_id,
+        "flashcard_id": flashcard_id,
+        "last_updated": last_updated or datetime.now().isoformat() + "Z",
+        "cards": cards,
+        "session_history": session_history
+    }
+
 
 async def load_user_progress(user_id: str, flashcard_id: str) -> Dict:
     """
@@ -44,66 +193,21 @@ async def load_user_progress(user_id: str, flashcard_id: str) -> Dict:
 
     try:
         async with pool.acquire() as conn:
-            # Query all cards for this user+flashcard
-            cards_query = """
-                SELECT card_id, box, last_reviewed, review_count, updated_at, created_at
-                FROM flashcard_progress
-                WHERE user_id = $1 AND flashcard_id = $2
-            """
-            card_rows = await conn.fetch(cards_query, user_id, flashcard_id)
-
-            # Build cards dictionary
-            cards = {}
-            last_updated = None
-            for row in card_rows:
-                cards[row['card_id']] = {
-                    "box": row['box'],
-                    "last_reviewed": row['last_reviewed'].isoformat() + "Z",
-                    "review_count": row['review_count']
-                }
-                updated_at = row['updated_at'] or row['created_at']
-                if last_updated is None or (updated_at and updated_at > last_updated):
-                    last_updated = updated_at
+            # Cards of this user+flashcard, keyed by card_id
+            statement = await conn.prepare_cached(_CARDS_SQL)
+            card_row = await statement.fetchrow(user_id, flashcard_id)
+            cards = card_row['cards'] or {}
 
             # Get session history (last 20 sessions)
-            sessions_query = """
-                SELECT id, started_at, completed_at, cards_reviewed,
-                       box1_count, box2_count, box3_count, duration_seconds,
-                       average_time_to_flip_seconds
-                FROM quiz_sessions
-                WHERE user_id = $1 AND flashcard_id = $2
-                ORDER BY completed_at DESC
-                LIMIT 20
-            """
-            session_rows = await conn.fetch(sessions_query, user_id, flashcard_id)
-
-            session_history = [
-                {
-                    "session_id": f"sess_{row['id']}",
-                    "started_at": row['started_at'].isoformat() + "Z",
-                    "completed_at": row['completed_at'].isoformat() + "Z",
-                    "cards_reviewed": row['cards_reviewed'],
-                    "box_distribution": {
-                        "box1": row['box1_count'],
-                        "box2": row['box2_count'],
-                        "box3": row['box3_count']
-                    },
-                    "duration_seconds": row['duration_seconds'],
-                    "average_time_to_flip_seconds": row['average_time_to_flip_seconds']
-                }
-                for row in session_rows
-            ]
+            statement = await conn.prepare_cached(_SESSIONS_SQL)
+            session_history = await statement.fetchval(user_id, flashcard_id)
 
             if not cards and not session_history:
                 return {}
 
-            return {
-                "user_id": user_id,
-                "flashcard_id": flashcard_id,
-                "last_updated": last_updated.isoformat() + "Z" if last_updated else datetime.now().isoformat() + "Z",
-                "cards": cards,
-                "session_history": session_history
-            }
+            return _build_progress(
+                user_id, flashcard_id, cards, card_row['last_updated'], session_history
+            )
 
     except Exception as e:
         logger.error("Error loading progress", user_id=user_id, flashcard_id=flashcard_id, error=str(e))
@@ -144,6 +248,7 @@ async def save_user_progress(user_id: str, flashcard_id: str, progress: Dict) ->
             async with conn.transaction():
                 # Save card-level progress
                 if "cards" in progress:
+                    card_ids, boxes, reviewed_times, review_counts = [], [], [], []
                     for card_id, card_data in progress["cards"].items():
                         # Validate box number
                         box_number = card_data.get("box")
@@ -158,33 +263,23 @@ async def save_user_progress(user_id: str, flashcard_id: str, progress: Dict) ->
                             continue
 
                         # Parse timestamp
-                        last_reviewed_str = card_data.get("last_reviewed")
-                        if last_reviewed_str:
-                            last_reviewed_str = last_reviewed_str.rstrip('Z')
-                            last_reviewed = datetime.fromisoformat(last_reviewed_str)
-                        else:
-                            last_reviewed = datetime.now()
-
-                        # Upsert card progress using INSERT ... ON CONFLICT
-                        upsert_query = """
-                            INSERT INTO flashcard_progress
-                                (user_id, flashcard_id, card_id, box, last_reviewed, review_count, updated_at)
-                            VALUES ($1, $2, $3, $4, $5, $6, NOW())
-                            ON CONFLICT (user_id, flashcard_id, card_id)
-                            DO UPDATE SET
-                                box = EXCLUDED.box,
-                                last_reviewed = EXCLUDED.last_reviewed,
-                                review_count = flashcard_progress.review_count + 1,
-                                updated_at = NOW()
-                        """
-                        await conn.execute(
-                            upsert_query,
+                        last_reviewed = _parse_timestamp(card_data.get("last_reviewed")) or datetime.now()
+
+                        card_ids.append(card_id)
+                        boxes.append(box_number)
+                        reviewed_times.append(last_reviewed)
+                        review_counts.append(card_data.get("review_count", 1))
+
+                    # Upsert card progress using INSERT ... ON CONFLICT
+                    if card_ids:
+                        statement = await conn.prepare_cached(_UPSERT_CARDS_SQL)
+                        await statement.fetch(
                             user_id,
                             flashcard_id,
-                            card_id,
-                            box_number,
-                            last_reviewed,
-                            card_data.get("review_count", 1)
+                            card_ids,
+                            boxes,
+                            reviewed_times,
+                            review_counts
                         )
 
                 # Save session history
@@ -192,15 +287,10 @@ async def save_user_progress(user_id: str, flashcard_id: str, progress: Dict) ->
                     summary = progress["session_summary"]
 
                     # Parse timestamps
-                    completed_at_str = summary.get("completed_at", "")
-                    completed_at_str = completed_at_str.rstrip('Z')
-                    completed_at = datetime.fromisoformat(completed_at_str) if completed_at_str else datetime.now()
-
-                    started_at_str = summary.get("started_at", "")
-                    if started_at_str:
-                        started_at_str = started_at_str.rstrip('Z')
-                        started_at = datetime.fromisoformat(started_at_str)
-                    else:
+                    completed_at = _parse_timestamp(summary.get("completed_at")) or datetime.now()
+
+                    started_at = _parse_timestamp(summary.get("started_at"))
+                    if started_at is None:
                         # Calculate started_at from completed_at and duration if available
                         duration_seconds = summary.get("duration_seconds", 0)
                         if duration_seconds:
@@ -210,15 +300,8 @@ async def save_user_progress(user_id: str, flashcard_id: str, progress: Dict) ->
 
                     box_dist = summary.get("box_distribution", {})
 
-                    insert_session_query = """
-                        INSERT INTO quiz_sessions
-                            (user_id, flashcard_id, flashcard_title, started_at, completed_at,
-                             cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
-                             average_time_to_flip_seconds)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                    """
-                    await conn.execute(
-                        insert_session_query,
+                    statement = await conn.prepare_cached(_INSERT_SESSION_SQL)
+                    await statement.fetch(
                         user_id,
                         flashcard_id,
                         progress.get("flashcard_title"),
@@ -261,11 +344,8 @@ async def delete_user_progress(user_id: str, flashcard_id: str) -> bool:
     try:
         async with pool.acquire() as conn:
             # Delete card progress
-            delete_query = """
-                DELETE FROM flashcard_progress
-                WHERE user_id = $1 AND flashcard_id = $2
-            """
-            await conn.execute(delete_query, user_id, flashcard_id)
+            statement = await conn.prepare_cached(_DELETE_CARDS_SQL)
+            await statement.fetch(user_id, flashcard_id)
 
             # Note: We don't delete quiz_sessions as they are historical records
             # If you want to delete sessions too, uncomment below:
@@ -297,23 +377,23 @@ async def get_all_user_progress(user_id: str) -> Dict[str, Dict]:
 
     try:
         async with pool.acquire() as conn:
-            # Get all unique flashcard IDs for this user
-            flashcard_query = """
-                SELECT DISTINCT flashcard_id
-                FROM flashcard_progress
-                WHERE user_id = $1
-            """
-            rows = await conn.fetch(flashcard_query, user_id)
-            flashcard_ids = [row['flashcard_id'] for row in rows]
-
-            # Load progress for each flashcard
-            all_progress = {}
-            for flashcard_id in flashcard_ids:
-                progress = await load_user_progress(user_id, flashcard_id)
-                if progress:
-                    all_progress[flashcard_id] = progress
-
-            return all_progress
+            # Two queries for all sets rather than two per set
+            statement = await conn.prepare_cached(_ALL_CARDS_SQL)
+            card_rows = await statement.fetch(user_id)
+            statement = await conn.prepare_cached(_ALL_SESSIONS_SQL)
+            session_rows = await statement.fetch(user_id)
+
+        sessions_by_flashcard = {row['flashcard_id']: row['sessions'] for row in session_rows}
+
+        all_progress = {}
+        for row in card_rows:
+            flashcard_id = row['flashcard_id']
+            all_progress[flashcard_id] = _build_progress(
+                user_id, flashcard_id, row['cards'], row['last_updated'],
+                sessions_by_flashcard.get(flashcard_id, [])
+            )
+
+        return all_progress
 
     except Exception as e:
         logger.error("Error loading all user progress", user_id=user_id, error=str(e))
@@ -4,30 +4,117 @@ Quiz History PDF Generator
 Generates PDF reports for user quiz history with summary statistics and session details.
 """
 
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
+# Worker processes for CPU-bound PDF builds (created on first use)
+_pdf_pool: Optional[ProcessPoolExecutor] = None
 
-def generate_quiz_history_pdf(report_data: dict, user_email: str) -> BytesIO:
+
+def _format_title(title: Optional[str], flashcard_id: Optional[str]) -> str:
+    """Return the display title for a session, truncated to fit the table column."""
+    title = title or flashcard_id or 'Unknown'
+    if len(title) > 25:
+        title = title[:22] + '...'
+    return title
+
+
+async def collect_quiz_history(
+    sessions: AsyncIterator[Mapping[str, Any]]
+) -> Tuple[Dict[str, Any], List[List[str]]]:
+    """
+    Consume quiz session records once, accumulating summary statistics and table rows.
+
+    Records are formatted as they arrive, so callers can stream them from a
+    database cursor without holding the raw result set in memory.
+
+    Args:
+        sessions: Async iterator of quiz session records; the date cell is read
+            preformatted from a ``completed_label`` column
+
+    Returns:
+        Tuple of (summary dictionary, formatted session table rows)
+    """
+    total_sessions = 0
+    total_cards_reviewed = 0
+    total_box1 = 0
+    total_box2 = 0
+    total_box3 = 0
+    total_duration = 0
+    flip_sum = 0.0
+    flip_count = 0
+    session_rows = []
+
+    async for session in sessions:
+        # Read each column once and write the table row straight from the record;
+        # counts are NOT NULL and duration_seconds is coalesced by the query
+        cards_reviewed = session['cards_reviewed']
+        box1 = session['box1_count']
+        box2 = session['box2_count']
+        box3 = session['box3_count']
+        duration = session['duration_seconds']
+        flip_time = session['average_time_to_flip_seconds']
+
+        total_sessions += 1
+        total_cards_reviewed += cards_reviewed
+        total_box1 += box1
+        total_box2 += box2
+        total_box3 += box3
+        total_duration += duration
+        if flip_time is not None:
+            flip_sum += flip_time
+            flip_count += 1
+
+        session_rows.append([
+            session['completed_label'],
+            _format_title(session['flashcard_title'], session['flashcard_id']),
+            str(cards_reviewed),
+            str(box1),
+            str(box2),
+            str(box3),
+            f"{duration / 60:.1f}" if duration else "—"
+        ])
+
+    summary = {
+        "total_sessions": total_sessions,
+        "total_cards_reviewed": total_cards_reviewed,
+        "total_box1": total_box1,
+        "total_box2": total_box2,
+        "total_box3": total_box3,
+        "total_duration": total_duration,
+        "average_session_duration": total_duration / total_sessions if total_sessions > 0 else 0,
+        "average_time_to_flip_seconds": flip_sum / flip_count if flip_count else None
+    }
+
+    return summary, session_rows
+
+
+def generate_quiz_history_pdf(report_data: dict, user_email: str, output_buffer=None) -> BytesIO:
     """
     Generate a PDF report for quiz history.
 
     Args:
-        report_data: Dictionary containing summary and sessions data
+        report_data: Dictionary containing summary data and formatted session
+            table rows (as produced by collect_quiz_history)
         user_email: Email of the user for the report
+        output_buffer: Optional file-like object to write to
 
     Returns:
-        BytesIO object containing the PDF data
+        BytesIO object containing the PDF data (or output_buffer if given)
     """
-    buffer = BytesIO()
+    buffer = output_buffer if output_buffer is not None else BytesIO()
 
     # Create document
     doc = SimpleDocTemplate(
@@ -128,13 +215,13 @@ def generate_quiz_history_pdf(report_data: dict, user_email: str) -> BytesIO:
     elements.append(Spacer(1, 0.3 * inch))
 
     # Session History Section
-    sessions = report_data.get('sessions', [])
+    session_rows = report_data.get('session_rows', [])
 
-    if sessions:
+    if session_rows:
         session_heading = Paragraph("Session History", heading_style)
         elements.append(session_heading)
 
-        # Session table headers
+        # Session table headers followed by the preformatted rows
         session_data = [[
             'Date',
             'Flashcard Set',
@@ -144,33 +231,11 @@ def generate_quiz_history_pdf(report_data: dict, user_email: str) -> BytesIO:
             'Box 3',
             'Duration\n(min)'
         ]]
-
-        # Add session rows
-        for session in sessions:
-            completed_at = datetime.fromisoformat(session['completed_at'].replace('Z', '+00:00'))
-            date_str = completed_at.strftime('%m/%d/%Y\n%H:%M')
-
-            title = session.get('flashcard_title', session.get('flashcard_id', 'Unknown'))
-            # Truncate long titles
-            if len(title) > 25:
-                title = title[:22] + '...'
-
-            duration = session.get('duration_seconds', 0)
-            duration_min = f"{duration / 60:.1f}" if duration else "—"
-
-            session_data.append([
-                date_str,
-                title,
-                str(session.get('cards_reviewed', 0)),
-                str(session.get('box1_count', 0)),
-                str(session.get('box2_count', 0)),
-                str(session.get('box3_count', 0)),
-                duration_min
-            ])
+        session_data.extend(session_rows)
 
         # Create session table
         col_widths = [1.0 * inch, 2.0 * inch, 0.6 * inch, 0.6 * inch, 0.6 * inch, 0.6 * inch, 0.7 * inch]
-        session_table = Table(session_data, colWidths=col_widths, repeatRows=1)
+        session_table = LongTable(session_data, colWidths=col_widths, repeatRows=1)
 
         session_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
@@ -214,6 +279,65 @@ def generate_quiz_history_pdf(report_data: dict, user_email: str) -> BytesIO:
     # Build PDF
     doc.build(elements)
 
-    # Get the value of the BytesIO buffer
-    buffer.seek(0)
+    # Rewind our own buffer so it can be read from the start
+    if output_buffer is None:
+        buffer.seek(0)
     return buffer
+
+
+def generate_quiz_history_pdf_bytes(report_data: dict, user_email: str) -> bytes:
+    """
+    Generate the quiz history PDF and return its raw bytes.
+
+    Picklable entry point used when building the PDF in a worker process.
+    """
+    return generate_quiz_history_pdf(report_data, user_email).getvalue()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Get or create the process pool used for PDF generation."""
+    global _pdf_pool
+
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """Shut down the PDF generation process pool."""
+    global _pdf_pool
+
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+async def stream_quiz_history_pdf(
+    report_data: dict,
+    user_email: str,
+    chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Build the quiz history PDF in a worker process and yield it in chunks.
+
+    ReportLab layout is CPU-bound, so it runs in a process pool instead of
+    on the event loop (or a GIL-bound thread); other requests keep being
+    served while reports are built in parallel.
+
+    Args:
+        report_data: Dictionary containing summary data and formatted session rows
+        user_email: Email of the user for the report
+        chunk_size: Maximum size of each yielded chunk in bytes
+
+    Yields:
+        Chunks of PDF data
+    """
+    loop = asyncio.get_running_loop()
+    pdf_bytes = await loop.run_in_executor(
+        _get_pdf_pool(), generate_quiz_history_pdf_bytes, report_data, user_email
+    )
+
+    view = memoryview(pdf_bytes)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import tempfile
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import boto3
 from botocore.exceptions import BotoCoreError, ClientError
@@ -49,6 +50,11 @@ def extract_user_id_from_flashcard(flashcard_id: str) -> Optional[str]:
     return parts[1]  # Return the 8-char user prefix
 
 
+def _encode_content(content: Union[str, bytes]) -> bytes:
+    """Return content as UTF-8 bytes; bytes are passed through without a copy."""
+    return content if isinstance(content, bytes) else content.encode("utf-8")
+
+
 @dataclass
 class FlashcardDocument:
     """In-memory representation of a flashcard YAML document."""
@@ -68,7 +74,10 @@ class BaseFlashcardStorage:
     def get_flashcard(self, flashcard_id: str) -> Optional[FlashcardDocument]:  # pragma: no cover - interface
         raise NotImplementedError
 
-    def save_flashcard(self, filename: str, content: str, overwrite: bool = False) -> FlashcardDocument:  # pragma: no cover - interface
+    def save_flashcard(
+        self, filename: str, content: Union[str, bytes], overwrite: bool = False
+    ) -> FlashcardDocument:  # pragma: no cover - interface
+        """Save a flashcard; content may be text or already UTF-8 encoded bytes."""
         raise NotImplementedError
 
     def delete_flashcard(self, flashcard_id: str) -> List[str]:  # pragma: no cover - interface
@@ -83,6 +92,18 @@ class BaseFlashcardStorage:
     def save_catalog(self, content: str, catalog_filename: str) -> Path:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def load_catalog(self, catalog_filename: str) -> Optional[str]:
+        """Return the previously saved catalog, or None if it is not available."""
+        return None
+
+    def source_fingerprint(self, catalog_filename: str) -> Optional[str]:
+        """Fingerprint of the flashcard files (excluding the catalog) from metadata only.
+
+        Changes whenever a file is added, removed or modified. None means the
+        backend cannot tell, so the catalog is always regenerated.
+        """
+        return None
+
     # User flashcard methods
     def list_user_flashcards(self, user_id: str) -> List[FlashcardDocument]:  # pragma: no cover - interface
         """List all flashcards belonging to a specific user."""
@@ -198,7 +219,7 @@ class LocalFlashcardStorage(BaseFlashcardStorage):
             )
             return None
 
-    def save_flashcard(self, filename: str, content: str, overwrite: bool = False) -> FlashcardDocument:
+    def save_flashcard(self, filename: str, content: Union[str, bytes], overwrite: bool = False) -> FlashcardDocument:
         target_path = self.flashcards_dir / filename
         if target_path.exists() and not overwrite:
             logger.error(
@@ -210,7 +231,7 @@ class LocalFlashcardStorage(BaseFlashcardStorage):
             raise FileExistsError(f"Flashcard '{filename}' already exists")
 
         try:
-            target_path.write_text(content, encoding="utf-8")
+            target_path.write_bytes(_encode_content(content))
             logger.info(
                 "Flashcard saved to local storage",
                 filename=filename,
@@ -264,6 +285,25 @@ class LocalFlashcardStorage(BaseFlashcardStorage):
         catalog_path.write_text(content, encoding="utf-8")
         return catalog_path
 
+    def load_catalog(self, catalog_filename: str) -> Optional[str]:
+        catalog_path = self.flashcards_dir / catalog_filename
+        try:
+            return catalog_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def source_fingerprint(self, catalog_filename: str) -> Optional[str]:
+        # Stat-only: names, sizes and modification times, no file reads
+        entries = []
+        for pattern in ("*.yaml", "*.yml"):
+            for file_path in self.flashcards_dir.glob(pattern):
+                if file_path.name == catalog_filename:
+                    continue
+                stat = file_path.stat()
+                entries.append(f"{file_path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        entries.sort()
+        return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
     def _get_user_flashcards_dir(self, user_id: str) -> Path:
         """Get or create the flashcards directory for a specific user."""
         user_dir = self.flashcards_dir / "users" / user_id
@@ -479,7 +519,7 @@ class S3FlashcardStorage(BaseFlashcardStorage):
             id=flashcard_id, filename=Path(key).name, content=content, modified_time=modified_time
         )
 
-    def save_flashcard(self, filename: str, content: str, overwrite: bool = False) -> FlashcardDocument:
+    def save_flashcard(self, filename: str, content: Union[str, bytes], overwrite: bool = False) -> FlashcardDocument:
         key = self._build_key(filename)
         if not overwrite:
             try:
@@ -493,7 +533,7 @@ class S3FlashcardStorage(BaseFlashcardStorage):
             self.client.put_object(
                 Bucket=self.bucket,
                 Key=key,
-                Body=content.encode("utf-8"),
+                Body=_encode_content(content),
                 ContentType="application/x-yaml",
             )
             logger.info(
@@ -0,0 +1,21 @@
+-- Migration 013: Add covering indexes for the learning report queries
+-- The learning report and quiz history PDF filter quiz_sessions by
+-- user_id (and optionally flashcard_id) plus a completed_at cutoff and sort by
+-- completed_at DESC. These composite indexes turn that into an index range
+-- scan, and the INCLUDE columns cover the SELECT list so Postgres can answer
+-- from the index alone (index-only scan).
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so run
+-- each statement on its own (not wrapped in BEGIN/COMMIT).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quiz_sessions_user_completed
+    ON public.quiz_sessions (user_id, completed_at DESC)
+    INCLUDE (id, flashcard_id, flashcard_title, started_at, cards_reviewed,
+             box1_count, box2_count, box3_count, duration_seconds,
+             average_time_to_flip_seconds);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_quiz_sessions_user_flashcard_completed
+    ON public.quiz_sessions (user_id, flashcard_id, completed_at DESC)
+    INCLUDE (id, flashcard_title, started_at, cards_reviewed,
+             box1_count, box2_count, box3_count, duration_seconds,
+             average_time_to_flip_seconds);
@@ -0,0 +1,140 @@
+-- Migration 014: Partition quiz_sessions by month on completed_at
+-- Report queries filter on completed_at >= cutoff (default: last 30 days).
+-- With monthly range partitions the planner prunes every partition older
+-- than the cutoff, so latency stays flat as history accumulates and vacuum
+-- work is confined to the recent partitions. No application changes are
+-- needed: queries and inserts keep targeting public.quiz_sessions.
+--
+-- The existing table and its indexes (including the covering indexes of
+-- migration 013) are renamed to *_legacy and its rows are copied into the
+-- partitioned table. Drop the legacy table once the copy has been verified:
+--     DROP TABLE public.quiz_sessions_legacy;
+--
+-- New monthly partitions are created by ensure_quiz_sessions_partitions().
+-- Schedule it (e.g. monthly via pg_cron) so upcoming months always exist:
+--     SELECT cron.schedule('quiz-sessions-partitions', '0 3 1 * *',
+--                          'SELECT public.ensure_quiz_sessions_partitions(3)');
+-- Rows outside all monthly ranges land in the default partition.
+
+BEGIN;
+
+ALTER TABLE public.quiz_sessions RENAME TO quiz_sessions_legacy;
+ALTER INDEX IF EXISTS public.quiz_sessions_pkey RENAME TO quiz_sessions_legacy_pkey;
+ALTER INDEX IF EXISTS public.idx_quiz_sessions_user RENAME TO idx_quiz_sessions_legacy_user;
+ALTER INDEX IF EXISTS public.idx_quiz_sessions_user_flashcard
+    RENAME TO idx_quiz_sessions_legacy_user_flashcard;
+ALTER INDEX IF EXISTS public.idx_quiz_sessions_completed_at
+    RENAME TO idx_quiz_sessions_legacy_completed_at;
+ALTER INDEX IF EXISTS public.idx_quiz_sessions_user_completed
+    RENAME TO idx_quiz_sessions_legacy_user_completed;
+ALTER INDEX IF EXISTS public.idx_quiz_sessions_user_flashcard_completed
+    RENAME TO idx_quiz_sessions_legacy_user_flashcard_completed;
+
+-- Partitioned table; the primary key must include the partition key
+CREATE TABLE public.quiz_sessions (
+    id INTEGER NOT NULL DEFAULT nextval('public.quiz_sessions_id_seq'),
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    flashcard_id TEXT NOT NULL,
+    flashcard_title TEXT,
+    started_at TIMESTAMPTZ NOT NULL,
+    completed_at TIMESTAMPTZ NOT NULL,
+    cards_reviewed INTEGER NOT NULL,
+    box1_count INTEGER DEFAULT 0 NOT NULL,
+    box2_count INTEGER DEFAULT 0 NOT NULL,
+    box3_count INTEGER DEFAULT 0 NOT NULL,
+    duration_seconds INTEGER,
+    average_time_to_flip_seconds FLOAT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, completed_at)
+) PARTITION BY RANGE (completed_at);
+
+ALTER SEQUENCE public.quiz_sessions_id_seq OWNED BY public.quiz_sessions.id;
+
+CREATE TABLE public.quiz_sessions_default
+    PARTITION OF public.quiz_sessions DEFAULT;
+
+-- Create monthly partitions from the current month up to months_ahead
+-- months in the future (idempotent)
+CREATE OR REPLACE FUNCTION public.ensure_quiz_sessions_partitions(months_ahead INTEGER DEFAULT 3)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::DATE;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::DATE;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.quiz_sessions
+                 FOR VALUES FROM (%L) TO (%L)',
+            'quiz_sessions_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+-- Partitions for the existing history, then for the upcoming months
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    SELECT date_trunc('month', MIN(completed_at))::DATE
+    INTO month_start
+    FROM public.quiz_sessions_legacy;
+
+    WHILE month_start IS NOT NULL AND month_start < date_trunc('month', NOW())::DATE LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.quiz_sessions
+                 FOR VALUES FROM (%L) TO (%L)',
+            'quiz_sessions_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+SELECT public.ensure_quiz_sessions_partitions(3);
+
+-- Indexes on the parent are created on every partition (existing and future)
+CREATE INDEX idx_quiz_sessions_part_user_completed
+    ON public.quiz_sessions (user_id, completed_at DESC)
+    INCLUDE (id, flashcard_id, flashcard_title, started_at, cards_reviewed,
+             box1_count, box2_count, box3_count, duration_seconds,
+             average_time_to_flip_seconds);
+
+CREATE INDEX idx_quiz_sessions_part_user_flashcard_completed
+    ON public.quiz_sessions (user_id, flashcard_id, completed_at DESC)
+    INCLUDE (id, flashcard_title, started_at, cards_reviewed,
+             box1_count, box2_count, box3_count, duration_seconds,
+             average_time_to_flip_seconds);
+
+-- Copy existing history
+INSERT INTO public.quiz_sessions
+    (id, user_id, flashcard_id, flashcard_title, started_at, completed_at,
+     cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
+     average_time_to_flip_seconds, created_at)
+SELECT id, user_id, flashcard_id, flashcard_title, started_at, completed_at,
+       cards_reviewed, box1_count, box2_count, box3_count, duration_seconds,
+       average_time_to_flip_seconds, created_at
+FROM public.quiz_sessions_legacy;
+
+-- Row Level Security (policies apply to all partitions via the parent)
+ALTER TABLE public.quiz_sessions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own sessions"
+    ON public.quiz_sessions FOR SELECT
+    USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert own sessions"
+    ON public.quiz_sessions FOR INSERT
+    WITH CHECK (auth.uid() = user_id);
+
+COMMENT ON TABLE public.quiz_sessions IS
+'Completed quiz sessions, range-partitioned by month on completed_at';
+
+COMMIT;
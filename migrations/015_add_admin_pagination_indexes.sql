@@ -0,0 +1,10 @@
+-- Migration 015: Add indexes for keyset pagination of the admin user list
+-- /admin/users pages through users ordered by auth.users.created_at DESC
+-- (NULLS LAST) with the user id as tie breaker. This index lets Postgres
+-- seek straight to the cursor position instead of scanning and discarding
+-- OFFSET rows.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_auth_users_created_at_id
+    ON auth.users (created_at DESC NULLS LAST, id DESC);
@@ -0,0 +1,20 @@
+-- Migration 016: Add a covering keyset pagination index for the admin login history
+-- /admin/login-history pages through login_history ordered by
+-- (login_time DESC, id DESC). This index serves both the time cutoff and the
+-- cursor condition as a single bounded index range scan, and carries the
+-- short columns the page reads in INCLUDE so most of them come from the
+-- index. error_message is deliberately not included: it is unbounded text
+-- stored in full, and a long value must not make a row too large for the
+-- index. It is read from the heap for the rows of the requested page only.
+-- The index replaces the plain login_time index from migration 008.
+--
+-- CREATE/DROP INDEX CONCURRENTLY and VACUUM cannot run inside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_login_history_login_time_id_covering
+    ON public.login_history (login_time DESC, id DESC)
+    INCLUDE (user_id, email, success, ip_address);
+
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_login_history_login_time;
+
+-- Refresh the visibility map (needed for index-only scans) and statistics
+VACUUM ANALYZE public.login_history;
@@ -0,0 +1,31 @@
+-- Migration 017: Add covering indexes for the hot admin and analytics queries
+-- Each index carries the columns its query reads in INCLUDE, so Postgres can
+-- answer the query with an index-only scan instead of fetching heap rows:
+--   * user_profiles lookups by id (admin check, profile reads, login history join)
+--   * /admin/user-activity-stats, range on quiz_sessions.completed_at
+--   * /admin/flashcard-ratings-stats, card_ratings grouped by flashcard_id
+-- The card ratings index replaces a narrower one that becomes redundant.
+-- The covering login history keyset index is created by migration 016.
+--
+-- CREATE INDEX CONCURRENTLY and VACUUM cannot run inside a transaction block.
+-- quiz_sessions is partitioned (migration 014), and indexes on a partitioned
+-- table cannot be built concurrently; that statement takes a short write lock.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_profiles_id_covering
+    ON public.user_profiles (id)
+    INCLUDE (email, display_name, is_admin, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_quiz_sessions_completed_user
+    ON public.quiz_sessions (completed_at)
+    INCLUDE (user_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_card_ratings_flashcard_covering
+    ON public.card_ratings (flashcard_id)
+    INCLUDE (user_id, rating);
+
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_card_ratings_flashcard;
+
+-- Refresh the visibility map (needed for index-only scans) and statistics
+VACUUM ANALYZE public.user_profiles;
+VACUUM ANALYZE public.quiz_sessions;
+VACUUM ANALYZE public.card_ratings;
@@ -0,0 +1,37 @@
+-- Migration 018: Notify the backend when cached admin statistics change
+-- The backend caches /admin/user-activity-stats and
+-- /admin/flashcard-ratings-stats. Every backend worker LISTENs on the
+-- stats_invalidate channel and drops the cache key (or key prefix, when the
+-- payload ends with ':') sent in the notification, so any write to the
+-- underlying tables - from any code path - invalidates the cached responses.
+--
+-- Row-level triggers only fire for rows that actually changed, and identical
+-- notifications within one transaction are delivered once.
+-- LISTEN requires a session-level connection: DATABASE_URL must point at
+-- Postgres directly (or a session-mode pooler), not a transaction-mode pooler.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.notify_stats_invalidate()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('stats_invalidate', TG_ARGV[0]);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS quiz_sessions_stats_invalidate ON public.quiz_sessions;
+CREATE TRIGGER quiz_sessions_stats_invalidate
+    AFTER INSERT OR UPDATE OR DELETE ON public.quiz_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_stats_invalidate('admin:activity:');
+
+DROP TRIGGER IF EXISTS card_ratings_stats_invalidate ON public.card_ratings;
+CREATE TRIGGER card_ratings_stats_invalidate
+    AFTER INSERT OR UPDATE OR DELETE ON public.card_ratings
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_stats_invalidate('admin:flashcard_ratings_stats');
+
+COMMIT;
@@ -0,0 +1,135 @@
+-- Migration 019: Partition login_history by month on login_time
+-- /admin/login-history filters on login_time >= cutoff (default: last 30
+-- days). With monthly range partitions the planner prunes every partition
+-- older than the cutoff, so the default window touches at most two
+-- partitions, and old months can be detached and archived cheaply:
+--     ALTER TABLE public.login_history DETACH PARTITION public.login_history_2025_01;
+-- No application changes are needed: queries and inserts keep targeting
+-- public.login_history.
+--
+-- The existing table is renamed to login_history_legacy and its rows are
+-- copied into the partitioned table. Drop the legacy table once the copy
+-- has been verified:
+--     DROP TABLE public.login_history_legacy;
+--
+-- New monthly partitions are created by ensure_login_history_partitions().
+-- Schedule it together with ensure_quiz_sessions_partitions() (migration 014):
+--     SELECT cron.schedule('login-history-partitions', '0 3 1 * *',
+--                          'SELECT public.ensure_login_history_partitions(3)');
+-- Rows outside all monthly ranges land in the default partition.
+
+BEGIN;
+
+ALTER TABLE public.login_history RENAME TO login_history_legacy;
+ALTER INDEX IF EXISTS public.login_history_pkey RENAME TO login_history_legacy_pkey;
+ALTER INDEX IF EXISTS public.idx_login_history_user_id RENAME TO idx_login_history_legacy_user_id;
+ALTER INDEX IF EXISTS public.idx_login_history_email RENAME TO idx_login_history_legacy_email;
+ALTER INDEX IF EXISTS public.idx_login_history_success RENAME TO idx_login_history_legacy_success;
+ALTER INDEX IF EXISTS public.idx_login_history_login_time_id_covering
+    RENAME TO idx_login_history_legacy_login_time_id_covering;
+
+-- Partitioned table; the primary key must include the partition key
+CREATE TABLE public.login_history (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id UUID REFERENCES public.user_profiles(id) ON DELETE SET NULL,
+    email TEXT NOT NULL,
+    login_time TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    success BOOLEAN NOT NULL,
+    ip_address TEXT,
+    user_agent TEXT,
+    error_message TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, login_time)
+) PARTITION BY RANGE (login_time);
+
+CREATE TABLE public.login_history_default
+    PARTITION OF public.login_history DEFAULT;
+
+-- Create monthly partitions from the current month up to months_ahead
+-- months in the future (idempotent)
+CREATE OR REPLACE FUNCTION public.ensure_login_history_partitions(months_ahead INTEGER DEFAULT 3)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::DATE;
+    last_month DATE := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::DATE;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.login_history
+                 FOR VALUES FROM (%L) TO (%L)',
+            'login_history_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+-- Partitions for the existing history, then for the upcoming months
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    SELECT date_trunc('month', MIN(login_time))::DATE
+    INTO month_start
+    FROM public.login_history_legacy;
+
+    WHILE month_start IS NOT NULL AND month_start < date_trunc('month', NOW())::DATE LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.login_history
+                 FOR VALUES FROM (%L) TO (%L)',
+            'login_history_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+SELECT public.ensure_login_history_partitions(3);
+
+-- Indexes on the parent are created on every partition (existing and future)
+CREATE INDEX idx_login_history_user_id ON public.login_history (user_id);
+CREATE INDEX idx_login_history_email ON public.login_history (email);
+CREATE INDEX idx_login_history_success ON public.login_history (success);
+
+-- Covering keyset index for the admin login history page (see migration 016)
+CREATE INDEX idx_login_history_login_time_id_covering
+    ON public.login_history (login_time DESC, id DESC)
+    INCLUDE (user_id, email, success, ip_address);
+
+-- Copy existing history
+INSERT INTO public.login_history
+    (id, user_id, email, login_time, success, ip_address, user_agent,
+     error_message, created_at)
+SELECT id, user_id, email, login_time, success, ip_address, user_agent,
+       error_message, created_at
+FROM public.login_history_legacy;
+
+-- Row Level Security (policies apply to all partitions via the parent)
+ALTER TABLE public.login_history ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can view all login history"
+    ON public.login_history
+    FOR SELECT
+    USING (
+        EXISTS (
+            SELECT 1 FROM public.user_profiles
+            WHERE id = auth.uid()
+            AND is_admin = true
+        )
+    );
+
+CREATE POLICY "Service role can insert login history"
+    ON public.login_history
+    FOR INSERT
+    WITH CHECK (true);
+
+COMMENT ON TABLE public.login_history IS
+'Tracks all login attempts (successful and failed), range-partitioned by month on login_time';
+
+COMMIT;
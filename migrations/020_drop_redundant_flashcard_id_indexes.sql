@@ -0,0 +1,14 @@
+-- Migration 020: Drop indexes duplicated by unique constraints
+-- The flashcard ID and favorite lookups are already served by the indexes
+-- behind the unique constraints from migrations 009 and 010:
+--   * user_flashcards_flashcard_id_key (flashcard_id) makes
+--     idx_user_flashcards_flashcard_id an exact duplicate
+--   * unique_user_flashcard_favorite (user_id, flashcard_id) has user_id as
+--     its leading column, so it also serves WHERE user_id = $1 and makes
+--     idx_favorites_user redundant
+-- Dropping them saves one index update per insert/delete on each table.
+--
+-- DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_user_flashcards_flashcard_id;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_favorites_user;
@@ -0,0 +1,19 @@
+-- Migration 021: Make user_flashcards.topics and keywords non-null arrays
+-- Both columns are TEXT[], which asyncpg encodes and decodes with its
+-- built-in binary array codec. NULL was only ever used to mean "no topics"
+-- or "no keywords", so every reader had to coalesce it to an empty list.
+-- With an empty-array default and NOT NULL the API can return the arrays
+-- as stored.
+
+BEGIN;
+
+UPDATE public.user_flashcards SET topics = '{}' WHERE topics IS NULL;
+UPDATE public.user_flashcards SET keywords = '{}' WHERE keywords IS NULL;
+
+ALTER TABLE public.user_flashcards
+    ALTER COLUMN topics SET DEFAULT '{}',
+    ALTER COLUMN topics SET NOT NULL,
+    ALTER COLUMN keywords SET DEFAULT '{}',
+    ALTER COLUMN keywords SET NOT NULL;
+
+COMMIT;
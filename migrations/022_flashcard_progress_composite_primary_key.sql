@@ -0,0 +1,37 @@
+-- Migration 022: Key flashcard_progress by (user_id, flashcard_id, card_id)
+-- Progress rows are only ever addressed by user, flashcard set and card: the
+-- upsert conflicts on that triple and the reads filter on its leading
+-- columns. The surrogate id was never read, yet every insert maintained its
+-- index next to the unique one. The triple becomes the primary key, the id
+-- column goes, and so does idx_flashcard_progress_user_flashcard, whose
+-- (user_id, flashcard_id) lookups are served by the primary key's prefix.
+--
+-- The key deliberately carries no INCLUDE columns: box, last_reviewed and
+-- review_count change on every upsert, and indexing them would rule out HOT
+-- updates for the table's most frequent write.
+--
+-- CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block; the
+-- key swap in between only takes a short lock, the index is already built.
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS flashcard_progress_user_flashcard_card_key
+    ON public.flashcard_progress (user_id, flashcard_id, card_id);
+
+BEGIN;
+
+ALTER TABLE public.flashcard_progress DROP CONSTRAINT IF EXISTS flashcard_progress_pkey;
+ALTER TABLE public.flashcard_progress
+    DROP CONSTRAINT IF EXISTS flashcard_progress_user_id_flashcard_id_card_id_key;
+
+-- Renames the index to flashcard_progress_pkey
+ALTER TABLE public.flashcard_progress
+    ADD CONSTRAINT flashcard_progress_pkey
+    PRIMARY KEY USING INDEX flashcard_progress_user_flashcard_card_key;
+
+-- Also drops the owned flashcard_progress_id_seq
+ALTER TABLE public.flashcard_progress DROP COLUMN IF EXISTS id;
+
+COMMIT;
+
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_flashcard_progress_user_flashcard;
+
+ANALYZE public.flashcard_progress;
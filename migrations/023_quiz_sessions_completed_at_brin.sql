@@ -0,0 +1,26 @@
+-- Migration 023: BRIN index for quiz_sessions range scans on completed_at
+-- Sessions are inserted as they complete, so completed_at follows the
+-- physical row order within each monthly partition (migration 014). A BRIN
+-- index stores one min/max summary per block range instead of one entry
+-- per row: a few pages per partition rather than a B-tree the size of the
+-- data, and inserts no longer descend a B-tree for it.
+--
+-- It replaces idx_quiz_sessions_completed_user from migration 017 for the
+-- /admin/user-activity-stats range query. Partition pruning already limits
+-- that query to the months in range and BRIN narrows it to the matching
+-- block ranges; the rows are then read sequentially from the heap. The
+-- user-scoped B-trees from migration 014 stay, their queries are point
+-- lookups per user.
+--
+-- autosummarize queues a summary for each block range as it fills, so new
+-- rows do not wait for the next VACUUM to become indexable by range.
+-- Indexes on a partitioned table cannot be built concurrently; this takes a
+-- short write lock while the (small) index is built.
+
+CREATE INDEX IF NOT EXISTS idx_quiz_sessions_completed_at_brin
+    ON public.quiz_sessions USING brin (completed_at)
+    WITH (pages_per_range = 32, autosummarize = on);
+
+DROP INDEX IF EXISTS public.idx_quiz_sessions_completed_user;
+
+ANALYZE public.quiz_sessions;